@@ -0,0 +1,244 @@
+import json
+import os
+import sqlite3
+import threading
+import time
+import traceback
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Dict, List, Optional, Tuple
+
+ACTIVE_STATUSES = ('queued', 'running')
+
+# Partial results are written in batches so a crash loses at most a few seconds of scoring
+FLUSH_ROWS = 200
+FLUSH_SECONDS = 2.0
+
+
+class JobCancelled(Exception):
+    """Raised inside a job when cancellation was requested"""
+
+
+class JobStore:
+    """SQLite record of analysis jobs, their progress and their (partial) results"""
+
+    def __init__(self, directory: str = '.analysis_jobs'):
+        self.directory = directory
+        os.makedirs(directory, exist_ok=True)
+        self._lock = threading.Lock()
+
+        # One shared connection guarded by a lock; jobs report from worker threads
+        self._conn = sqlite3.connect(os.path.join(directory, 'jobs.sqlite3'), check_same_thread=False)
+        self._conn.row_factory = sqlite3.Row
+        self._conn.execute('PRAGMA journal_mode=WAL')
+        self._conn.execute('PRAGMA synchronous=NORMAL')
+        self._conn.execute("""
+            CREATE TABLE IF NOT EXISTS jobs (
+                job_id TEXT PRIMARY KEY,
+                kind TEXT NOT NULL,
+                source TEXT NOT NULL,
+                options TEXT NOT NULL,
+                status TEXT NOT NULL,
+                rows_read INTEGER NOT NULL DEFAULT 0,
+                scored_rows INTEGER NOT NULL DEFAULT 0,
+                message TEXT NOT NULL DEFAULT '',
+                error TEXT,
+                summary TEXT,
+                created_at REAL NOT NULL,
+                updated_at REAL NOT NULL
+            )
+        """)
+        self._conn.execute("""
+            CREATE TABLE IF NOT EXISTS job_results (
+                job_id TEXT NOT NULL,
+                position INTEGER NOT NULL,
+                applicant TEXT NOT NULL,
+                PRIMARY KEY (job_id, position)
+            )
+        """)
+        # Jobs left running by a previous process can only be resumed, not continued
+        self._conn.execute(
+            "UPDATE jobs SET status = 'interrupted', message = 'Interrupted by a restart' "
+            "WHERE status IN ('queued', 'running')"
+        )
+        self._conn.commit()
+
+    def input_path(self, job_id: str) -> str:
+        """Where an uploaded workbook is kept so the job can be resumed"""
+        return os.path.join(self.directory, f'{job_id}.input')
+
+    def create(self, kind: str, source: str, options: Optional[Dict] = None) -> str:
+        """Register a new queued job and return its id"""
+        job_id = uuid.uuid4().hex[:12]
+        now = time.time()
+        with self._lock:
+            self._conn.execute(
+                'INSERT INTO jobs (job_id, kind, source, options, status, created_at, updated_at) '
+                "VALUES (?, ?, ?, ?, 'queued', ?, ?)",
+                (job_id, kind, source, json.dumps(options or {}), now, now)
+            )
+            self._conn.commit()
+        return job_id
+
+    def update(self, job_id: str, **fields):
+        """Set job columns (status, rows_read, scored_rows, message, error, summary)"""
+        if 'summary' in fields:
+            fields['summary'] = json.dumps(fields['summary'])
+        fields['updated_at'] = time.time()
+        assignments = ', '.join(f'{column} = ?' for column in fields)
+        with self._lock:
+            self._conn.execute(
+                f'UPDATE jobs SET {assignments} WHERE job_id = ?', (*fields.values(), job_id)
+            )
+            self._conn.commit()
+
+    @staticmethod
+    def _as_dict(row: sqlite3.Row) -> Dict:
+        job = dict(row)
+        job['options'] = json.loads(job['options'])
+        job['summary'] = json.loads(job['summary']) if job['summary'] else None
+        return job
+
+    def get(self, job_id: str) -> Optional[Dict]:
+        """Current state of a job, or None for an unknown id"""
+        with self._lock:
+            row = self._conn.execute('SELECT * FROM jobs WHERE job_id = ?', (job_id,)).fetchone()
+        return self._as_dict(row) if row else None
+
+    def list_jobs(self, limit: int = 20) -> List[Dict]:
+        """Most recent jobs first"""
+        with self._lock:
+            rows = self._conn.execute(
+                'SELECT * FROM jobs ORDER BY created_at DESC LIMIT ?', (limit,)
+            ).fetchall()
+        return [self._as_dict(row) for row in rows]
+
+    def save_results(self, job_id: str, results: List[Tuple[int, Dict]]):
+        """Persist scored applicants by their row position in the source file"""
+        with self._lock:
+            self._conn.executemany(
+                'INSERT OR REPLACE INTO job_results (job_id, position, applicant) VALUES (?, ?, ?)',
+                [(job_id, position, json.dumps(applicant, default=str)) for position, applicant in results]
+            )
+            self._conn.commit()
+
+    def load_results(self, job_id: str) -> Dict[int, Dict]:
+        """Scored applicants stored so far, keyed by row position"""
+        with self._lock:
+            rows = self._conn.execute(
+                'SELECT position, applicant FROM job_results WHERE job_id = ?', (job_id,)
+            ).fetchall()
+        return {position: json.loads(applicant) for position, applicant in rows}
+
+    def results(self, job_id: str, limit: Optional[int] = None) -> List[Dict]:
+        """Scored applicants in source order (the first `limit` rows when given)"""
+        with self._lock:
+            rows = self._conn.execute(
+                'SELECT applicant FROM job_results WHERE job_id = ? ORDER BY position LIMIT ?',
+                (job_id, -1 if limit is None else limit)
+            ).fetchall()
+        return [json.loads(applicant) for (applicant,) in rows]
+
+
+class Job:
+    """Handle passed to a running job for reporting progress and results"""
+
+    def __init__(self, store: JobStore, job_id: str, cancel_event: threading.Event):
+        self.store = store
+        self.job_id = job_id
+        self._cancel_event = cancel_event
+        self._buffer = []
+        self._last_flush = time.monotonic()
+        self.rows_read = 0
+        self.scored_rows = 0
+        self.message = ''
+
+    @property
+    def record(self) -> Dict:
+        return self.store.get(self.job_id)
+
+    def previous_results(self) -> Dict[int, Dict]:
+        """Rows already stored by an earlier, interrupted attempt of this job"""
+        return self.store.load_results(self.job_id)
+
+    def check_cancelled(self):
+        if self._cancel_event.is_set():
+            raise JobCancelled()
+
+    def report(self, rows_read: Optional[int] = None, message: Optional[str] = None):
+        """Update progress counters; persisted together with the next result flush"""
+        if rows_read is not None:
+            self.rows_read = rows_read
+        if message is not None:
+            self.message = message
+        self.check_cancelled()
+        if time.monotonic() - self._last_flush >= FLUSH_SECONDS:
+            self.flush()
+
+    def add_result(self, position: int, applicant: Dict):
+        self._buffer.append((position, applicant))
+        self.scored_rows += 1
+        if len(self._buffer) >= FLUSH_ROWS or time.monotonic() - self._last_flush >= FLUSH_SECONDS:
+            self.flush()
+
+    def flush(self):
+        if self._buffer:
+            self.store.save_results(self.job_id, self._buffer)
+            self._buffer = []
+        self.store.update(
+            self.job_id, rows_read=self.rows_read, scored_rows=self.scored_rows, message=self.message
+        )
+        self._last_flush = time.monotonic()
+
+
+class JobQueue:
+    """Worker pool that runs analysis jobs outside of any script rerun"""
+
+    def __init__(self, store: JobStore, max_workers: int = 2):
+        self.store = store
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix='analysis-job')
+        self._lock = threading.Lock()
+        self._active: Dict[str, threading.Event] = {}
+
+    def is_active(self, job_id: str) -> bool:
+        with self._lock:
+            return job_id in self._active
+
+    def submit(self, job_id: str, run: Callable[[Job], Optional[Dict]]) -> bool:
+        """Queue a job (new or interrupted); returns False if it is already queued or running"""
+        with self._lock:
+            if job_id in self._active:
+                return False
+            cancel_event = threading.Event()
+            self._active[job_id] = cancel_event
+
+        self.store.update(job_id, status='queued', error=None, message='Waiting for a worker')
+        self._executor.submit(self._run, job_id, run, cancel_event)
+        return True
+
+    def cancel(self, job_id: str) -> bool:
+        """Ask a queued or running job to stop after the applicant it is scoring"""
+        with self._lock:
+            cancel_event = self._active.get(job_id)
+        if cancel_event is None:
+            return False
+        cancel_event.set()
+        return True
+
+    def _run(self, job_id: str, run: Callable[[Job], Optional[Dict]], cancel_event: threading.Event):
+        job = Job(self.store, job_id, cancel_event)
+        try:
+            job.check_cancelled()
+            self.store.update(job_id, status='running', message='Starting')
+            summary = run(job)
+            job.flush()
+            self.store.update(job_id, status='completed', message='Done', summary=summary or {})
+        except JobCancelled:
+            job.flush()
+            self.store.update(job_id, status='cancelled', message='Cancelled')
+        except Exception as e:
+            job.flush()
+            self.store.update(job_id, status='failed', message=str(e), error=traceback.format_exc())
+        finally:
+            with self._lock:
+                self._active.pop(job_id, None)
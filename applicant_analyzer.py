@@ -0,0 +1,326 @@
+import logging
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from datetime import datetime
+from typing import BinaryIO, Callable, Dict, Iterable, Iterator, List, Optional, Tuple, Union
+import re
+import time
+
+from score_cache import ScoreCache
+from request_scheduler import RequestScheduler
+from scoring_backends import CascadeBackend, OpenAIBackend, ScoringBackend, Scores, cascade_report, token_report
+from workbook_reader import build_applicants, iter_excel_chunks, iter_excel_rows
+from change_detection import ChangeTracker, is_reusable
+from http_fetch import ConditionalFetcher
+from metrics import METRICS
+
+logger = logging.getLogger(__name__)
+
+
+class ApplicantAnalyzer:
+    def __init__(self, openai_api_key: str, max_concurrency: int = 8,
+                 score_cache: Optional[ScoreCache] = None, model: str = "gpt-4o",
+                 batch_size: int = 1, scheduler: Optional[RequestScheduler] = None,
+                 fetcher: Optional[ConditionalFetcher] = None, backend: Optional[ScoringBackend] = None,
+                 base_url: Optional[str] = None, client=None, prompt_mode: str = 'full'):
+        self.openai_api_key = openai_api_key
+        self.max_concurrency = max(1, int(max_concurrency))
+        self.score_cache = score_cache
+        self.model = model
+        self.batch_size = max(1, int(batch_size))
+        self.scheduler = scheduler or RequestScheduler()
+        self.fetcher = fetcher or ConditionalFetcher()
+        # The default backend owns a pooled OpenAI client (pass `client` to share one across analyzers)
+        self.backend = backend or OpenAIBackend(
+            openai_api_key, model, self.scheduler, score_cache, base_url=base_url, client=client,
+            prompt_mode=prompt_mode, max_concurrency=self.max_concurrency
+        )
+    
+    def download_excel_from_sharepoint(self, sharepoint_url: str, max_bytes: Optional[int] = None,
+                                       progress: Optional[Callable[[int, Optional[int]], None]] = None
+                                       ) -> BinaryIO:
+        """Download Excel file from SharePoint URL to a temp/cache file opened for reading"""
+        # Convert SharePoint sharing URL to download URL
+        download_url = self.convert_to_download_url(sharepoint_url)
+        
+        # Streamed to disk in chunks; an unchanged workbook costs a single 304
+        with METRICS.timer('stage_seconds', stage='download'):
+            return self.fetcher.fetch_to_file(download_url, max_bytes=max_bytes, progress=progress)
+    
+    def convert_to_download_url(self, sharepoint_url: str) -> str:
+        """Convert SharePoint sharing URL to download URL"""
+        if 'download=1' in sharepoint_url:
+            return sharepoint_url
+        
+        # Handle different SharePoint URL formats
+        patterns = [
+            r'https://.*\.sharepoint\.com/.*[?&]gid=([^&]+)',
+            r'https://.*\.sharepoint\.com/.*[?&]resid=([^&]+)',
+        ]
+        
+        for pattern in patterns:
+            match = re.search(pattern, sharepoint_url)
+            if match:
+                return f"{sharepoint_url}&download=1"
+        
+        # Default fallback
+        separator = '&' if '?' in sharepoint_url else '?'
+        return f"{sharepoint_url}{separator}download=1"
+    
+    def parse_excel_file(self, file_content: Union[bytes, BinaryIO]) -> List[Dict]:
+        """Parse Excel file and extract applicant data"""
+        return [
+            applicant
+            for chunk in self.iter_excel_chunks(file_content)
+            for applicant in chunk
+        ]
+    
+    def iter_excel_chunks(self, source: Union[bytes, BinaryIO], chunk_size: int = 1000) -> Iterator[List[Dict]]:
+        """Stream applicants from the first sheet in chunks without loading the whole workbook"""
+        return METRICS.timed_iter(iter_excel_chunks(source, chunk_size), 'stage_seconds', stage='parse')
+    
+    def iter_excel_rows(self, source: BinaryIO) -> Iterator[Dict]:
+        """Yield first-sheet rows as dicts, matching pd.read_excel's headers and blank-row handling"""
+        return iter_excel_rows(source)
+    
+    def build_applicants(self, rows: List[Dict], start_index: int = 0) -> List[Dict]:
+        """Build applicant records for a chunk of spreadsheet rows with columnar normalization"""
+        return build_applicants(rows, start_index)
+    
+    def score_applicant(self, applicant: Dict) -> Dict:
+        """Score applicant with the configured backend (OpenAI by default)"""
+        with METRICS.timer('score_seconds', backend=self.backend.name, mode='single'):
+            return self._score_applicant(applicant)
+    
+    def _score_applicant(self, applicant: Dict) -> Dict:
+        try:
+            # If BMI > 25, automatically assign Low level
+            if applicant['bmi'] > 25:
+                return {
+                    'info_score': 30,
+                    'experience_score': 30,
+                    'overall_level': 'Low',
+                    'reasoning': 'BMI > 25 - Automatically assigned Low level',
+                    'score_source': 'rule'
+                }
+            
+            # Backend scoring for applicants with BMI <= 25
+            return self.backend_result(self.backend.score(applicant))
+            
+        except Exception as e:
+            logger.warning("Error scoring applicant %s: %s", applicant.get('name'), e)
+            return {
+                'info_score': 50,
+                'experience_score': 50,
+                'overall_level': 'Mid',
+                'reasoning': 'Error in scoring - default values assigned',
+                'score_source': 'fallback'
+            }
+    
+    def build_scoring_result(self, info_score: float, experience_score: float) -> Dict:
+        """Combine the two scores into an overall level"""
+        combined_score = (info_score + experience_score) / 2
+        
+        if combined_score >= 80:
+            level = 'High'
+        elif combined_score >= 60:
+            level = 'Mid'
+        else:
+            level = 'Low'
+        
+        return {
+            'info_score': info_score,
+            'experience_score': experience_score,
+            'overall_level': level,
+            'reasoning': f'Combined score: {combined_score:.1f}%',
+            'score_source': 'model'
+        }
+    
+    def backend_result(self, scores: Scores) -> Dict:
+        """Scoring result for a backend's (info, experience, used_fallback[, score_source]) scores"""
+        info_score, experience_score, used_fallback = scores[:3]
+        result = self.build_scoring_result(info_score, experience_score)
+        result['score_source'] = scores[3] if len(scores) > 3 else self.backend.score_source
+        if used_fallback:
+            result['score_source'] = 'fallback'
+            result['reasoning'] += ' (API unavailable - default score used)'
+        return result
+    
+    def score_batch(self, applicants: List[Dict]) -> List[Dict]:
+        """Score several applicants with one backend call, falling back to per-row scoring"""
+        with METRICS.timer('score_seconds', backend=self.backend.name, mode='batch'):
+            return self._score_batch(applicants)
+    
+    def _score_batch(self, applicants: List[Dict]) -> List[Dict]:
+        results = [None] * len(applicants)
+        pending = []
+        for i, applicant in enumerate(applicants):
+            # BMI rule never needs the backend
+            if applicant['bmi'] > 25:
+                results[i] = self.score_applicant(applicant)
+            else:
+                pending.append(i)
+        
+        if pending:
+            try:
+                scores = self.backend.score_many([applicants[i] for i in pending])
+                for i, applicant_scores in zip(pending, scores):
+                    results[i] = self.backend_result(applicant_scores)
+            except Exception as e:
+                logger.warning("Batch scoring failed, scoring rows one by one: %s", e)
+        
+        for i, applicant in enumerate(applicants):
+            if results[i] is None:
+                results[i] = self.score_applicant(applicant)
+        
+        return results
+    
+    def score_applicants(self, applicants: List[Dict]) -> Iterator[Tuple[int, Dict]]:
+        """Score applicants concurrently, yielding (index, result) as each one finishes"""
+        # Local backends are CPU-bound; threads would only add contention
+        workers = self.max_concurrency if self.backend.concurrent else 1
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            if self.batch_size > 1:
+                futures = {}
+                for start in range(0, len(applicants), self.batch_size):
+                    indices = list(range(start, min(start + self.batch_size, len(applicants))))
+                    batch = [applicants[i] for i in indices]
+                    futures[executor.submit(self.score_batch, batch)] = indices
+            else:
+                futures = {
+                    executor.submit(self.score_applicant, applicant): [index]
+                    for index, applicant in enumerate(applicants)
+                }
+            
+            try:
+                for future in as_completed(futures):
+                    if self.batch_size > 1:
+                        yield from zip(futures[future], future.result())
+                    else:
+                        yield futures[future][0], future.result()
+            finally:
+                # A cancelled job stops consuming results; don't score the rest of the chunk
+                for future in futures:
+                    future.cancel()
+
+
+class ScoringRun:
+    """One parse -> score pass over a stream of applicant chunks, free of any UI
+    
+    When previous_applicants is given, rows whose fingerprint is unchanged reuse their
+    previous result and only inserted or edited rows are sent for scoring. `resumed`
+    holds rows (by position) stored by an interrupted attempt, reused the same way.
+    Only results scored by the same backend settings (scoring_signature) and not
+    from the fallback path are reused.
+    """
+    
+    def __init__(self, analyzer: ApplicantAnalyzer, previous_applicants: Optional[List[Dict]] = None,
+                 resumed: Optional[Dict[int, Dict]] = None):
+        self.analyzer = analyzer
+        self.signature = analyzer.backend.signature()
+        self.tracker = (
+            ChangeTracker(previous_applicants, self.signature) if previous_applicants is not None else None
+        )
+        self.resumed = resumed or {}
+        self.rows_read = 0
+        self.chunks_read = 0
+        self.status = ''
+        self.sources = Counter()
+        self._scheduler_stats_before = analyzer.scheduler.get_stats()
+        self._backend_stats_before = analyzer.backend.get_stats()
+        # Token accounting follows the OpenAI backend, whether used directly or behind the cascade
+        self._openai_backend = analyzer.backend
+        if not isinstance(self._openai_backend, OpenAIBackend):
+            self._openai_backend = getattr(analyzer.backend, 'remote', None)
+        self._token_stats_before = self._openai_backend.get_stats() if self._openai_backend is not None else None
+        self._started = time.monotonic()
+    
+    def score_chunk(self, applicants: List[Dict]) -> Iterator[Tuple[int, Dict]]:
+        """Yield (source position, scored applicant) for one chunk, in completion order"""
+        offset = self.rows_read
+        self.rows_read += len(applicants)
+        self.chunks_read += 1
+        METRICS.inc('rows_parsed_total', len(applicants))
+        
+        to_score = list(range(len(applicants)))
+        if self.tracker is not None:
+            unchanged, to_score = self.tracker.split(applicants)
+            for index, carried_over in unchanged:
+                self.sources[carried_over.get('score_source', 'model')] += 1
+                METRICS.inc('rows_scored_total', source='unchanged')
+                yield offset + index, carried_over
+        
+        remaining = []
+        for index in to_score:
+            resumed = self.resumed.get(offset + index)
+            if resumed is not None and is_reusable(resumed, applicants[index], self.signature):
+                self.sources[resumed.get('score_source', 'model')] += 1
+                METRICS.inc('rows_scored_total', source='resumed')
+                yield offset + index, resumed
+            else:
+                remaining.append(index)
+        
+        pending = [applicants[index] for index in remaining]
+        self.status = f"Chunk {self.chunks_read}: 0/{len(pending)} to score"
+        for completed, (pending_index, scoring_result) in enumerate(self.analyzer.score_applicants(pending), start=1):
+            index = remaining[pending_index]
+            applicant = applicants[index]
+            scored = {
+                **applicant,
+                'info_score': scoring_result['info_score'],
+                'experience_score': scoring_result['experience_score'],
+                'overall_level': scoring_result['overall_level'],
+                'reasoning': scoring_result['reasoning'],
+                'score_source': scoring_result.get('score_source', 'model'),
+                'scoring_signature': self.signature,
+                'created_at': datetime.now().isoformat()
+            }
+            self.sources[scored['score_source']] += 1
+            METRICS.inc('rows_scored_total', source=scored['score_source'])
+            self.status = (
+                f"Chunk {self.chunks_read}: {completed}/{len(pending)} to score · "
+                f"{applicant['name']}: {scoring_result['overall_level']}"
+            )
+            yield offset + index, scored
+    
+    def results(self, applicant_chunks: Iterable[List[Dict]]) -> Iterator[Tuple[int, Dict]]:
+        """Scored applicants as soon as each one finishes"""
+        for applicants in applicant_chunks:
+            yield from self.score_chunk(applicants)
+    
+    def scored_chunks(self, applicant_chunks: Iterable[List[Dict]]) -> Iterator[List[Dict]]:
+        """Scored applicants one chunk at a time, in source order"""
+        for applicants in applicant_chunks:
+            yield [applicant for _, applicant in sorted(self.score_chunk(applicants), key=lambda item: item[0])]
+    
+    def summary(self) -> Dict:
+        """Row count, score sources, scheduler counters for this run and the change summary"""
+        elapsed = time.monotonic() - self._started
+        if elapsed > 0:
+            METRICS.set_gauge('last_run_rows_per_second', self.rows_read / elapsed)
+        
+        summary = {
+            'rows': self.rows_read,
+            'sources': dict(self.sources),
+            'scheduler': {
+                key: value - self._scheduler_stats_before[key]
+                for key, value in self.analyzer.scheduler.get_stats().items()
+            },
+            'changes': self.tracker.summary() if self.tracker is not None else None
+        }
+        if isinstance(self.analyzer.backend, CascadeBackend):
+            summary['cascade'] = cascade_report({
+                key: value - self._backend_stats_before[key]
+                for key, value in self.analyzer.backend.get_stats().items()
+            })
+        if self._openai_backend is not None:
+            summary['tokens'] = self.token_summary()
+        return summary
+    
+    def token_summary(self) -> Dict:
+        """Tokens and latency of this run's OpenAI calls, with compact-vs-full savings"""
+        stats = {
+            key: value - self._token_stats_before[key]
+            for key, value in self._openai_backend.get_stats().items()
+        }
+        return token_report(stats, self._openai_backend.prompt_mode)
@@ -0,0 +1,150 @@
+from collections import defaultdict
+from typing import Dict, Optional
+
+import re
+
+import numpy as np
+import pandas as pd
+
+SEARCH_MODES = ['Contains', 'Prefix', 'Fuzzy']
+
+# Share of the query's trigrams a row must contain to count as a fuzzy match
+FUZZY_MIN_SIMILARITY = 0.5
+
+# Word boundaries inside names and emails
+TOKEN_SEPARATORS = re.compile(r'[\s\x00@._-]+')
+
+
+def trigrams(text: str) -> set:
+    """Character trigrams of a lowercase string"""
+    return {text[i:i + 3] for i in range(len(text) - 2)}
+
+
+def word_trigrams(text: str) -> set:
+    """Trigrams of each word padded like pg_trgm ('  w', ' wo', ..., 'rd '), so typos still overlap"""
+    grams = set()
+    for word in TOKEN_SEPARATORS.split(text):
+        if word:
+            grams |= trigrams(f'  {word} ')
+    return grams
+
+
+class ApplicantIndex:
+    """Columnar applicant table with precomputed search and per-level indexes
+
+    Built once per scoring run; filter() then works on integer position arrays
+    instead of rescanning the applicant dicts on every rerun.
+    """
+
+    def __init__(self, table: pd.DataFrame):
+        self.table = table.reset_index(drop=True)
+        self.size = len(self.table)
+
+        names = self.table['name'].fillna('').astype(str).str.lower()
+        emails = self.table['email'].fillna('').astype(str).str.lower()
+        # Name and email searched together; the separator never appears in a query
+        self.search_text = (names + '\x00' + emails).to_numpy(dtype=object)
+
+        levels = self.table['overall_level'].astype(str).to_numpy()
+        self.level_positions = {
+            level: np.flatnonzero(levels == level) for level in pd.unique(levels)
+        }
+
+        # Names and email domains repeat a lot, so each word's trigrams are computed once
+        word_grams = {}
+        postings = defaultdict(list)
+        for position, text in enumerate(self.search_text):
+            grams = set()
+            for word in TOKEN_SEPARATORS.split(text):
+                if word not in word_grams:
+                    word_grams[word] = word_trigrams(word)
+                grams |= word_grams[word]
+            for gram in grams:
+                postings[gram].append(position)
+        self.trigram_postings = {gram: np.array(rows, dtype=np.int64) for gram, rows in postings.items()}
+
+        # Sorted (token, position) pairs for prefix lookups via binary search
+        tokens = pd.Series(self.search_text).str.split(TOKEN_SEPARATORS.pattern, regex=True).explode()
+        tokens = tokens[tokens.astype(bool)]
+        order = np.argsort(tokens.to_numpy(dtype=str), kind='stable')
+        self.prefix_tokens = tokens.to_numpy(dtype=str)[order]
+        self.prefix_positions = tokens.index.to_numpy()[order]
+
+    def level_counts(self) -> Dict[str, int]:
+        """Number of applicants per overall level"""
+        return {level: len(positions) for level, positions in self.level_positions.items()}
+
+    def _contains(self, query: str) -> np.ndarray:
+        # Trigrams inside a single word of the query must occur inside a word of any match
+        grams = {gram for gram in trigrams(query) if not TOKEN_SEPARATORS.search(gram)}
+        if not grams:
+            # Too short for the trigram index; a vectorised scan is still cheap
+            matches = pd.Series(self.search_text).str.contains(query, regex=False)
+            return np.flatnonzero(matches.to_numpy())
+
+        postings = [self.trigram_postings.get(gram) for gram in grams]
+        if any(rows is None for rows in postings):
+            return np.array([], dtype=np.int64)
+
+        candidates = postings[0]
+        for rows in sorted(postings[1:], key=len):
+            candidates = np.intersect1d(candidates, rows, assume_unique=True)
+            if not len(candidates):
+                return candidates
+
+        # Trigram hits are necessary but not sufficient; confirm the substring
+        return np.array([p for p in candidates if query in self.search_text[p]], dtype=np.int64)
+
+    def _token_prefix(self, token: str) -> np.ndarray:
+        start = np.searchsorted(self.prefix_tokens, token, side='left')
+        end = np.searchsorted(self.prefix_tokens, token + '\uffff', side='left')
+        return np.unique(self.prefix_positions[start:end])
+
+    def _prefix(self, query: str) -> np.ndarray:
+        # Every word of the query ('ann smi') must start some word of the row
+        words = [word for word in TOKEN_SEPARATORS.split(query) if word]
+        if not words:
+            return np.array([], dtype=np.int64)
+
+        positions = self._token_prefix(words[0])
+        for word in words[1:]:
+            if not len(positions):
+                break
+            positions = np.intersect1d(positions, self._token_prefix(word), assume_unique=True)
+        return positions
+
+    def _fuzzy(self, query: str) -> np.ndarray:
+        grams = word_trigrams(query)
+        if len(grams) < 3:
+            return self._contains(query)
+
+        hits = [self.trigram_postings[gram] for gram in grams if gram in self.trigram_postings]
+        if not hits:
+            return np.array([], dtype=np.int64)
+
+        counts = np.bincount(np.concatenate(hits), minlength=self.size)
+        similarity = counts / len(grams)
+        matches = np.flatnonzero(similarity >= FUZZY_MIN_SIMILARITY)
+        # Best matches first
+        return matches[np.argsort(-similarity[matches], kind='stable')]
+
+    def filter(self, level: Optional[str] = None, query: str = '', mode: str = 'Contains') -> np.ndarray:
+        """Positions of applicants matching the level and search query"""
+        query = query.strip().lower()
+
+        if query:
+            if mode == 'Prefix':
+                positions = self._prefix(query)
+            elif mode == 'Fuzzy':
+                positions = self._fuzzy(query)
+            else:
+                positions = self._contains(query)
+        else:
+            positions = np.arange(self.size)
+
+        if level:
+            allowed = np.zeros(self.size, dtype=bool)
+            allowed[self.level_positions.get(level, [])] = True
+            positions = positions[allowed[positions]]
+
+        return positions
@@ -0,0 +1,162 @@
+import hashlib
+from typing import Dict, List, Optional
+
+import numpy as np
+import pandas as pd
+
+from keyword_matcher import KeywordMatcher, load_matcher
+
+NUMERIC_FIELDS = {'age': 'Age', 'height': 'Height', 'weight': 'Weight'}
+TEXT_FIELDS = {
+    'education': 'Education',
+    'location': 'Location',
+    'skills': 'Skills',
+    'previous_roles': 'Previous_Roles',
+    'certifications': 'Certifications'
+}
+
+# Normalized fields that define a row's content (external_id is positional, so it is excluded)
+FINGERPRINT_FIELDS = [
+    'name', 'email', 'phone', 'age', 'height', 'weight', 'experience_years',
+    'education', 'location', 'skills', 'previous_roles', 'certifications'
+]
+
+
+# Numeric fields are always float64 (see _numeric), so str() of them is already stable
+NUMERIC_FINGERPRINT_FIELDS = {'age', 'height', 'weight', 'experience_years'}
+
+
+def _cell_text(value) -> str:
+    """str(value), except integral floats lose the '.0' pandas adds when a column also holds blanks"""
+    if isinstance(value, float) and value.is_integer():
+        return str(int(value))
+    return str(value)
+
+
+def _as_text(series: pd.Series) -> pd.Series:
+    """Column of _cell_text for every cell (missing values become 'nan'), whatever dtype the chunk inferred"""
+    if isinstance(series.dtype, pd.StringDtype):
+        return series.astype(object).where(series.notna(), 'nan')
+    return series.map(_cell_text)
+
+
+def _numeric(df: pd.DataFrame, column: str, default=np.nan) -> pd.Series:
+    """Column as float64 with unparseable cells as NaN, and a default for absent columns"""
+    if column not in df.columns:
+        return pd.Series(default, index=df.index, dtype='float64')
+    return pd.to_numeric(df[column], errors='coerce').astype('float64')
+
+
+def normalize_applicants(df: pd.DataFrame, start_index: int = 0) -> pd.DataFrame:
+    """Build the flat applicant table from a raw sheet using whole-column operations"""
+    numbers = pd.RangeIndex(start_index + 1, start_index + len(df) + 1).astype(str)
+    number_series = pd.Series(numbers, index=df.index)
+
+    table = pd.DataFrame(index=df.index)
+    table['external_id'] = 'EXT_' + number_series
+    table['name'] = _as_text(df['Name']) if 'Name' in df.columns else 'Applicant ' + number_series
+    table['email'] = (
+        _as_text(df['Email']) if 'Email' in df.columns else 'applicant' + number_series + '@example.com'
+    )
+    # Placeholders numbered by position; they must not identify or fingerprint an applicant
+    table['name_generated'] = 'Name' not in df.columns
+    table['email_generated'] = 'Email' not in df.columns
+    table['phone'] = _as_text(df['Phone']) if 'Phone' in df.columns else ''
+
+    for field, column in NUMERIC_FIELDS.items():
+        table[field] = _numeric(df, column)
+
+    # BMI is 0 unless both height and weight are usable
+    height = table['height']
+    weight = table['weight']
+    valid = height.notna() & weight.notna() & (height > 0) & (weight != 0)
+    table['bmi'] = (weight / (height / 100) ** 2).where(valid, 0.0).round(2)
+
+    table['experience_years'] = _numeric(df, 'Experience_Years', default=0.0)
+    for field, column in TEXT_FIELDS.items():
+        table[field] = df[column] if column in df.columns else ''
+
+    table['fingerprint'] = row_fingerprints(table)
+    return table
+
+
+def row_fingerprints(table: pd.DataFrame) -> pd.Series:
+    """Stable per-row hash of the normalized fields, identical across runs, processes and chunk sizes"""
+    text = pd.DataFrame({
+        field: table[field].astype(str) if field in NUMERIC_FINGERPRINT_FIELDS else _as_text(table[field])
+        for field in FINGERPRINT_FIELDS
+    })
+    text['name'] = text['name'].where(~table['name_generated'], '')
+    text['email'] = text['email'].where(~table['email_generated'], '')
+    hashes = pd.util.hash_pandas_object(text, index=False)
+    return hashes.map(lambda value: format(value, '016x'))
+
+
+def frame_digest(data: pd.DataFrame) -> str:
+    """Content hash of a whole frame (values, index, column names and dtypes)"""
+    digest = hashlib.sha256(pd.util.hash_pandas_object(data, index=True).to_numpy().tobytes())
+    digest.update(repr(list(zip(data.columns, data.dtypes.astype(str)))).encode('utf-8'))
+    return digest.hexdigest()
+
+
+def applicant_records(table: pd.DataFrame, raw_rows: List[Dict]) -> List[Dict]:
+    """Convert a normalized table into the nested applicant dicts used by the UI"""
+    # NaN numbers are reported as None, as the per-row parse did
+    numeric = table[['age', 'height', 'weight', 'experience_years']]
+    numeric = numeric.astype(object).where(numeric.notna(), None)
+
+    columns = [
+        table['external_id'], table['name'], table['email'], table['name_generated'], table['email_generated'],
+        table['phone'],
+        numeric['age'], numeric['height'], numeric['weight'], table['bmi'],
+        table['education'], table['location'], table['skills'],
+        numeric['experience_years'], table['previous_roles'], table['certifications'],
+        table['fingerprint']
+    ]
+
+    return [
+        {
+            'external_id': external_id,
+            'name': name,
+            'email': email,
+            'name_generated': name_generated,
+            'email_generated': email_generated,
+            'phone': phone,
+            'age': age,
+            'height': height,
+            'weight': weight,
+            'bmi': bmi,
+            'basic_info': {'education': education, 'location': location, 'skills': skills},
+            'experience': {'years': years, 'previous_roles': previous_roles, 'certifications': certifications},
+            'raw_data': raw_data,
+            'fingerprint': fingerprint
+        }
+        for (external_id, name, email, name_generated, email_generated, phone, age, height, weight, bmi, education,
+             location, skills, years, previous_roles, certifications, fingerprint), raw_data
+        in zip(zip(*(column.tolist() for column in columns)), raw_rows)
+    ]
+
+
+def experience_levels(descriptions: pd.Series, years: pd.Series,
+                      matcher: Optional[KeywordMatcher] = None) -> pd.Series:
+    """Experience level per row: Low without a description, High for 5+ years with a High keyword, Mid for 2+ years"""
+    matcher = matcher or load_matcher()
+    years = pd.to_numeric(years, errors='coerce')
+    has_text = descriptions.notna() & (descriptions.astype(str) != '')
+    has_high_keyword = matcher.has_high_keyword(descriptions)
+
+    levels = np.select(
+        [~has_text, (years >= 5) & has_high_keyword, years >= 5, years >= 2],
+        ['Low', 'High', 'Mid', 'Mid'],
+        default='Low'
+    )
+    return pd.Series(levels, index=descriptions.index)
+
+
+def derive_applicant_levels(data: pd.DataFrame, matcher: Optional[KeywordMatcher] = None) -> pd.DataFrame:
+    """Add BMI, Experience_Level and Final_Level columns in one vectorized pass"""
+    bmi = data['Weight_kg'] / (data['Height_cm'] / 100) ** 2
+    experience_level = experience_levels(data['Experience_Description'], data['Years_Experience'], matcher)
+    final_level = pd.Series(np.where(bmi > 25, 'Low', experience_level), index=data.index)
+
+    return data.assign(BMI=bmi, Experience_Level=experience_level, Final_Level=final_level)
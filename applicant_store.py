@@ -0,0 +1,134 @@
+from typing import Dict, Iterable, List, Optional
+
+import numpy as np
+import pandas as pd
+
+LEVELS = ['High', 'Mid', 'Low']
+
+# Flat columns and their storage types; the nested dicts are rebuilt on access
+STORE_DTYPES = {
+    'external_id': 'string',
+    'name': 'string',
+    'email': 'string',
+    'phone': 'string',
+    'age': 'float64',
+    'height': 'float64',
+    'weight': 'float64',
+    'bmi': 'float64',
+    'education': 'category',
+    'location': 'category',
+    'skills': 'category',
+    'experience_years': 'float64',
+    'previous_roles': 'category',
+    'certifications': 'category',
+    'info_score': 'float64',
+    'experience_score': 'float64',
+    'overall_level': pd.CategoricalDtype(LEVELS),
+    'reasoning': 'category',
+    'score_source': 'category',
+    'scoring_signature': 'category',
+    'created_at': 'string',
+    'fingerprint': 'string',
+    'row_key': 'string',
+    'source_file': 'category',
+    'source_sheet': 'category',
+    'source_row': 'Int32',
+    'provenance': 'object',
+}
+
+# Where each flat column lives in an applicant dict: top level, 'basic_info' or 'experience'
+NESTED_FIELDS = {
+    'education': ('basic_info', 'education'),
+    'location': ('basic_info', 'location'),
+    'skills': ('basic_info', 'skills'),
+    'experience_years': ('experience', 'years'),
+    'previous_roles': ('experience', 'previous_roles'),
+    'certifications': ('experience', 'certifications'),
+}
+
+
+def _field(applicant: Dict, column: str):
+    if column in NESTED_FIELDS:
+        section, key = NESTED_FIELDS[column]
+        return applicant.get(section, {}).get(key)
+    return applicant.get(column)
+
+
+def _python_value(value):
+    """NA/NaN -> None and numpy scalars -> Python scalars, as in the original dicts"""
+    if value is None or value is pd.NA or (isinstance(value, float) and np.isnan(value)):
+        return None
+    if isinstance(value, np.generic):
+        return value.item()
+    return value
+
+
+class ApplicantStore:
+    """Scored applicants as one typed column table instead of a list of nested dicts
+
+    Repeated text (levels, education, locations, reasoning, source files) is stored
+    as categoricals, numbers as floats, and the raw spreadsheet row is not kept.
+    record() rebuilds the nested dict shape the UI and scoring code expect.
+    """
+
+    def __init__(self, table: Optional[pd.DataFrame] = None):
+        if table is None:
+            table = pd.DataFrame({column: pd.Series(dtype=dtype) for column, dtype in STORE_DTYPES.items()})
+        self.table = table.reset_index(drop=True)
+
+    @classmethod
+    def from_applicants(cls, applicants: Iterable[Dict]) -> 'ApplicantStore':
+        applicants = list(applicants)
+        columns = {
+            column: [_field(applicant, column) for applicant in applicants]
+            for column in STORE_DTYPES
+        }
+
+        table = pd.DataFrame(index=range(len(applicants)))
+        for column, dtype in STORE_DTYPES.items():
+            values = pd.Series(columns[column], dtype=object)
+            if dtype in ('float64', 'Int32'):
+                values = pd.to_numeric(values, errors='coerce')
+            elif dtype != 'object':
+                values = values.where(values.isna(), values.astype(str))
+            table[column] = values.astype(dtype)
+        return cls(table)
+
+    def __len__(self) -> int:
+        return len(self.table)
+
+    def record(self, position: int) -> Dict:
+        """Applicant at a row position in the nested dict shape of applicant_records()"""
+        return self.records([position])[0]
+
+    def records(self, positions: Optional[Iterable[int]] = None) -> List[Dict]:
+        """Several applicants as nested dicts (all of them when positions is None)"""
+        rows = self.table if positions is None else self.table.iloc[list(positions)]
+        applicants = []
+        for row in rows.to_dict('records'):
+            applicant = {
+                column: _python_value(value) for column, value in row.items() if column not in NESTED_FIELDS
+            }
+            applicant['basic_info'] = {}
+            applicant['experience'] = {}
+            for column, (section, key) in NESTED_FIELDS.items():
+                applicant[section][key] = _python_value(row[column])
+            applicants.append(applicant)
+        return applicants
+
+    def columns(self, names: List[str]) -> pd.DataFrame:
+        """Flat view of some columns, e.g. for the grid or the search index"""
+        return self.table[names]
+
+    def level_counts(self) -> Dict[str, int]:
+        counts = self.table['overall_level'].value_counts()
+        return {level: int(counts.get(level, 0)) for level in LEVELS}
+
+    def export_table(self) -> pd.DataFrame:
+        """Every stored column, with categoricals expanded back to plain values"""
+        return self.table.astype({
+            column: object for column, dtype in self.table.dtypes.items() if isinstance(dtype, pd.CategoricalDtype)
+        })
+
+    def memory_bytes(self) -> int:
+        return int(self.table.memory_usage(deep=True).sum())
@@ -0,0 +1,180 @@
+"""
+Benchmark: per-row applicant normalization vs the columnar stage in applicant_normalize.
+
+Usage:
+    python benchmarks/bench_normalize.py
+    python benchmarks/bench_normalize.py --sizes 10000 100000 --max-legacy-rows 100000 --json results.json
+"""
+import argparse
+import json
+import os
+import sys
+import time
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from applicant_normalize import applicant_records, derive_applicant_levels, normalize_applicants  # noqa: E402
+
+# Keyword lists hard-coded in the original analyze_experience
+HIGH_EXPERIENCE_KEYWORDS = ['senior', 'lead', 'manager', 'director', 'principal', 'architect', 'expert']
+MID_EXPERIENCE_KEYWORDS = ['developer', 'engineer', 'analyst', 'specialist', 'coordinator']
+
+
+def make_intake_sheet(rows: int, seed: int = 0) -> pd.DataFrame:
+    """Synthetic sheet in the streamlit_app.py schema, with some blank and malformed cells"""
+    rng = np.random.default_rng(seed)
+    height = rng.normal(168, 9, rows).round().astype(object)
+    height[rng.random(rows) < 0.05] = None
+    weight = rng.normal(65, 12, rows).round().astype(object)
+    weight[rng.random(rows) < 0.05] = 'n/a'
+    return pd.DataFrame({
+        'Name': [f'Applicant {i}' for i in range(rows)],
+        'Email': [f'applicant{i}@example.com' for i in range(rows)],
+        'Phone': rng.integers(800000000, 999999999, rows).astype(str),
+        'Age': rng.integers(20, 60, rows),
+        'Height': height,
+        'Weight': weight,
+        'Education': rng.choice(['Bachelor', 'Master', 'PhD', None], rows),
+        'Location': rng.choice(['Bangkok', 'Chiang Mai', 'Phuket'], rows),
+        'Skills': rng.choice(['Python, SQL', 'Excel', 'Java, Go'], rows),
+        'Experience_Years': rng.integers(0, 15, rows),
+        'Previous_Roles': rng.choice(['Developer', 'Analyst', 'Manager'], rows),
+        'Certifications': rng.choice(['AWS', 'PMP', ''], rows)
+    })
+
+
+def make_demo_sheet(rows: int, seed: int = 0) -> pd.DataFrame:
+    """Synthetic sheet in the blueagenttest.py schema"""
+    rng = np.random.default_rng(seed)
+    titles = ['Senior Software Engineer', 'Data Analyst', 'Lead Backend Developer',
+              'UX Designer fresh from bootcamp', 'Product Manager', '']
+    return pd.DataFrame({
+        'Name': [f'Applicant {i}' for i in range(rows)],
+        'Weight_kg': rng.normal(68, 12, rows).round(),
+        'Height_cm': rng.normal(170, 9, rows).round(),
+        'Years_Experience': rng.integers(0, 15, rows),
+        'Experience_Description': rng.choice(titles, rows)
+    })
+
+
+def legacy_safe_convert_to_number(value):
+    if pd.isna(value):
+        return None
+    try:
+        return float(value)
+    except Exception:
+        return None
+
+
+def legacy_parse(df: pd.DataFrame) -> list:
+    """The original iterrows/row.get loop from parse_excel_file"""
+    applicants = []
+    for index, row in df.iterrows():
+        height = legacy_safe_convert_to_number(row.get('Height'))
+        weight = legacy_safe_convert_to_number(row.get('Weight'))
+        bmi = 0
+        if height and weight and height > 0:
+            bmi = weight / ((height / 100) ** 2)
+        applicants.append({
+            'external_id': f'EXT_{index + 1}',
+            'name': str(row.get('Name', f'Applicant {index + 1}')),
+            'email': str(row.get('Email', f'applicant{index + 1}@example.com')),
+            'phone': str(row.get('Phone', '')),
+            'age': legacy_safe_convert_to_number(row.get('Age')),
+            'height': height,
+            'weight': weight,
+            'bmi': round(bmi, 2),
+            'basic_info': {
+                'education': row.get('Education', ''),
+                'location': row.get('Location', ''),
+                'skills': row.get('Skills', '')
+            },
+            'experience': {
+                'years': legacy_safe_convert_to_number(row.get('Experience_Years', 0)),
+                'previous_roles': row.get('Previous_Roles', ''),
+                'certifications': row.get('Certifications', '')
+            },
+            'raw_data': row.to_dict()
+        })
+    return applicants
+
+
+def legacy_analyze_experience(experience_text, years_experience):
+    if not experience_text:
+        return "Low"
+    exp_lower = experience_text.lower()
+    if years_experience >= 5:
+        if any(keyword in exp_lower for keyword in HIGH_EXPERIENCE_KEYWORDS):
+            return "High"
+        elif any(keyword in exp_lower for keyword in MID_EXPERIENCE_KEYWORDS):
+            return "Mid"
+        return "Mid"
+    elif years_experience >= 2:
+        return "Mid"
+    return "Low"
+
+
+def legacy_derive(data: pd.DataFrame) -> pd.DataFrame:
+    """The original three data.apply(..., axis=1) passes from blueagenttest.py main()"""
+    data = data.copy()
+    data['BMI'] = data.apply(lambda row: row['Weight_kg'] / ((row['Height_cm'] / 100) ** 2), axis=1)
+    data['Experience_Level'] = data.apply(
+        lambda row: legacy_analyze_experience(row['Experience_Description'], row['Years_Experience']), axis=1
+    )
+    data['Final_Level'] = data.apply(
+        lambda row: "Low" if row['BMI'] > 25 else row['Experience_Level'], axis=1
+    )
+    return data
+
+
+def columnar_parse(df: pd.DataFrame) -> list:
+    return applicant_records(normalize_applicants(df), df.to_dict('records'))
+
+
+def timed(function, *args) -> float:
+    start = time.perf_counter()
+    function(*args)
+    return time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--sizes', type=int, nargs='+', default=[10_000, 100_000, 1_000_000])
+    parser.add_argument('--max-legacy-rows', type=int, default=1_000_000,
+                        help='skip the (slow) per-row baseline above this many rows')
+    parser.add_argument('--json', help='write results to this file')
+    args = parser.parse_args()
+
+    results = []
+    print(f"{'stage':<10} {'rows':>10} {'legacy s':>10} {'columnar s':>11} {'speedup':>8}")
+    for rows in args.sizes:
+        stages = [
+            ('normalize', make_intake_sheet(rows), legacy_parse, columnar_parse),
+            ('derive', make_demo_sheet(rows), legacy_derive, derive_applicant_levels)
+        ]
+        for stage, frame, legacy, columnar in stages:
+            columnar_seconds = timed(columnar, frame)
+            legacy_seconds = timed(legacy, frame) if rows <= args.max_legacy_rows else None
+            speedup = legacy_seconds / columnar_seconds if legacy_seconds else None
+
+            results.append({
+                'stage': stage,
+                'rows': rows,
+                'legacy_seconds': legacy_seconds,
+                'columnar_seconds': columnar_seconds,
+                'speedup': speedup
+            })
+            legacy_column = f"{legacy_seconds:.2f}" if legacy_seconds is not None else '-'
+            speedup_column = f"{speedup:.1f}x" if speedup is not None else '-'
+            print(f"{stage:<10} {rows:>10} {legacy_column:>10} {columnar_seconds:>11.2f} {speedup_column:>8}")
+
+    if args.json:
+        with open(args.json, 'w') as f:
+            json.dump(results, f, indent=2)
+
+
+if __name__ == '__main__':
+    main()
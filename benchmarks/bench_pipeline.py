@@ -0,0 +1,252 @@
+"""
+Benchmark: end-to-end pipeline stages on synthetic workbooks in both sheet schemas.
+
+Workbooks in the English schema of blueagenttest.py (Name/Email/Weight_kg/...) and
+the Thai schema of blueagent2.py (ชื่อ/น้ำหนัก/ส่วนสูง/ประสบการณ์ (ปี)) are generated once
+per (schema, rows, seed) and cached in --data-dir. Thai sheets have no email, position
+or role description, so those columns are empty from the derive stage on. Each run times:
+
+    parse        stream the first sheet with workbook_reader
+    derive       map headers, BMI and Experience/Final levels (derive_applicant_levels)
+    score        ScoringRun with the mock backend standing in for the LLM
+    filter       ApplicantIndex level + text filter
+    render_prep  one page of cards and the grid slice
+    export       CSV (and Parquet when available) of the scored table
+
+Usage:
+    python benchmarks/bench_pipeline.py
+    python benchmarks/bench_pipeline.py --sizes 1000 100000 1000000 --json results.json
+    python benchmarks/bench_pipeline.py --json new.json --baseline results.json --tolerance 0.25
+
+With --baseline, the exit status is 1 when any stage is slower than the baseline
+by more than --tolerance (stages under --min-seconds are ignored as noise).
+"""
+import argparse
+import json
+import os
+import platform
+import sys
+import time
+from datetime import datetime, timezone
+
+import numpy as np
+import openpyxl
+import pandas as pd
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from applicant_analyzer import ApplicantAnalyzer, ScoringRun  # noqa: E402
+from applicant_index import ApplicantIndex  # noqa: E402
+from applicant_normalize import derive_applicant_levels  # noqa: E402
+from applicant_store import ApplicantStore  # noqa: E402
+from exports import EXPORT_FORMATS, export_bytes  # noqa: E402
+from keyword_matcher import load_matcher  # noqa: E402
+from scoring_backends import MockBackend  # noqa: E402
+from workbook_reader import build_applicants, iter_excel_rows  # noqa: E402
+
+# The headers blueagent2.py reads -> blueagenttest.py headers
+THAI_COLUMNS = {
+    'ชื่อ': 'Name',
+    'น้ำหนัก': 'Weight_kg',
+    'ส่วนสูง': 'Height_cm',
+    'ประสบการณ์ (ปี)': 'Years_Experience',
+}
+
+# blueagenttest.py headers the Thai sheet has no equivalent for; added empty before deriving
+ENGLISH_ONLY_COLUMNS = ['Email', 'Position', 'Experience_Description']
+
+# blueagenttest.py headers -> the intake headers ApplicantAnalyzer parses
+INTAKE_COLUMNS = {
+    'Weight_kg': 'Weight',
+    'Height_cm': 'Height',
+    'Years_Experience': 'Experience_Years',
+    'Experience_Description': 'Previous_Roles',
+}
+
+GRID_COLUMNS = [
+    'external_id', 'name', 'email', 'phone', 'overall_level', 'info_score',
+    'experience_score', 'age', 'bmi', 'reasoning'
+]
+
+STAGES = ['parse', 'derive', 'score', 'filter', 'render_prep', 'export']
+
+# Bump when make_sheet's output changes so cached workbooks are regenerated
+SHEET_VERSION = 2
+
+CHUNK_SIZE = 5000
+PAGE_SIZE = 20
+
+
+def make_sheet(schema: str, rows: int, seed: int = 0) -> pd.DataFrame:
+    """Synthetic applicants in the 'en' (blueagenttest.py) or 'th' (blueagent2.py) schema"""
+    rng = np.random.default_rng(seed)
+    titles = ['Senior Software Engineer', 'Data Analyst', 'Lead Backend Developer',
+              'UX Designer fresh from bootcamp', 'Product Manager', 'Warehouse staff', '']
+    positions = ['Software Engineer', 'Data Analyst', 'Product Manager', 'UX Designer', 'Backend Developer']
+
+    weight = rng.normal(68, 12, rows).round()
+    height = rng.normal(170, 9, rows).round()
+    # A few blank cells, as in real intake sheets
+    weight[rng.random(rows) < 0.02] = np.nan
+
+    sheet = pd.DataFrame({
+        'Name': [f'Applicant {i}' for i in range(rows)],
+        'Email': [f'applicant{i}@example.com' for i in range(rows)],
+        'Position': rng.choice(positions, rows),
+        'Weight_kg': weight,
+        'Height_cm': height,
+        'Years_Experience': rng.integers(0, 15, rows),
+        'Experience_Description': rng.choice(titles, rows)
+    })
+    if schema == 'th':
+        sheet = sheet[list(THAI_COLUMNS.values())].rename(
+            columns={english: thai for thai, english in THAI_COLUMNS.items()}
+        )
+    return sheet
+
+
+def workbook_path(data_dir: str, schema: str, rows: int, seed: int) -> str:
+    """Generate (once) and return the .xlsx for a schema/size/seed"""
+    path = os.path.join(data_dir, f'applicants_v{SHEET_VERSION}_{schema}_{rows}_{seed}.xlsx')
+    if os.path.exists(path):
+        return path
+
+    os.makedirs(data_dir, exist_ok=True)
+    sheet = make_sheet(schema, rows, seed)
+    workbook = openpyxl.Workbook(write_only=True)
+    worksheet = workbook.create_sheet('Applicants')
+    worksheet.append(list(sheet.columns))
+    for row in sheet.itertuples(index=False):
+        worksheet.append([None if isinstance(value, float) and np.isnan(value) else value for value in row])
+    workbook.save(path + '.tmp')
+    os.replace(path + '.tmp', path)
+    return path
+
+
+def run_pipeline(path: str, schema: str, llm_latency: float, workers: int) -> dict:
+    """Seconds per stage for one workbook"""
+    seconds = {}
+
+    started = time.perf_counter()
+    with open(path, 'rb') as f:
+        raw = pd.DataFrame(list(iter_excel_rows(f)))
+    seconds['parse'] = time.perf_counter() - started
+
+    started = time.perf_counter()
+    data = raw
+    if schema == 'th':
+        data = raw.rename(columns=THAI_COLUMNS).reindex(columns=list(THAI_COLUMNS.values()) + ENGLISH_ONLY_COLUMNS)
+    data = derive_applicant_levels(data, load_matcher())
+    seconds['derive'] = time.perf_counter() - started
+
+    started = time.perf_counter()
+    intake = data.drop(columns=['BMI', 'Experience_Level', 'Final_Level']).rename(columns=INTAKE_COLUMNS)
+    records = intake.to_dict('records')
+    chunks = (
+        build_applicants(records[start:start + CHUNK_SIZE], start)
+        for start in range(0, len(records), CHUNK_SIZE)
+    )
+    analyzer = ApplicantAnalyzer('', max_concurrency=workers, backend=MockBackend(latency=llm_latency))
+    run = ScoringRun(analyzer)
+    store = ApplicantStore.from_applicants(
+        applicant for scored in run.scored_chunks(chunks) for applicant in scored
+    )
+    seconds['score'] = time.perf_counter() - started
+
+    started = time.perf_counter()
+    index = ApplicantIndex(store.columns(GRID_COLUMNS))
+    index.filter(level='High')
+    positions = index.filter(query='applicant 1')
+    data[data['Final_Level'] == 'High']
+    seconds['filter'] = time.perf_counter() - started
+
+    started = time.perf_counter()
+    store.records(positions[:PAGE_SIZE])
+    index.table.iloc[positions[:PAGE_SIZE * 10]]
+    seconds['render_prep'] = time.perf_counter() - started
+
+    started = time.perf_counter()
+    table = store.export_table()
+    for fmt in ('CSV', 'Parquet'):
+        if fmt in EXPORT_FORMATS:
+            export_bytes(table, fmt)
+    seconds['export'] = time.perf_counter() - started
+
+    return seconds
+
+
+def compare(results: list, baseline: list, tolerance: float, min_seconds: float) -> list:
+    """Stages slower than the baseline by more than tolerance"""
+    previous = {(r['schema'], r['rows'], r['stage']): r['seconds'] for r in baseline}
+    regressions = []
+    for result in results:
+        before = previous.get((result['schema'], result['rows'], result['stage']))
+        if before is None or max(before, result['seconds']) < min_seconds:
+            continue
+        if result['seconds'] > before * (1 + tolerance):
+            regressions.append({**result, 'baseline_seconds': before, 'ratio': result['seconds'] / before})
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--sizes', type=int, nargs='+', default=[1_000, 10_000, 100_000])
+    parser.add_argument('--schemas', nargs='+', choices=['en', 'th'], default=['en', 'th'])
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--repeat', type=int, default=1, help='runs per workbook; the fastest is reported')
+    parser.add_argument('--llm-latency', type=float, default=0.0, help='seconds per stubbed LLM scoring call')
+    parser.add_argument('--workers', type=int, default=8, help='scoring concurrency')
+    parser.add_argument('--data-dir', default=os.path.join(os.path.dirname(os.path.abspath(__file__)), '.data'),
+                        help='where generated workbooks are cached')
+    parser.add_argument('--json', help='write results to this file')
+    parser.add_argument('--baseline', help='earlier --json output to check for regressions')
+    parser.add_argument('--tolerance', type=float, default=0.25, help='allowed slowdown vs the baseline')
+    parser.add_argument('--min-seconds', type=float, default=0.05, help='ignore stages faster than this')
+    args = parser.parse_args()
+
+    results = []
+    print(f"{'schema':<7} {'rows':>9} " + ' '.join(f'{stage:>11}' for stage in STAGES) + f" {'rows/s':>9}")
+    for rows in args.sizes:
+        for schema in args.schemas:
+            path = workbook_path(args.data_dir, schema, rows, args.seed)
+            runs = [run_pipeline(path, schema, args.llm_latency, args.workers) for _ in range(args.repeat)]
+            best = {stage: min(run[stage] for run in runs) for stage in STAGES}
+
+            for stage in STAGES:
+                results.append({
+                    'schema': schema,
+                    'rows': rows,
+                    'stage': stage,
+                    'seconds': best[stage],
+                    'rows_per_second': rows / best[stage] if best[stage] else None
+                })
+            total = sum(best.values())
+            print(f"{schema:<7} {rows:>9} " + ' '.join(f'{best[stage]:>10.3f}s' for stage in STAGES)
+                  + f" {rows / total:>9.0f}")
+
+    if args.json:
+        with open(args.json, 'w') as f:
+            json.dump({
+                'created_at': datetime.now(timezone.utc).isoformat(),
+                'python': platform.python_version(),
+                'pandas': pd.__version__,
+                'platform': platform.platform(),
+                'options': {'seed': args.seed, 'repeat': args.repeat, 'llm_latency': args.llm_latency,
+                            'workers': args.workers},
+                'results': results
+            }, f, indent=2)
+
+    if args.baseline:
+        with open(args.baseline) as f:
+            baseline = json.load(f)['results']
+        regressions = compare(results, baseline, args.tolerance, args.min_seconds)
+        for regression in regressions:
+            print(f"REGRESSION {regression['schema']} {regression['rows']} {regression['stage']}: "
+                  f"{regression['baseline_seconds']:.3f}s -> {regression['seconds']:.3f}s "
+                  f"({regression['ratio']:.2f}x)")
+        if regressions:
+            sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
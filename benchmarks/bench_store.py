@@ -0,0 +1,99 @@
+"""
+Benchmark: memory of scored applicants as a list of nested dicts vs ApplicantStore.
+
+Usage:
+    python benchmarks/bench_store.py
+    python benchmarks/bench_store.py --sizes 10000 100000 --json results.json
+"""
+import argparse
+import gc
+import json
+import os
+import sys
+import time
+import tracemalloc
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from applicant_normalize import applicant_records, normalize_applicants  # noqa: E402
+from applicant_store import ApplicantStore  # noqa: E402
+from bench_normalize import make_intake_sheet  # noqa: E402
+
+
+def make_scored_applicants(rows: int, seed: int = 0) -> list:
+    """Applicant dicts as kept in session state before ApplicantStore, scores included"""
+    sheet = make_intake_sheet(rows, seed)
+    applicants = applicant_records(normalize_applicants(sheet), sheet.to_dict('records'))
+
+    rng = np.random.default_rng(seed)
+    info_scores = rng.integers(30, 100, rows)
+    experience_scores = rng.integers(30, 100, rows)
+    for applicant, info_score, experience_score in zip(applicants, info_scores, experience_scores):
+        combined = (info_score + experience_score) / 2
+        applicant.update({
+            'info_score': float(info_score),
+            'experience_score': float(experience_score),
+            'overall_level': 'High' if combined >= 80 else 'Mid' if combined >= 60 else 'Low',
+            'reasoning': f'Combined score: {combined:.1f}%',
+            'score_source': 'model',
+            'created_at': '2024-01-01T00:00:00',
+            'row_key': f"{applicant['email']}#1"
+        })
+    return applicants
+
+
+def retained_bytes(build) -> tuple:
+    """(bytes still allocated after build() returns, the built object)"""
+    gc.collect()
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    result = build()
+    gc.collect()
+    after = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    return after - before, result
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--sizes', type=int, nargs='+', default=[10_000, 100_000])
+    parser.add_argument('--json', help='write results to this file')
+    args = parser.parse_args()
+
+    results = []
+    print(f"{'rows':>10} {'dicts MB':>10} {'store MB':>10} {'ratio':>7} {'build s':>8} {'page ms':>8}")
+    for rows in args.sizes:
+        dict_bytes, applicants = retained_bytes(lambda: make_scored_applicants(rows))
+
+        start = time.perf_counter()
+        store = ApplicantStore.from_applicants(applicants)
+        build_seconds = time.perf_counter() - start
+        del applicants
+        # Strings in the store may share objects with the dicts, so they are sized by pandas (deep)
+        store_bytes = store.memory_bytes()
+
+        # Cost of materialising one page of cards from the store
+        start = time.perf_counter()
+        store.records(range(min(100, rows)))
+        page_ms = (time.perf_counter() - start) * 1000
+
+        results.append({
+            'rows': rows,
+            'dict_bytes': dict_bytes,
+            'store_bytes': store_bytes,
+            'ratio': dict_bytes / store_bytes,
+            'build_seconds': build_seconds,
+            'page_of_100_ms': page_ms
+        })
+        print(f"{rows:>10} {dict_bytes / 1e6:>10.1f} {store_bytes / 1e6:>10.1f} {dict_bytes / store_bytes:>6.1f}x "
+              f"{build_seconds:>8.2f} {page_ms:>8.1f}")
+
+    if args.json:
+        with open(args.json, 'w') as f:
+            json.dump(results, f, indent=2)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,300 @@
+"""Headless batch scoring for applicant workbooks (no Streamlit required)
+
+    python blue_agent_cli.py score in.xlsx --out out.parquet --workers 16
+    python blue_agent_cli.py score postings/ extra.zip https://... --out all.parquet
+
+A single workbook is streamed parse -> score -> write one chunk at a time, so
+memory stays bounded by --chunk-size regardless of the workbook size. The input
+may be a local .xlsx/.xls file or a SharePoint/OneDrive URL. Folders, zip files,
+several inputs or --all-sheets switch to multi-source mode: every sheet of every
+workbook is parsed across a process pool and merged into one deduplicated table
+with (file, sheet, row) provenance before scoring.
+
+The output format follows the --out extension (.parquet, .csv or .jsonl).
+--backend picks the scorer: openai (default), local (deterministic rules, no
+network), cascade (local rules, with only low-confidence rows sent to OpenAI;
+see --escalate-below) or mock (hash-based scores for load tests).
+OPENAI_API_KEY is read from the environment unless --api-key is given; only the
+openai and cascade backends need it. --base-url (or $OPENAI_BASE_URL) points them at
+another OpenAI-compatible endpoint, such as mock_openai_server.py for load tests.
+"""
+import argparse
+import contextlib
+import json
+import logging
+import os
+import sys
+import time
+from typing import Dict, List, Optional
+
+import pandas as pd
+
+from applicant_analyzer import ApplicantAnalyzer, ScoringRun
+from http_fetch import ConditionalFetcher
+from multi_source import discover_sources, load_applicant_sources
+from metrics import METRICS
+from request_scheduler import RequestScheduler
+from score_cache import ScoreCache
+from scoring_backends import BACKENDS, OpenAIBackend, create_backend
+
+logger = logging.getLogger('blue_agent')
+
+# Flat output schema: text columns are written as strings, the rest as floats
+TEXT_COLUMNS = [
+    'external_id', 'name', 'email', 'phone', 'education', 'location', 'skills', 'previous_roles', 'certifications',
+    'overall_level', 'reasoning', 'score_source', 'scoring_signature', 'created_at', 'fingerprint',
+    'source_file', 'source_sheet', 'provenance'
+]
+NUMERIC_COLUMNS = [
+    'age', 'height', 'weight', 'bmi', 'experience_years', 'info_score', 'experience_score', 'source_row',
+    'name_generated', 'email_generated'
+]
+OUTPUT_COLUMNS = [
+    'external_id', 'name', 'email', 'name_generated', 'email_generated', 'phone', 'age', 'height', 'weight', 'bmi',
+    'education', 'location', 'skills', 'experience_years', 'previous_roles', 'certifications', 'info_score',
+    'experience_score', 'overall_level', 'reasoning', 'score_source', 'scoring_signature', 'created_at', 'fingerprint',
+    'source_file', 'source_sheet', 'source_row', 'provenance'
+]
+
+
+def output_table(applicants: List[Dict]) -> pd.DataFrame:
+    """Flatten scored applicant dicts into the fixed output schema"""
+    table = pd.DataFrame({
+        'external_id': [a['external_id'] for a in applicants],
+        'name': [a['name'] for a in applicants],
+        'email': [a['email'] for a in applicants],
+        # 1 when the sheet had no such column and the value is a numbered placeholder
+        'name_generated': [a.get('name_generated') for a in applicants],
+        'email_generated': [a.get('email_generated') for a in applicants],
+        'phone': [a['phone'] for a in applicants],
+        'age': [a['age'] for a in applicants],
+        'height': [a['height'] for a in applicants],
+        'weight': [a['weight'] for a in applicants],
+        'bmi': [a['bmi'] for a in applicants],
+        'education': [a['basic_info'].get('education') for a in applicants],
+        'location': [a['basic_info'].get('location') for a in applicants],
+        'skills': [a['basic_info'].get('skills') for a in applicants],
+        'experience_years': [a['experience'].get('years') for a in applicants],
+        'previous_roles': [a['experience'].get('previous_roles') for a in applicants],
+        'certifications': [a['experience'].get('certifications') for a in applicants],
+        'info_score': [a['info_score'] for a in applicants],
+        'experience_score': [a['experience_score'] for a in applicants],
+        'overall_level': [a['overall_level'] for a in applicants],
+        'reasoning': [a['reasoning'] for a in applicants],
+        'score_source': [a['score_source'] for a in applicants],
+        'scoring_signature': [a.get('scoring_signature') for a in applicants],
+        'created_at': [a['created_at'] for a in applicants],
+        'fingerprint': [a['fingerprint'] for a in applicants],
+        'source_file': [a.get('source_file') for a in applicants],
+        'source_sheet': [a.get('source_sheet') for a in applicants],
+        'source_row': [a.get('source_row') for a in applicants],
+        # Every (file, sheet, row) a deduplicated applicant was found at, as JSON
+        'provenance': [json.dumps(a['provenance']) if a.get('provenance') else None for a in applicants],
+    }, columns=OUTPUT_COLUMNS)
+
+    for column in NUMERIC_COLUMNS:
+        table[column] = pd.to_numeric(table[column], errors='coerce').astype('float64')
+    for column in TEXT_COLUMNS:
+        table[column] = table[column].where(table[column].notna(), None).map(
+            lambda value: value if value is None else str(value)
+        )
+    return table
+
+
+class ResultWriter:
+    """Appends scored chunks to a .parquet, .csv or .jsonl file"""
+
+    def __init__(self, path: str):
+        self.path = path
+        self.format = os.path.splitext(path)[1].lower().lstrip('.')
+        if self.format not in ('parquet', 'csv', 'jsonl'):
+            raise ValueError(f"Unsupported output format: {path} (use .parquet, .csv or .jsonl)")
+        self.rows = 0
+        self._parquet_writer = None
+        self._file = None
+
+    def write(self, applicants: List[Dict]):
+        table = output_table(applicants)
+
+        if self.format == 'parquet':
+            import pyarrow as pa
+            import pyarrow.parquet as pq
+
+            schema = pa.schema(
+                [(column, pa.float64() if column in NUMERIC_COLUMNS else pa.string()) for column in OUTPUT_COLUMNS]
+            )
+            if self._parquet_writer is None:
+                self._parquet_writer = pq.ParquetWriter(self.path, schema)
+            self._parquet_writer.write_table(pa.Table.from_pandas(table, schema=schema, preserve_index=False))
+        elif self.format == 'csv':
+            if self._file is None:
+                self._file = open(self.path, 'w', encoding='utf-8', newline='')
+            table.to_csv(self._file, index=False, header=self.rows == 0)
+        else:
+            if self._file is None:
+                self._file = open(self.path, 'w', encoding='utf-8')
+            table.to_json(self._file, orient='records', lines=True, force_ascii=False)
+
+        self.rows += len(table)
+
+    def close(self):
+        if self._parquet_writer is not None:
+            self._parquet_writer.close()
+        if self._file is not None:
+            self._file.close()
+
+
+def load_previous(path: str) -> List[Dict]:
+    """Previous output file as minimal applicant dicts for incremental re-analysis"""
+    if path.endswith('.parquet'):
+        table = pd.read_parquet(path)
+    elif path.endswith('.csv'):
+        table = pd.read_csv(path, dtype={'fingerprint': str})
+    else:
+        table = pd.read_json(path, lines=True, dtype={'fingerprint': str})
+    return table.astype(object).where(table.notna(), None).to_dict('records')
+
+
+def open_source(analyzer: ApplicantAnalyzer, source: str, max_bytes: Optional[int]):
+    if source.startswith(('http://', 'https://')):
+        return analyzer.download_excel_from_sharepoint(source, max_bytes=max_bytes)
+    return open(source, 'rb')
+
+
+def is_multi_source(args) -> bool:
+    return (
+        args.all_sheets or len(args.inputs) > 1
+        or any(os.path.isdir(item) or item.lower().endswith('.zip') for item in args.inputs)
+    )
+
+
+def chunked(applicants: List[Dict], chunk_size: int):
+    for start in range(0, len(applicants), chunk_size):
+        yield applicants[start:start + chunk_size]
+
+
+def score_command(args) -> int:
+    api_key = args.api_key or os.environ.get('OPENAI_API_KEY')
+    if args.backend in ('openai', 'cascade') and not api_key:
+        logger.error("No OpenAI API key: set OPENAI_API_KEY or pass --api-key")
+        return 2
+
+    score_cache = None if args.no_cache else ScoreCache(args.cache)
+    scheduler = RequestScheduler(requests_per_minute=args.rpm, tokens_per_minute=args.tpm)
+
+    backend = None
+    if args.backend == 'local':
+        backend = create_backend('local')
+    elif args.backend == 'cascade':
+        backend = create_backend(
+            'cascade',
+            remote=OpenAIBackend(
+                api_key, model=args.model, scheduler=scheduler, score_cache=score_cache, base_url=args.base_url,
+                prompt_mode=args.prompt_mode, max_concurrency=args.workers
+            ),
+            escalate_below=args.escalate_below
+        )
+    elif args.backend == 'mock':
+        backend = create_backend('mock', latency=args.mock_latency)
+
+    analyzer = ApplicantAnalyzer(
+        api_key,
+        max_concurrency=args.workers,
+        score_cache=score_cache,
+        model=args.model,
+        batch_size=args.batch_size,
+        scheduler=scheduler,
+        fetcher=ConditionalFetcher(),
+        backend=backend,
+        base_url=args.base_url,
+        prompt_mode=args.prompt_mode
+    )
+    previous = load_previous(args.previous) if args.previous else None
+    run = ScoringRun(analyzer, previous)
+    writer = ResultWriter(args.out)
+    started = time.monotonic()
+
+    max_bytes = args.max_mb * 1024 * 1024 if args.max_mb else None
+    ingest = None
+
+    with contextlib.ExitStack() as stack:
+        stack.callback(writer.close)
+        if is_multi_source(args):
+            sources = discover_sources(args.inputs, max_bytes=max_bytes)
+            applicants, ingest = load_applicant_sources(
+                sources,
+                processes=args.processes,
+                progress=lambda done, total: logger.info("Parsed %d/%d workbooks", done, total)
+            )
+            chunks = run.scored_chunks(chunked(applicants, args.chunk_size))
+        else:
+            source = stack.enter_context(open_source(analyzer, args.inputs[0], max_bytes))
+            chunks = run.scored_chunks(analyzer.iter_excel_chunks(source, args.chunk_size))
+
+        for applicants in chunks:
+            with METRICS.timer('stage_seconds', stage='write'):
+                writer.write(applicants)
+            elapsed = time.monotonic() - started
+            logger.info("%d rows scored (%.1f rows/s)", writer.rows, writer.rows / elapsed if elapsed else 0)
+
+    if score_cache is not None:
+        score_cache.flush()
+    summary = run.summary()
+    if ingest is not None:
+        summary['ingest'] = ingest
+    summary['seconds'] = round(time.monotonic() - started, 2)
+    summary['output'] = args.out
+    print(json.dumps(summary))
+    if args.metrics:
+        METRICS.write(args.metrics)
+
+    # Non-zero exit lets cron/CI notice runs where the API fell back to default scores
+    return 1 if args.fail_on_fallback and summary['sources'].get('fallback') else 0
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(
+        prog='blue-agent', description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter
+    )
+    parser.add_argument('-v', '--verbose', action='store_true', help='log progress per chunk')
+    commands = parser.add_subparsers(dest='command', required=True)
+
+    score = commands.add_parser('score', help='score a workbook and write the results')
+    score.add_argument('inputs', nargs='+', help='.xlsx/.xls paths, folders, .zip files or SharePoint/OneDrive URLs')
+    score.add_argument('--out', required=True, help='output file (.parquet, .csv or .jsonl)')
+    score.add_argument('--workers', type=int, default=8, help='applicants scored concurrently')
+    score.add_argument('--batch-size', type=int, default=1, help='applicants per API request')
+    score.add_argument('--all-sheets', action='store_true', help='read every sheet, not just the first')
+    score.add_argument('--processes', type=int, help='parser processes in multi-source mode (default: CPU count)')
+    score.add_argument('--chunk-size', type=int, default=1000, help='rows parsed, scored and written per step')
+    score.add_argument('--backend', choices=list(BACKENDS), default='openai', help='scoring backend')
+    score.add_argument('--escalate-below', type=float, default=0.5,
+                       help='cascade: send rows whose local confidence (0-1) is below this to OpenAI')
+    score.add_argument('--mock-latency', type=float, default=0.0, help='seconds per applicant for --backend mock')
+    score.add_argument('--model', default='gpt-4o')
+    score.add_argument('--prompt-mode', choices=['full', 'compact'], default='full',
+                       help='compact: shared system message and a minimal per-applicant payload (fewer tokens)')
+    score.add_argument('--api-key', help='defaults to $OPENAI_API_KEY')
+    score.add_argument('--base-url', default=os.environ.get('OPENAI_BASE_URL'),
+                       help='OpenAI-compatible API base URL (defaults to $OPENAI_BASE_URL)')
+    score.add_argument('--rpm', type=int, default=500, help='requests per minute budget')
+    score.add_argument('--tpm', type=int, default=30000, help='tokens per minute budget')
+    score.add_argument('--cache', default='.score_cache.sqlite3', help='score cache database')
+    score.add_argument('--no-cache', action='store_true', help='do not read or write the score cache')
+    score.add_argument('--previous', help='earlier output file; only new or changed rows are scored')
+    score.add_argument('--max-mb', type=int, default=500, help='download size limit for URLs')
+    score.add_argument('--metrics', help='write stage timings and counters here (.json, otherwise Prometheus text)')
+    score.add_argument('--fail-on-fallback', action='store_true',
+                       help='exit 1 if any row got default scores because the API failed')
+    score.set_defaults(handler=score_command)
+
+    args = parser.parse_args(argv)
+    logging.basicConfig(
+        level=logging.INFO if args.verbose else logging.WARNING,
+        format='%(asctime)s %(levelname)s %(name)s: %(message)s'
+    )
+    return args.handler(args)
+
+
+if __name__ == '__main__':
+    sys.exit(main())
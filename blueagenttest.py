@@ -4,12 +4,14 @@
 
 import streamlit as st
 import pandas as pd
-import numpy as np
-from datetime import datetime
 import urllib.parse
-import requests
-import io
-import re
+from applicant_normalize import derive_applicant_levels, frame_digest
+from keyword_matcher import load_matcher
+from http_fetch import ConditionalFetcher
+from pagination import render_pagination, render_view_mode
+from exports import render_export_buttons
+from metrics import METRICS
+from diagnostics import render_diagnostics
 
 # Configure page
 st.set_page_config(
@@ -252,43 +254,6 @@ st.markdown("""
 """, unsafe_allow_html=True)
 
 # Helper functions
-def calculate_bmi(weight, height_cm):
-    """Calculate BMI from weight (kg) and height (cm)"""
-    height_m = height_cm / 100
-    return weight / (height_m ** 2)
-
-def analyze_experience(experience_text, years_experience):
-    """Simple rule-based experience analysis"""
-    if not experience_text:
-        return "Low"
-    
-    # Convert to lowercase for analysis
-    exp_lower = experience_text.lower()
-    
-    # Keywords for high-level experience
-    high_keywords = ['senior', 'lead', 'manager', 'director', 'principal', 'architect', 'expert']
-    mid_keywords = ['developer', 'engineer', 'analyst', 'specialist', 'coordinator']
-    
-    # Check years of experience
-    if years_experience >= 5:
-        if any(keyword in exp_lower for keyword in high_keywords):
-            return "High"
-        elif any(keyword in exp_lower for keyword in mid_keywords):
-            return "Mid"
-        else:
-            return "Mid"
-    elif years_experience >= 2:
-        return "Mid"
-    else:
-        return "Low"
-
-def determine_final_level(bmi, experience_level):
-    """Determine final applicant level based on BMI and experience"""
-    if bmi > 25:
-        return "Low"
-    
-    return experience_level
-
 def create_mailto_link(email, name, position):
     """Create a mailto link for Outlook"""
     subject = f"Interview Opportunity - {position}"
@@ -313,8 +278,16 @@ def create_teams_link(name, position):
     teams_url = f"https://teams.microsoft.com/l/meeting/new?subject={urllib.parse.quote(f'Interview with {name} - {position}')}"
     return teams_url
 
-def read_excel_from_url(url):
-    """Read Excel file from OneDrive/SharePoint URL"""
+@st.cache_resource
+def get_http_fetcher():
+    """Shared keep-alive session with a conditional-request blob cache"""
+    return ConditionalFetcher()
+
+# Largest workbook read_excel_from_url will download
+MAX_DOWNLOAD_MB = 500
+
+def read_excel_from_url(url, max_bytes=MAX_DOWNLOAD_MB * 1024 * 1024):
+    """Read Excel file from OneDrive/SharePoint URL, refusing downloads over max_bytes"""
     try:
         # Convert sharing link to direct download link
         if "sharepoint.com" in url or "onedrive.live.com" in url:
@@ -322,18 +295,44 @@ def read_excel_from_url(url):
             if "?download=1" not in url:
                 url = url.replace("?", "?download=1&")
         
-        # Read the Excel file
-        response = requests.get(url)
-        response.raise_for_status()
+        progress_bar = st.progress(0.0, text="Downloading workbook...")
+        
+        def progress(downloaded, total):
+            # Without a Content-Length the bar fills towards the size limit
+            expected = total or max_bytes
+            fraction = downloaded / expected if expected else 0.0
+            progress_bar.progress(min(fraction, 1.0), text=f"Downloaded {downloaded / 1e6:.1f} MB")
         
-        # Read Excel from bytes
-        excel_data = pd.read_excel(io.BytesIO(response.content))
+        # Stream the Excel file to disk (a 304 revalidation when it has not changed)
+        with METRICS.timer('stage_seconds', stage='download'):
+            excel_file = get_http_fetcher().fetch_to_file(url, max_bytes=max_bytes, progress=progress)
+        progress_bar.empty()
+        with excel_file, METRICS.timer('stage_seconds', stage='read_excel'):
+            excel_data = pd.read_excel(excel_file)
         return excel_data
     
     except Exception as e:
         st.error(f"Error reading Excel file: {str(e)}")
         return None
 
+# Bump when the BMI / final-level rules in derive_applicant_levels change
+SCORING_RULES_VERSION = "1"
+
+def scoring_version():
+    """Version of everything that decides the derived levels (code rules + keyword taxonomy)"""
+    matcher = load_matcher()
+    return f"{SCORING_RULES_VERSION}:{matcher.version}:{matcher.digest}"
+
+@st.cache_data(show_spinner=False, max_entries=16)
+def analyze_applicants(_data, data_hash, rules_version):
+    """Pure analysis stage: BMI, Experience_Level and Final_Level for a frame
+    
+    Cached on the frame's content hash and the scoring-rule version; the frame itself
+    is not hashed by Streamlit (leading underscore), since data_hash already identifies it.
+    """
+    with METRICS.timer('stage_seconds', stage='analyze'):
+        return derive_applicant_levels(_data, load_matcher())
+
 # Main app
 def main():
     # Header
@@ -384,18 +383,16 @@ def main():
                     })
                     
                     st.session_state.applicant_data = sample_data
+                    st.session_state.applicant_data_hash = frame_digest(sample_data)
                     st.success("✅ Data fetched and analyzed successfully!")
             else:
                 st.warning("Please enter an Excel URL first.")
     
     # Display results if data is available
     if 'applicant_data' in st.session_state:
-        data = st.session_state.applicant_data
-        
-        # Calculate BMI and levels for each applicant
-        data['BMI'] = data.apply(lambda row: calculate_bmi(row['Weight_kg'], row['Height_cm']), axis=1)
-        data['Experience_Level'] = data.apply(lambda row: analyze_experience(row['Experience_Description'], row['Years_Experience']), axis=1)
-        data['Final_Level'] = data.apply(lambda row: determine_final_level(row['BMI'], row['Experience_Level']), axis=1)
+        # BMI and levels are recomputed only when the data or the scoring rules change
+        data_hash = st.session_state.get('applicant_data_hash') or frame_digest(st.session_state.applicant_data)
+        data = analyze_applicants(st.session_state.applicant_data, data_hash, scoring_version())
         
         # Statistics
         st.markdown("""
@@ -448,32 +445,48 @@ def main():
         </div>
         """, unsafe_allow_html=True)
         
-        for index, applicant in data.iterrows():
-            level_class = f"level-{applicant['Final_Level'].lower()}"
-            
-            # Create action buttons
-            mailto_link = create_mailto_link(applicant['Email'], applicant['Name'], applicant['Position'])
-            teams_link = create_teams_link(applicant['Name'], applicant['Position'])
+        view_mode = render_view_mode(len(data), key="applicant_view")
+        
+        if view_mode == "Grid":
+            st.dataframe(
+                data[['Name', 'Email', 'Position', 'Years_Experience', 'BMI', 'Experience_Level', 'Final_Level']],
+                use_container_width=True,
+                hide_index=True,
+                height=600
+            )
+        else:
+            # Render only the visible page, as a single HTML block
+            start, end = render_pagination(len(data), key="applicants", default_page_size=10)
+            cards = []
             
-            st.markdown(f"""
-            <div class="applicant-card">
-                <div class="applicant-header">
-                    <h4 class="applicant-name">{applicant['Name']}</h4>
-                    <span class="{level_class}">{applicant['Final_Level']} Level</span>
-                </div>
-                <div class="applicant-details">
-                    <strong>Position:</strong> {applicant['Position']}<br>
-                    <strong>Email:</strong> {applicant['Email']}<br>
-                    <strong>Experience:</strong> {applicant['Years_Experience']} years<br>
-                    <strong>BMI:</strong> {applicant['BMI']:.1f}<br>
-                    <strong>Description:</strong> {applicant['Experience_Description']}
+            for index, applicant in data.iloc[start:end].iterrows():
+                level_class = f"level-{applicant['Final_Level'].lower()}"
+                
+                # Create action buttons
+                mailto_link = create_mailto_link(applicant['Email'], applicant['Name'], applicant['Position'])
+                teams_link = create_teams_link(applicant['Name'], applicant['Position'])
+                
+                cards.append(f"""
+                <div class="applicant-card">
+                    <div class="applicant-header">
+                        <h4 class="applicant-name">{applicant['Name']}</h4>
+                        <span class="{level_class}">{applicant['Final_Level']} Level</span>
+                    </div>
+                    <div class="applicant-details">
+                        <strong>Position:</strong> {applicant['Position']}<br>
+                        <strong>Email:</strong> {applicant['Email']}<br>
+                        <strong>Experience:</strong> {applicant['Years_Experience']} years<br>
+                        <strong>BMI:</strong> {applicant['BMI']:.1f}<br>
+                        <strong>Description:</strong> {applicant['Experience_Description']}
+                    </div>
+                    <div class="action-buttons">
+                        <a href="{mailto_link}" class="action-btn email-btn" target="_blank">📧 Send Email</a>
+                        <a href="{teams_link}" class="action-btn teams-btn" target="_blank">🎥 Schedule Teams Meeting</a>
+                    </div>
                 </div>
-                <div class="action-buttons">
-                    <a href="{mailto_link}" class="action-btn email-btn" target="_blank">📧 Send Email</a>
-                    <a href="{teams_link}" class="action-btn teams-btn" target="_blank">🎥 Schedule Teams Meeting</a>
-                </div>
-            </div>
-            """, unsafe_allow_html=True)
+                """)
+            
+            st.markdown("".join(cards), unsafe_allow_html=True)
         
         # Export options
         st.markdown("""
@@ -482,32 +495,19 @@ def main():
         </div>
         """, unsafe_allow_html=True)
         
-        col1, col2 = st.columns(2)
-        
-        with col1:
-            csv_data = data.to_csv(index=False)
-            st.download_button(
-                label="📊 Download CSV Report",
-                data=csv_data,
-                file_name=f"applicant_analysis_{datetime.now().strftime('%Y%m%d_%H%M%S')}.csv",
-                mime="text/csv"
-            )
-        
-        with col2:
-            # Create Excel export
-            excel_buffer = io.BytesIO()
-            with pd.ExcelWriter(excel_buffer, engine='openpyxl') as writer:
-                data.to_excel(writer, sheet_name='Applicant Analysis', index=False)
-            
-            st.download_button(
-                label="📈 Download Excel Report",
-                data=excel_buffer.getvalue(),
-                file_name=f"applicant_analysis_{datetime.now().strftime('%Y%m%d_%H%M%S')}.xlsx",
-                mime="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet"
-            )
+        # Files are built on request and cached per dataset + scoring version
+        render_export_buttons(
+            lambda: data,
+            dataset_version=f"{data_hash}:{scoring_version()}",
+            key="report_export",
+            sheet_name='Applicant Analysis'
+        )
 
 if __name__ == "__main__":
-    main()
+    # Whole script run; download, read_excel and analyze are also timed on their own
+    with METRICS.timer('stage_seconds', stage='page_run'):
+        main()
+    render_diagnostics()
 
 
 # ===============================================
@@ -623,7 +623,8 @@ Your Excel file should contain these columns:
 Edit `.streamlit/config.toml` to customize colors and appearance.
 
 ### AI Analysis Logic
-Modify the `analyze_experience()` and `determine_final_level()` functions in `app.py` to adjust scoring criteria.
+Edit the keyword weights in `keyword_taxonomy.json`, or the level rules in `experience_levels()` and
+`derive_applicant_levels()` in `applicant_normalize.py`, to adjust scoring criteria.
 
 ## 🚨 Important Notes
 
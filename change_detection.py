@@ -0,0 +1,83 @@
+from collections import Counter
+from typing import Dict, List, Optional, Tuple
+
+# Fields produced by scoring that can be carried over to an unchanged row
+SCORE_FIELDS = (
+    'info_score', 'experience_score', 'overall_level', 'reasoning', 'score_source', 'scoring_signature', 'created_at'
+)
+
+
+def row_identity(applicant: Dict) -> str:
+    """Identity of an applicant across runs: email, or name when the email is missing
+
+    Placeholder names and emails (the sheet had no such column) are treated as
+    missing, so a row with neither a real email nor a real name is just 'name:'.
+    """
+    email = '' if applicant.get('email_generated') else str(applicant.get('email', '')).strip().lower()
+    if email and email != 'nan':
+        return email
+    name = '' if applicant.get('name_generated') else str(applicant.get('name', '')).strip().lower()
+    return 'name:' + (name if name != 'nan' else '')
+
+
+def is_reusable(previous: Dict, applicant: Dict, signature: Optional[str] = None) -> bool:
+    """Whether a stored result still holds for the row: same content, a real score, same scorer
+
+    Fallback scores (the API failed) are never reused, and with a signature the result
+    must come from the same backend settings (see ScoringBackend.signature).
+    """
+    return (
+        previous.get('fingerprint') == applicant.get('fingerprint')
+        and 'overall_level' in previous
+        and previous.get('score_source') != 'fallback'
+        and (signature is None or previous.get('scoring_signature') == signature)
+    )
+
+
+class ChangeTracker:
+    """Matches a new run's rows against the previous run's scored results"""
+
+    def __init__(self, previous: Optional[List[Dict]] = None, signature: Optional[str] = None):
+        self.signature = signature
+        self.previous = {}
+        occurrences = Counter()
+        for applicant in previous or []:
+            identity = row_identity(applicant)
+            occurrences[identity] += 1
+            self.previous[f'{identity}#{occurrences[identity]}'] = applicant
+
+        self._occurrences = Counter()
+        self._seen = set()
+        self.counts = {'added': 0, 'changed': 0, 'unchanged': 0}
+
+    def split(self, applicants: List[Dict]) -> Tuple[List[Tuple[int, Dict]], List[int]]:
+        """Return (index, carried-over result) for unchanged rows and indices of rows needing scoring"""
+        unchanged = []
+        to_score = []
+
+        for index, applicant in enumerate(applicants):
+            # Duplicate identities are told apart by their order of appearance
+            identity = row_identity(applicant)
+            self._occurrences[identity] += 1
+            row_key = f'{identity}#{self._occurrences[identity]}'
+            applicant['row_key'] = row_key
+            self._seen.add(row_key)
+
+            previous = self.previous.get(row_key)
+            if previous is None:
+                self.counts['added'] += 1
+                to_score.append(index)
+            elif not is_reusable(previous, applicant, self.signature):
+                self.counts['changed'] += 1
+                to_score.append(index)
+            else:
+                self.counts['unchanged'] += 1
+                unchanged.append((index, {**applicant, **{
+                    field: previous[field] for field in SCORE_FIELDS if field in previous
+                }}))
+
+        return unchanged, to_score
+
+    def summary(self) -> Dict[str, int]:
+        """Added/changed/unchanged/removed counts once every chunk has been split"""
+        return {**self.counts, 'removed': len(set(self.previous) - self._seen)}
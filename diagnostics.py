@@ -0,0 +1,63 @@
+import pandas as pd
+import streamlit as st
+
+from metrics import METRICS, MetricsRegistry
+
+
+def stage_table(snapshot: dict) -> pd.DataFrame:
+    """One row per timed histogram: count, total seconds and p50/p95/max in milliseconds"""
+    rows = []
+    for histogram in snapshot['histograms']:
+        labels = ', '.join(f'{key}={value}' for key, value in histogram['labels'].items())
+        rows.append({
+            'Metric': f"{histogram['name']} ({labels})" if labels else histogram['name'],
+            'Count': histogram['count'],
+            'Total s': round(histogram['sum'], 2),
+            'p50 ms': None if histogram['p50'] is None else round(histogram['p50'] * 1000, 1),
+            'p95 ms': None if histogram['p95'] is None else round(histogram['p95'] * 1000, 1),
+            'Max ms': round(histogram['max'] * 1000, 1)
+        })
+    return pd.DataFrame(rows, columns=['Metric', 'Count', 'Total s', 'p50 ms', 'p95 ms', 'Max ms'])
+
+
+def counter_total(snapshot: dict, name: str) -> float:
+    return sum(counter['value'] for counter in snapshot['counters'] if counter['name'] == name)
+
+
+def render_diagnostics(registry: MetricsRegistry = METRICS, key: str = "diagnostics"):
+    """Sidebar panel with per-stage timings, throughput counters and metric exports"""
+    with st.sidebar.expander("🩺 Diagnostics"):
+        snapshot = registry.snapshot()
+        rows_per_second = next(
+            (gauge['value'] for gauge in snapshot['gauges'] if gauge['name'] == 'last_run_rows_per_second'), None
+        )
+
+        col1, col2 = st.columns(2)
+        col1.metric("Rows scored", f"{counter_total(snapshot, 'rows_scored_total'):,.0f}")
+        col2.metric("Rows/s (last run)", "-" if rows_per_second is None else f"{rows_per_second:,.1f}")
+        col1.metric("OpenAI calls", f"{counter_total(snapshot, 'openai_requests_total'):,.0f}")
+        col2.metric("MB fetched", f"{counter_total(snapshot, 'bytes_fetched_total') / 1e6:,.1f}")
+
+        table = stage_table(snapshot)
+        if table.empty:
+            st.caption("No timings recorded yet")
+        else:
+            st.dataframe(table, use_container_width=True, hide_index=True)
+
+        st.download_button(
+            "⬇️ Prometheus",
+            registry.to_prometheus(),
+            file_name="blue_agent_metrics.prom",
+            mime="text/plain",
+            key=f"{key}_prometheus"
+        )
+        st.download_button(
+            "⬇️ JSON",
+            registry.to_json(),
+            file_name="blue_agent_metrics.json",
+            mime="application/json",
+            key=f"{key}_json"
+        )
+        if st.button("Reset metrics", key=f"{key}_reset"):
+            registry.reset()
+            st.rerun()
@@ -0,0 +1,78 @@
+import io
+from datetime import datetime
+from typing import Callable, Dict, Tuple
+
+import pandas as pd
+import streamlit as st
+
+# Display name -> (file extension, MIME type)
+EXPORT_FORMATS: Dict[str, Tuple[str, str]] = {
+    'CSV': ('csv', 'text/csv'),
+    'Excel': ('xlsx', 'application/vnd.openxmlformats-officedocument.spreadsheetml.sheet'),
+}
+
+# Parquet needs pyarrow (or fastparquet); the format is only offered when one is installed
+try:
+    import pyarrow  # noqa: F401
+    EXPORT_FORMATS['Parquet'] = ('parquet', 'application/vnd.apache.parquet')
+except ImportError:
+    try:
+        import fastparquet  # noqa: F401
+        EXPORT_FORMATS['Parquet'] = ('parquet', 'application/vnd.apache.parquet')
+    except ImportError:
+        pass
+
+
+def export_bytes(data: pd.DataFrame, fmt: str, sheet_name: str = 'Applicants') -> bytes:
+    """Serialize a frame in one of EXPORT_FORMATS"""
+    if fmt == 'CSV':
+        return data.to_csv(index=False).encode('utf-8')
+
+    buffer = io.BytesIO()
+    if fmt == 'Excel':
+        with pd.ExcelWriter(buffer, engine='openpyxl') as writer:
+            data.to_excel(writer, sheet_name=sheet_name, index=False)
+    elif fmt == 'Parquet':
+        # Mixed-type object columns (e.g. numbers stored as text) are written as strings
+        objects = data.select_dtypes(include='object').columns
+        data.astype({column: str for column in objects}).to_parquet(buffer, index=False)
+    else:
+        raise ValueError(f"Unknown export format: {fmt}")
+    return buffer.getvalue()
+
+
+@st.cache_data(show_spinner=False, max_entries=8)
+def cached_export(_load_data: Callable[[], pd.DataFrame], dataset_version: str, fmt: str,
+                  sheet_name: str = 'Applicants') -> bytes:
+    """Export artifact per (dataset version, format); the data is only loaded on a cache miss"""
+    return export_bytes(_load_data(), fmt, sheet_name)
+
+
+def render_export_buttons(load_data: Callable[[], pd.DataFrame], dataset_version: str, key: str,
+                          file_prefix: str = 'applicant_analysis', sheet_name: str = 'Applicants'):
+    """Format picker with on-demand generation; artifacts are built once per dataset version"""
+    col1, col2 = st.columns([1, 2])
+
+    with col1:
+        fmt = st.selectbox("รูปแบบไฟล์:", list(EXPORT_FORMATS), key=f"{key}_format")
+
+    extension, mime = EXPORT_FORMATS[fmt]
+    prepared_key = f"{key}_prepared"
+    prepared = st.session_state.setdefault(prepared_key, set())
+
+    with col2:
+        # Reruns after the first export reuse the cached bytes instead of rebuilding the file
+        if (dataset_version, fmt) not in prepared:
+            if not st.button(f"⚙️ Prepare {fmt} export", key=f"{key}_prepare"):
+                return
+            with st.spinner(f"Building {fmt} export..."):
+                cached_export(load_data, dataset_version, fmt, sheet_name)
+            prepared.add((dataset_version, fmt))
+
+        st.download_button(
+            label=f"📥 Download {fmt}",
+            data=cached_export(load_data, dataset_version, fmt, sheet_name),
+            file_name=f"{file_prefix}_{datetime.now().strftime('%Y%m%d_%H%M%S')}.{extension}",
+            mime=mime,
+            key=f"{key}_download"
+        )
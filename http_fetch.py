@@ -0,0 +1,214 @@
+import hashlib
+import json
+import os
+import tempfile
+import threading
+import time
+from typing import BinaryIO, Callable, Dict, Optional, Tuple
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+from metrics import METRICS
+
+DEFAULT_HEADERS = {
+    'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36'
+}
+
+# (connect, read) timeouts in seconds
+DEFAULT_TIMEOUT = (10, 120)
+
+DOWNLOAD_CHUNK_SIZE = 1024 * 1024
+
+# Bodies without cache validators are spooled in memory up to this size, then to disk
+SPOOL_MAX_MEMORY = 16 * 1024 * 1024
+
+
+class DownloadTooLarge(ValueError):
+    """Raised when a download exceeds the configured size limit"""
+
+
+def create_session(pool_size: int = 10) -> requests.Session:
+    """Keep-alive session with a connection pool and retries for transient connection errors"""
+    session = requests.Session()
+    session.headers.update(DEFAULT_HEADERS)
+
+    retry = Retry(
+        total=3,
+        backoff_factor=0.5,
+        status_forcelist=(502, 503, 504),
+        allowed_methods=frozenset(['GET', 'HEAD'])
+    )
+    adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size, max_retries=retry)
+    session.mount('https://', adapter)
+    session.mount('http://', adapter)
+    return session
+
+
+class ConditionalFetcher:
+    """Downloads files with If-None-Match/If-Modified-Since, backed by a local blob cache
+
+    Blobs unused for max_age_seconds are dropped, and once the cache holds more than
+    max_cache_bytes the least recently used blobs are evicted. A blob's mtime is its
+    last use: it is refreshed on every 304 served from the cache.
+    """
+
+    # Eviction trims the cache to this fraction of max_cache_bytes
+    EVICT_TO = 0.9
+
+    def __init__(self, cache_dir: str = '.download_cache', session: Optional[requests.Session] = None,
+                 timeout: Tuple[float, float] = DEFAULT_TIMEOUT, max_cache_bytes: int = 2 * 1024 ** 3,
+                 max_age_seconds: float = 30 * 24 * 3600):
+        self.cache_dir = cache_dir
+        self.session = session or create_session()
+        self.timeout = timeout
+        self.max_cache_bytes = max_cache_bytes
+        self.max_age_seconds = max_age_seconds
+        self._lock = threading.Lock()
+        self.stats = {'downloaded': 0, 'not_modified': 0, 'bytes_downloaded': 0, 'evicted': 0}
+        os.makedirs(cache_dir, exist_ok=True)
+        self.evict()
+
+    def _paths(self, url: str) -> Tuple[str, str]:
+        digest = hashlib.sha256(url.encode('utf-8')).hexdigest()
+        base = os.path.join(self.cache_dir, digest)
+        return base + '.blob', base + '.json'
+
+    def _load_metadata(self, url: str) -> Optional[Dict]:
+        blob_path, meta_path = self._paths(url)
+        if not (os.path.exists(blob_path) and os.path.exists(meta_path)):
+            return None
+        try:
+            with open(meta_path, encoding='utf-8') as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return None
+
+    def _count(self, key: str, amount: int = 1):
+        with self._lock:
+            self.stats[key] += amount
+
+    def evict(self, keep: Optional[str] = None) -> int:
+        """Drop expired blobs, then least recently used ones down to EVICT_TO of max_cache_bytes
+
+        `keep` is a blob path that must survive (the one about to be returned).
+        Returns the number of blobs removed.
+        """
+        blobs = []
+        for entry in os.scandir(self.cache_dir):
+            if entry.name.endswith('.blob'):
+                try:
+                    info = entry.stat()
+                except OSError:
+                    continue
+                blobs.append((info.st_mtime, info.st_size, entry.path))
+        blobs.sort()
+
+        now = time.time()
+        total = sum(size for _, size, _ in blobs)
+        target = int(self.max_cache_bytes * self.EVICT_TO) if self.max_cache_bytes else None
+        over_limit = bool(self.max_cache_bytes) and total > self.max_cache_bytes
+        removed = 0
+        for modified, size, path in blobs:
+            expired = self.max_age_seconds and now - modified > self.max_age_seconds
+            if not (expired or (over_limit and total > target)) or path == keep:
+                continue
+            try:
+                os.remove(path)
+            except OSError:
+                # Still open elsewhere (Windows) or already removed by another process
+                continue
+            try:
+                os.remove(path[:-len('.blob')] + '.json')
+            except OSError:
+                pass
+            total -= size
+            removed += 1
+
+        if removed:
+            self._count('evicted', removed)
+            METRICS.inc('download_cache_evictions_total', removed)
+        return removed
+
+    def fetch(self, url: str, headers: Optional[Dict] = None) -> bytes:
+        """Return the file at `url` as bytes (prefer fetch_to_file for large workbooks)"""
+        with self.fetch_to_file(url, headers) as f:
+            return f.read()
+
+    def fetch_to_file(self, url: str, headers: Optional[Dict] = None, max_bytes: Optional[int] = None,
+                      progress: Optional[Callable[[int, Optional[int]], None]] = None) -> BinaryIO:
+        """Stream the file at `url` to disk in chunks and return it opened for reading
+
+        An unchanged file costs a single 304 round trip and is served from the blob cache.
+        `progress` is called with (bytes_downloaded, total_bytes or None) after each chunk.
+        """
+        blob_path, meta_path = self._paths(url)
+        request_headers = dict(headers or {})
+
+        metadata = self._load_metadata(url)
+        if metadata:
+            if metadata.get('etag'):
+                request_headers['If-None-Match'] = metadata['etag']
+            if metadata.get('last_modified'):
+                request_headers['If-Modified-Since'] = metadata['last_modified']
+
+        with self.session.get(url, headers=request_headers, timeout=self.timeout, stream=True) as response:
+            if response.status_code == 304 and metadata:
+                self._count('not_modified')
+                METRICS.inc('downloads_total', status='not_modified')
+                blob = open(blob_path, 'rb')
+                os.utime(blob_path)
+                return blob
+
+            response.raise_for_status()
+
+            total = response.headers.get('Content-Length')
+            total = int(total) if total and total.isdigit() else None
+            if max_bytes and total and total > max_bytes:
+                raise DownloadTooLarge(f"File is {total / 1e6:.1f} MB, limit is {max_bytes / 1e6:.1f} MB")
+
+            # Only responses the server can validate later go to the blob cache
+            etag = response.headers.get('ETag')
+            last_modified = response.headers.get('Last-Modified')
+            cacheable = bool(etag or last_modified)
+
+            suffix = f'.{os.getpid()}.{threading.get_ident()}.tmp'
+            if cacheable:
+                target = open(blob_path + suffix, 'wb+')
+            else:
+                target = tempfile.SpooledTemporaryFile(max_size=SPOOL_MAX_MEMORY)
+
+            try:
+                downloaded = 0
+                for chunk in response.iter_content(chunk_size=DOWNLOAD_CHUNK_SIZE):
+                    downloaded += len(chunk)
+                    if max_bytes and downloaded > max_bytes:
+                        raise DownloadTooLarge(f"Download exceeded the {max_bytes / 1e6:.1f} MB limit")
+                    target.write(chunk)
+                    if progress:
+                        progress(downloaded, total)
+            except BaseException:
+                target.close()
+                if cacheable:
+                    os.remove(blob_path + suffix)
+                raise
+
+        self._count('downloaded')
+        self._count('bytes_downloaded', downloaded)
+        METRICS.inc('downloads_total', status='downloaded')
+        METRICS.inc('bytes_fetched_total', downloaded)
+
+        if not cacheable:
+            target.seek(0)
+            return target
+
+        # Write-then-rename so concurrent sessions never read a half-written blob
+        target.close()
+        with open(meta_path + suffix, 'w', encoding='utf-8') as f:
+            json.dump({'url': url, 'etag': etag, 'last_modified': last_modified}, f)
+        os.replace(blob_path + suffix, blob_path)
+        os.replace(meta_path + suffix, meta_path)
+        blob = open(blob_path, 'rb')
+        self.evict(keep=blob_path)
+        return blob
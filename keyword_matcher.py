@@ -0,0 +1,111 @@
+import hashlib
+import json
+import os
+import re
+from functools import lru_cache
+from typing import Dict, Iterable, Optional
+
+import numpy as np
+import pandas as pd
+
+DEFAULT_TAXONOMY_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'keyword_taxonomy.json')
+
+
+def build_trie_pattern(keywords: Iterable[str]) -> str:
+    """Compile keywords into a trie-shaped regex so matching cost does not grow with the keyword count"""
+    trie = {}
+    for keyword in keywords:
+        node = trie
+        for char in keyword:
+            node = node.setdefault(char, {})
+        node[''] = {}  # end-of-keyword marker
+
+    def to_pattern(node: Dict) -> str:
+        terminal = '' in node
+        branches = [re.escape(char) + to_pattern(child) for char, child in sorted(node.items()) if char]
+        if not branches:
+            return ''
+        if len(branches) == 1 and not terminal:
+            return branches[0]
+        group = '(?:' + '|'.join(branches) + ')'
+        # Optional continuation keeps matches greedy, so the longest keyword wins
+        return group + '?' if terminal else group
+
+    return to_pattern(trie)
+
+
+class KeywordMatcher:
+    """Weighted keyword taxonomy compiled into one regex per level"""
+
+    def __init__(self, levels: Dict[str, Dict[str, float]], high_threshold: float = 1.0,
+                 version: str = 'default', whole_words: bool = False):
+        self.version = version
+        self.high_threshold = high_threshold
+        self.whole_words = whole_words
+        self.weights = {
+            level: {keyword.lower(): float(weight) for keyword, weight in keywords.items()}
+            for level, keywords in levels.items()
+        }
+        self.patterns = {}
+        for level, keywords in self.weights.items():
+            if not keywords:
+                continue
+            pattern = build_trie_pattern(keywords)
+            if whole_words:
+                pattern = rf'\b(?:{pattern})\b'
+            self.patterns[level] = re.compile(pattern)
+
+        # Changes whenever the keyword rules change, even if the taxonomy version is not bumped
+        rules = json.dumps([self.weights, high_threshold, whole_words], sort_keys=True)
+        self.digest = hashlib.sha256(rules.encode('utf-8')).hexdigest()[:16]
+
+    @classmethod
+    def from_file(cls, path: str = DEFAULT_TAXONOMY_PATH) -> 'KeywordMatcher':
+        """Load a taxonomy JSON file ({"version", "high_threshold", "whole_words", "levels"})"""
+        with open(path, encoding='utf-8') as f:
+            taxonomy = json.load(f)
+
+        return cls(
+            levels=taxonomy['levels'],
+            high_threshold=taxonomy.get('high_threshold', 1.0),
+            version=str(taxonomy.get('version', 'default')),
+            whole_words=taxonomy.get('whole_words', False)
+        )
+
+    def score(self, text: Optional[str]) -> Dict[str, float]:
+        """Weighted keyword score per level for a single description"""
+        lowered = str(text).lower() if text else ''
+        return {
+            level: sum(self.weights[level][match] for match in set(pattern.findall(lowered)))
+            for level, pattern in self.patterns.items()
+        }
+
+    def level_scores(self, texts: pd.Series) -> pd.DataFrame:
+        """Weighted keyword score per level for a whole column (distinct keywords per row)"""
+        lowered = texts.fillna('').astype(str).str.lower().reset_index(drop=True)
+        scores = pd.DataFrame(index=lowered.index)
+
+        for level, pattern in self.patterns.items():
+            matches = lowered.str.findall(pattern).explode().dropna()
+            if matches.empty:
+                scores[level] = 0.0
+                continue
+
+            matches = matches.rename('keyword').reset_index().drop_duplicates()
+            weights = matches['keyword'].map(self.weights[level])
+            scores[level] = weights.groupby(matches['index']).sum().reindex(lowered.index, fill_value=0.0)
+
+        scores.index = texts.index
+        return scores
+
+    def has_high_keyword(self, texts: pd.Series) -> pd.Series:
+        """Whether each description reaches the High keyword threshold"""
+        if 'High' not in self.patterns:
+            return pd.Series(np.zeros(len(texts), dtype=bool), index=texts.index)
+        return self.level_scores(texts)['High'] >= self.high_threshold
+
+
+@lru_cache(maxsize=None)
+def load_matcher(path: str = DEFAULT_TAXONOMY_PATH) -> KeywordMatcher:
+    """Compiled matcher for a taxonomy file, built once per process"""
+    return KeywordMatcher.from_file(path)
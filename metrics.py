@@ -0,0 +1,208 @@
+import json
+import os
+import threading
+import time
+from bisect import bisect_left
+from collections import deque
+from contextlib import contextmanager
+from typing import Dict, Iterator, List, Optional, Tuple
+
+# Upper bounds (seconds) of the latency histogram buckets, Prometheus style
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0)
+
+# Recent observations kept per histogram for p50/p95
+QUANTILE_WINDOW = 2048
+
+METRIC_PREFIX = 'blue_agent_'
+
+LabelKey = Tuple[str, Tuple[Tuple[str, str], ...]]
+
+
+def _key(name: str, labels: Dict) -> LabelKey:
+    return name, tuple(sorted((key, str(value)) for key, value in labels.items()))
+
+
+def _quantile(samples: List[float], q: float) -> Optional[float]:
+    if not samples:
+        return None
+    ordered = sorted(samples)
+    return ordered[min(len(ordered) - 1, int(q * len(ordered)))]
+
+
+class Histogram:
+    """Cumulative bucket counts plus a window of recent samples for percentiles"""
+
+    def __init__(self, buckets: Tuple[float, ...] = LATENCY_BUCKETS):
+        self.buckets = buckets
+        self.bucket_counts = [0] * (len(buckets) + 1)
+        self.count = 0
+        self.sum = 0.0
+        self.max = 0.0
+        self.recent = deque(maxlen=QUANTILE_WINDOW)
+
+    def observe(self, value: float):
+        self.bucket_counts[bisect_left(self.buckets, value)] += 1
+        self.count += 1
+        self.sum += value
+        self.max = max(self.max, value)
+        self.recent.append(value)
+
+    def summary(self) -> Dict:
+        samples = list(self.recent)
+        return {
+            'count': self.count,
+            'sum': self.sum,
+            'max': self.max,
+            'p50': _quantile(samples, 0.5),
+            'p95': _quantile(samples, 0.95)
+        }
+
+
+class MetricsRegistry:
+    """Thread-safe counters, gauges and latency histograms for the scoring pipeline
+
+    Stages are timed with `with METRICS.timer('stage_seconds', stage='parse'):`.
+    snapshot() feeds the diagnostics panel and JSON export; to_prometheus() renders
+    the text exposition format for a scraper or node_exporter's textfile collector.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.started_at = time.time()
+        self.counters: Dict[LabelKey, float] = {}
+        self.gauges: Dict[LabelKey, float] = {}
+        self.histograms: Dict[LabelKey, Histogram] = {}
+
+    def inc(self, name: str, amount: float = 1, **labels):
+        key = _key(name, labels)
+        with self._lock:
+            self.counters[key] = self.counters.get(key, 0) + amount
+
+    def set_gauge(self, name: str, value: float, **labels):
+        with self._lock:
+            self.gauges[_key(name, labels)] = value
+
+    def observe(self, name: str, value: float, **labels):
+        key = _key(name, labels)
+        with self._lock:
+            histogram = self.histograms.get(key)
+            if histogram is None:
+                histogram = self.histograms[key] = Histogram()
+            histogram.observe(value)
+
+    @contextmanager
+    def timer(self, name: str, **labels) -> Iterator[None]:
+        """Observe the wall time of the block in seconds, including when it raises"""
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(name, time.perf_counter() - started, **labels)
+
+    def timed_iter(self, iterable, name: str, **labels) -> Iterator:
+        """Yield from iterable, observing the time spent producing each item"""
+        iterator = iter(iterable)
+        while True:
+            started = time.perf_counter()
+            try:
+                item = next(iterator)
+            except StopIteration:
+                return
+            self.observe(name, time.perf_counter() - started, **labels)
+            yield item
+
+    def counter_value(self, name: str, **labels) -> float:
+        with self._lock:
+            return self.counters.get(_key(name, labels), 0)
+
+    def histogram_summary(self, name: str, **labels) -> Optional[Dict]:
+        """count/sum/max/p50/p95 of one histogram, or None if nothing was observed"""
+        with self._lock:
+            histogram = self.histograms.get(_key(name, labels))
+            return histogram.summary() if histogram is not None else None
+
+    def reset(self):
+        with self._lock:
+            self.started_at = time.time()
+            self.counters.clear()
+            self.gauges.clear()
+            self.histograms.clear()
+
+    def snapshot(self) -> Dict:
+        """Plain-data copy of every metric (the JSON export format)"""
+        with self._lock:
+            return {
+                'started_at': self.started_at,
+                'counters': [
+                    {'name': name, 'labels': dict(labels), 'value': value}
+                    for (name, labels), value in sorted(self.counters.items())
+                ],
+                'gauges': [
+                    {'name': name, 'labels': dict(labels), 'value': value}
+                    for (name, labels), value in sorted(self.gauges.items())
+                ],
+                'histograms': [
+                    {'name': name, 'labels': dict(labels), **histogram.summary()}
+                    for (name, labels), histogram in sorted(self.histograms.items())
+                ]
+            }
+
+    def to_json(self) -> str:
+        return json.dumps(self.snapshot(), indent=2)
+
+    def to_prometheus(self) -> str:
+        """Prometheus text exposition format (version 0.0.4)"""
+        with self._lock:
+            counters = sorted(self.counters.items())
+            gauges = sorted(self.gauges.items())
+            histograms = [
+                (key, histogram.buckets, list(histogram.bucket_counts), histogram.count, histogram.sum)
+                for key, histogram in sorted(self.histograms.items())
+            ]
+
+        lines = []
+        typed = set()
+
+        def declare(name: str, kind: str):
+            if name not in typed:
+                typed.add(name)
+                lines.append(f'# TYPE {name} {kind}')
+
+        for (name, labels), value in counters:
+            declare(METRIC_PREFIX + name, 'counter')
+            lines.append(f'{METRIC_PREFIX}{name}{_format_labels(labels)} {value}')
+        for (name, labels), value in gauges:
+            declare(METRIC_PREFIX + name, 'gauge')
+            lines.append(f'{METRIC_PREFIX}{name}{_format_labels(labels)} {value}')
+        for (name, labels), buckets, bucket_counts, count, total in histograms:
+            metric = METRIC_PREFIX + name
+            declare(metric, 'histogram')
+            cumulative = 0
+            for bound, bucket_count in zip(buckets + (float('inf'),), bucket_counts):
+                cumulative += bucket_count
+                le = '+Inf' if bound == float('inf') else repr(bound)
+                lines.append(f'{metric}_bucket{_format_labels(labels + (("le", le),))} {cumulative}')
+            lines.append(f'{metric}_sum{_format_labels(labels)} {total}')
+            lines.append(f'{metric}_count{_format_labels(labels)} {count}')
+        return '\n'.join(lines) + '\n'
+
+    def write(self, path: str):
+        """Write the JSON (.json) or Prometheus text (anything else, e.g. .prom) export"""
+        content = self.to_json() if path.endswith('.json') else self.to_prometheus()
+        # Write-then-rename so a scraper never reads a half-written file
+        with open(path + '.tmp', 'w', encoding='utf-8') as f:
+            f.write(content)
+        os.replace(path + '.tmp', path)
+
+
+def _format_labels(labels: Tuple[Tuple[str, str], ...]) -> str:
+    if not labels:
+        return ''
+    escaped = (
+        (key, value.replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')) for key, value in labels
+    )
+    return '{' + ','.join(f'{key}="{value}"' for key, value in escaped) + '}'
+
+
+# Process-wide registry shared by the analyzer, backends, fetcher, jobs and UI
+METRICS = MetricsRegistry()
@@ -0,0 +1,234 @@
+"""Local stand-in for the OpenAI chat completions endpoint, for load tests without network or cost
+
+    python mock_openai_server.py --port 8001 --latency-ms 400 --jitter-ms 150 --error-rate 0.01 --rate-limit-rate 0.02
+    python blue_agent_cli.py score big.xlsx --out out.parquet --base-url http://127.0.0.1:8001/v1 --api-key test
+
+POST /v1/chat/completions answers in the OpenAI response shape:
+- Single-score prompts get a number derived from a hash of the prompt, so reruns are repeatable.
+- Batched JSON prompts get {"results": [...]} with one entry per applicant id.
+
+Latency follows --latency-dist (fixed, uniform or lognormal) around --latency-ms.
+--error-rate answers 500 and --rate-limit-rate answers 429 with a Retry-After header.
+--rpm adds a real per-minute budget that also answers 429 once exceeded.
+GET /stats returns request counters as JSON.
+"""
+import argparse
+import hashlib
+import json
+import random
+import re
+import threading
+import time
+from collections import deque
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict, Optional, Tuple
+
+COMPLETION_PATHS = ('/v1/chat/completions', '/chat/completions')
+
+# Applicant lines of the batched scoring prompt: {"id": "3", "applicant": {...}}
+BATCH_ID_PATTERN = re.compile(r'\{"id": "([^"]+)", "applicant"')
+
+
+class MockSettings:
+    def __init__(self, latency_ms: float = 300.0, jitter_ms: float = 100.0, latency_dist: str = 'uniform',
+                 error_rate: float = 0.0, rate_limit_rate: float = 0.0, retry_after: float = 1.0,
+                 rpm: Optional[int] = None, seed: Optional[int] = None):
+        self.latency_ms = latency_ms
+        self.jitter_ms = jitter_ms
+        self.latency_dist = latency_dist
+        self.error_rate = error_rate
+        self.rate_limit_rate = rate_limit_rate
+        self.retry_after = retry_after
+        self.rpm = rpm
+        self.random = random.Random(seed)
+
+    def latency(self) -> float:
+        """Seconds to wait before answering one request"""
+        if self.latency_dist == 'fixed':
+            milliseconds = self.latency_ms
+        elif self.latency_dist == 'lognormal':
+            # Median latency_ms with a long tail; jitter_ms sets the spread
+            sigma = self.jitter_ms / self.latency_ms if self.latency_ms else 0
+            milliseconds = self.random.lognormvariate(0, sigma) * self.latency_ms
+        else:
+            milliseconds = self.random.uniform(self.latency_ms - self.jitter_ms, self.latency_ms + self.jitter_ms)
+        return max(0.0, milliseconds) / 1000
+
+
+def prompt_score(prompt: str, salt: str = '') -> int:
+    """Deterministic 30-100 score for a prompt"""
+    return 30 + hashlib.sha256((salt + prompt).encode('utf-8')).digest()[0] % 71
+
+
+def completion_content(body: Dict) -> str:
+    prompt = '\n'.join(str(message.get('content', '')) for message in body.get('messages', []))
+    if (body.get('response_format') or {}).get('type') == 'json_object':
+        return json.dumps({'results': [
+            {'id': row_id, 'info_score': prompt_score(prompt, f'info:{row_id}'),
+             'experience_score': prompt_score(prompt, f'experience:{row_id}')}
+            for row_id in BATCH_ID_PATTERN.findall(prompt)
+        ]})
+    return str(prompt_score(prompt))
+
+
+def completion_response(body: Dict, content: str) -> Dict:
+    prompt_tokens = sum(len(str(message.get('content', ''))) for message in body.get('messages', [])) // 4
+    completion_tokens = max(1, len(content) // 4)
+    return {
+        'id': f'chatcmpl-mock-{time.monotonic_ns()}',
+        'object': 'chat.completion',
+        'created': int(time.time()),
+        'model': body.get('model', 'mock'),
+        'choices': [{
+            'index': 0,
+            'message': {'role': 'assistant', 'content': content},
+            'finish_reason': 'stop'
+        }],
+        'usage': {
+            'prompt_tokens': prompt_tokens,
+            'completion_tokens': completion_tokens,
+            'total_tokens': prompt_tokens + completion_tokens
+        }
+    }
+
+
+class MockOpenAIServer(ThreadingHTTPServer):
+    daemon_threads = True
+
+    def __init__(self, address: Tuple[str, int], settings: MockSettings):
+        super().__init__(address, MockHandler)
+        self.settings = settings
+        self.lock = threading.Lock()
+        self.recent_requests = deque()
+        self.stats = {'requests': 0, 'ok': 0, 'errors': 0, 'rate_limited': 0}
+
+    def count(self, key: str):
+        with self.lock:
+            self.stats[key] += 1
+
+    def draw(self) -> Tuple[str, float]:
+        """Outcome ('ok', 'error' or 'rate_limited') and latency for the next request"""
+        with self.lock:
+            self.stats['requests'] += 1
+            now = time.monotonic()
+            if self.settings.rpm:
+                while self.recent_requests and now - self.recent_requests[0] > 60:
+                    self.recent_requests.popleft()
+                if len(self.recent_requests) >= self.settings.rpm:
+                    return 'rate_limited', 0.0
+                self.recent_requests.append(now)
+
+            roll = self.settings.random.random()
+            latency = self.settings.latency()
+            if roll < self.settings.rate_limit_rate:
+                return 'rate_limited', 0.0
+            if roll < self.settings.rate_limit_rate + self.settings.error_rate:
+                return 'error', latency
+            return 'ok', latency
+
+    @property
+    def base_url(self) -> str:
+        host, port = self.server_address[:2]
+        return f'http://{host}:{port}/v1'
+
+
+class MockHandler(BaseHTTPRequestHandler):
+    server: MockOpenAIServer
+    protocol_version = 'HTTP/1.1'
+    # Headers and body are separate writes; without TCP_NODELAY keep-alive clients stall ~40ms each
+    disable_nagle_algorithm = True
+
+    def log_message(self, format, *args):
+        pass
+
+    def send_json(self, status: int, payload: Dict, headers: Optional[Dict] = None):
+        data = json.dumps(payload).encode('utf-8')
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(data)))
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.end_headers()
+        self.wfile.write(data)
+
+    def do_GET(self):
+        if self.path.rstrip('/') == '/stats':
+            with self.server.lock:
+                stats = dict(self.server.stats)
+            self.send_json(200, stats)
+        else:
+            self.send_json(404, {'error': {'message': 'Not found', 'type': 'invalid_request_error'}})
+
+    def do_POST(self):
+        length = int(self.headers.get('Content-Length') or 0)
+        raw = self.rfile.read(length)
+        if self.path.split('?')[0] not in COMPLETION_PATHS:
+            self.send_json(404, {'error': {'message': 'Not found', 'type': 'invalid_request_error'}})
+            return
+
+        try:
+            body = json.loads(raw or b'{}')
+        except ValueError:
+            self.send_json(400, {'error': {'message': 'Invalid JSON body', 'type': 'invalid_request_error'}})
+            return
+
+        outcome, latency = self.server.draw()
+        if outcome == 'rate_limited':
+            self.server.count('rate_limited')
+            retry_after = self.server.settings.retry_after
+            self.send_json(
+                429,
+                {'error': {'message': 'Rate limit reached (mock)', 'type': 'rate_limit_error'}},
+                headers={'Retry-After': f'{retry_after:g}', 'retry-after-ms': str(int(retry_after * 1000))}
+            )
+            return
+
+        time.sleep(latency)
+        if outcome == 'error':
+            self.server.count('errors')
+            self.send_json(500, {'error': {'message': 'Internal error (mock)', 'type': 'server_error'}})
+            return
+
+        self.server.count('ok')
+        self.send_json(200, completion_response(body, completion_content(body)))
+
+
+def start_mock_server(settings: Optional[MockSettings] = None, host: str = '127.0.0.1',
+                      port: int = 0) -> MockOpenAIServer:
+    """Serve in a background thread (port 0 picks a free port); stop with server.shutdown()"""
+    server = MockOpenAIServer((host, port), settings or MockSettings())
+    threading.Thread(target=server.serve_forever, name='mock-openai', daemon=True).start()
+    return server
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=8001)
+    parser.add_argument('--latency-ms', type=float, default=300.0, help='typical response time')
+    parser.add_argument('--jitter-ms', type=float, default=100.0, help='spread around --latency-ms')
+    parser.add_argument('--latency-dist', choices=['fixed', 'uniform', 'lognormal'], default='uniform')
+    parser.add_argument('--error-rate', type=float, default=0.0, help='fraction of requests answered with 500')
+    parser.add_argument('--rate-limit-rate', type=float, default=0.0, help='fraction answered with 429')
+    parser.add_argument('--retry-after', type=float, default=1.0, help='Retry-After seconds sent with 429s')
+    parser.add_argument('--rpm', type=int, help='requests per minute before every request gets 429')
+    parser.add_argument('--seed', type=int, help='seed for latency and error draws')
+    args = parser.parse_args()
+
+    settings = MockSettings(
+        latency_ms=args.latency_ms, jitter_ms=args.jitter_ms, latency_dist=args.latency_dist,
+        error_rate=args.error_rate, rate_limit_rate=args.rate_limit_rate, retry_after=args.retry_after,
+        rpm=args.rpm, seed=args.seed
+    )
+    server = MockOpenAIServer((args.host, args.port), settings)
+    print(f"Mock OpenAI API on {server.base_url}")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+
+
+if __name__ == '__main__':
+    main()
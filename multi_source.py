@@ -0,0 +1,155 @@
+import io
+import multiprocessing
+import os
+import zipfile
+from concurrent.futures import ProcessPoolExecutor
+from typing import Callable, Dict, Iterable, List, Optional, Tuple
+
+from change_detection import row_identity
+from http_fetch import ConditionalFetcher
+from metrics import METRICS
+from workbook_reader import build_applicants, iter_workbook_sheets
+
+WORKBOOK_EXTENSIONS = ('.xlsx', '.xlsm', '.xls')
+
+# Spreadsheet row of the first data row (row 1 is the header)
+FIRST_DATA_ROW = 2
+
+# Rows per build_applicants call while parsing a sheet
+PARSE_CHUNK_SIZE = 5000
+
+
+def is_workbook(name: str) -> bool:
+    base = os.path.basename(name)
+    # Skip Office lock files (~$book.xlsx) and hidden files
+    return name.lower().endswith(WORKBOOK_EXTENSIONS) and not base.startswith(('~$', '.'))
+
+
+def discover_sources(inputs: Iterable[str], max_bytes: Optional[int] = None) -> List[Dict]:
+    """Expand folders, zip archives, workbook paths and URLs into one source per workbook"""
+    sources = []
+    for item in inputs:
+        if item.startswith(('http://', 'https://')):
+            sources.append({'kind': 'url', 'path': item, 'label': item, 'max_bytes': max_bytes})
+        elif os.path.isdir(item):
+            for root, dirs, files in os.walk(item):
+                dirs.sort()
+                for name in sorted(files):
+                    path = os.path.join(root, name)
+                    if is_workbook(name):
+                        sources.append({'kind': 'file', 'path': path, 'label': os.path.relpath(path, item)})
+                    elif name.lower().endswith('.zip'):
+                        sources.extend(zip_sources(path, os.path.relpath(path, item)))
+        elif item.lower().endswith('.zip'):
+            sources.extend(zip_sources(item, os.path.basename(item)))
+        else:
+            sources.append({'kind': 'file', 'path': item, 'label': os.path.basename(item)})
+    return sources
+
+
+def zip_sources(path: str, label: str) -> List[Dict]:
+    with zipfile.ZipFile(path) as archive:
+        members = sorted(name for name in archive.namelist() if is_workbook(name))
+    return [
+        {'kind': 'zip', 'path': path, 'member': member, 'label': f'{label}/{member}'}
+        for member in members
+    ]
+
+
+def open_source(source: Dict):
+    if source['kind'] == 'url':
+        fetcher = ConditionalFetcher()
+        return fetcher.fetch_to_file(source['path'], max_bytes=source.get('max_bytes'))
+    if source['kind'] == 'zip':
+        # openpyxl needs a seekable file; members are read into memory one at a time
+        with zipfile.ZipFile(source['path']) as archive:
+            return io.BytesIO(archive.read(source['member']))
+    return open(source['path'], 'rb')
+
+
+def parse_source(source: Dict) -> List[Dict]:
+    """Parse every sheet of one workbook into applicants tagged with (file, sheet, row)
+
+    Runs in a worker process, so it only touches picklable inputs and outputs.
+    Completely blank rows are dropped here since they cannot identify an applicant.
+    """
+    applicants = []
+    with open_source(source) as f:
+        for sheet_name, rows in iter_workbook_sheets(f):
+            buffered = []
+            for row_number, row in enumerate(rows, start=FIRST_DATA_ROW):
+                if all(value != value for value in row.values()):  # every cell NaN
+                    continue
+                buffered.append((row_number, row))
+                if len(buffered) >= PARSE_CHUNK_SIZE:
+                    applicants.extend(tag_provenance(buffered, source['label'], sheet_name))
+                    buffered = []
+            if buffered:
+                applicants.extend(tag_provenance(buffered, source['label'], sheet_name))
+    return applicants
+
+
+def tag_provenance(rows: List[Tuple[int, Dict]], label: str, sheet_name: str) -> List[Dict]:
+    built = build_applicants([row for _, row in rows])
+    for (row_number, _), applicant in zip(rows, built):
+        applicant['source_file'] = label
+        applicant['source_sheet'] = sheet_name
+        applicant['source_row'] = row_number
+    return built
+
+
+def merge_applicants(parsed: Iterable[List[Dict]]) -> Tuple[List[Dict], Dict]:
+    """Merge per-workbook applicants, keeping the first occurrence of each applicant
+
+    Duplicates are matched on email (or name without an email); placeholder emails
+    and names of sheets without those columns never match. The kept row lists
+    every place the applicant was seen under 'provenance'; external ids are
+    renumbered so they stay unique across files.
+    """
+    merged = []
+    by_identity = {}
+    rows = 0
+
+    for applicants in parsed:
+        for applicant in applicants:
+            rows += 1
+            location = {
+                'file': applicant['source_file'],
+                'sheet': applicant['source_sheet'],
+                'row': applicant['source_row']
+            }
+            identity = row_identity(applicant)
+            # Rows with neither email nor name cannot be matched, so they are never merged
+            if identity != 'name:' and identity in by_identity:
+                by_identity[identity]['provenance'].append(location)
+                continue
+
+            applicant['provenance'] = [location]
+            applicant['external_id'] = f'EXT_{len(merged) + 1}'
+            merged.append(applicant)
+            if identity != 'name:':
+                by_identity[identity] = applicant
+
+    return merged, {'rows': rows, 'applicants': len(merged), 'duplicates': rows - len(merged)}
+
+
+def load_applicant_sources(sources: List[Dict], processes: Optional[int] = None,
+                           progress: Optional[Callable[[int, int], None]] = None) -> Tuple[List[Dict], Dict]:
+    """Parse workbooks across a process pool and merge them into one deduplicated list"""
+    if not sources:
+        return [], {'files': 0, 'sheets': 0, 'rows': 0, 'applicants': 0, 'duplicates': 0}
+
+    processes = max(1, min(processes or os.cpu_count() or 1, len(sources)))
+    parsed = []
+    # spawn: workers must not inherit the threads (and locks) of a running app
+    with METRICS.timer('stage_seconds', stage='ingest'), \
+            ProcessPoolExecutor(max_workers=processes, mp_context=multiprocessing.get_context('spawn')) as executor:
+        for done, applicants in enumerate(executor.map(parse_source, sources), start=1):
+            parsed.append(applicants)
+            if progress:
+                progress(done, len(sources))
+
+    merged, stats = merge_applicants(parsed)
+    stats['files'] = len(sources)
+    stats['sheets'] = len({(a['source_file'], a['source_sheet']) for applicants in parsed for a in applicants})
+    return merged, stats
@@ -0,0 +1,51 @@
+import math
+from typing import Tuple
+
+import streamlit as st
+
+PAGE_SIZE_OPTIONS = [10, 25, 50, 100]
+
+# Above this many rows the results default to the compact grid instead of cards
+GRID_MODE_THRESHOLD = 200
+
+
+def render_view_mode(total: int, key: str) -> str:
+    """Cards vs compact grid toggle; large result sets default to the grid"""
+    return st.radio(
+        "มุมมอง:",
+        ["Cards", "Grid"],
+        index=1 if total > GRID_MODE_THRESHOLD else 0,
+        horizontal=True,
+        key=key
+    )
+
+
+def render_pagination(total: int, key: str, default_page_size: int = 25) -> Tuple[int, int]:
+    """Page size and page number controls; returns the (start, end) slice of the visible page"""
+    col1, col2, col3 = st.columns([1, 1, 2])
+
+    with col1:
+        page_size = st.selectbox(
+            "ต่อหน้า:",
+            PAGE_SIZE_OPTIONS,
+            index=PAGE_SIZE_OPTIONS.index(default_page_size),
+            key=f"{key}_page_size"
+        )
+
+    page_count = max(1, math.ceil(total / page_size))
+
+    # Keep the page in range when filters shrink the result set
+    page_key = f"{key}_page"
+    if st.session_state.get(page_key, 1) > page_count:
+        st.session_state[page_key] = page_count
+
+    with col2:
+        page = st.number_input("หน้า:", min_value=1, max_value=page_count, step=1, key=page_key)
+
+    start = (page - 1) * page_size
+    end = min(start + page_size, total)
+
+    with col3:
+        st.caption(f"แสดง {start + 1 if total else 0}-{end} จาก {total} · หน้า {page}/{page_count}")
+
+    return start, end
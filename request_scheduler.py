@@ -0,0 +1,178 @@
+import random
+import threading
+import time
+from email.utils import parsedate_to_datetime
+from typing import Callable, Dict, Optional, TypeVar
+
+T = TypeVar('T')
+
+# HTTP statuses worth retrying: timeouts, conflicts, rate limits and server errors
+RETRYABLE_STATUS_CODES = {408, 409, 429, 500, 502, 503, 504}
+
+# Exception class names used by the legacy and current OpenAI clients for transient failures
+RETRYABLE_ERROR_NAMES = {
+    'RateLimitError', 'Timeout', 'APITimeoutError', 'APIConnectionError',
+    'ServiceUnavailableError', 'TryAgain', 'InternalServerError'
+}
+
+
+class TokenBucket:
+    """Thread-safe token bucket refilled continuously at a per-minute rate"""
+
+    def __init__(self, per_minute: float, capacity: Optional[float] = None):
+        self.rate = per_minute / 60.0
+        self.capacity = capacity if capacity is not None else per_minute
+        self.tokens = self.capacity
+        self.updated_at = time.monotonic()
+        self._lock = threading.Lock()
+
+    def _refill(self):
+        now = time.monotonic()
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated_at) * self.rate)
+        self.updated_at = now
+
+    def acquire(self, amount: float = 1) -> float:
+        """Block until `amount` tokens are available; returns seconds waited"""
+        amount = min(amount, self.capacity)
+        waited = 0.0
+
+        while True:
+            with self._lock:
+                self._refill()
+                if self.tokens >= amount:
+                    self.tokens -= amount
+                    return waited
+                delay = (amount - self.tokens) / self.rate
+
+            time.sleep(delay)
+            waited += delay
+
+
+def get_status_code(error: Exception) -> Optional[int]:
+    """HTTP status of an API error, for both legacy (http_status) and current (status_code) clients"""
+    for attribute in ('status_code', 'http_status'):
+        status = getattr(error, attribute, None)
+        if isinstance(status, int):
+            return status
+    return None
+
+
+def get_retry_after(error: Exception) -> Optional[float]:
+    """Seconds requested by a Retry-After (or retry-after-ms) header on an API error"""
+    headers = getattr(error, 'headers', None)
+    if headers is None and getattr(error, 'response', None) is not None:
+        headers = getattr(error.response, 'headers', None)
+    if not headers:
+        return None
+
+    try:
+        retry_after_ms = headers.get('retry-after-ms') or headers.get('Retry-After-Ms')
+        if retry_after_ms:
+            return float(retry_after_ms) / 1000
+
+        retry_after = headers.get('retry-after') or headers.get('Retry-After')
+        if not retry_after:
+            return None
+        try:
+            return float(retry_after)
+        except ValueError:
+            # HTTP-date form
+            return max(0.0, parsedate_to_datetime(retry_after).timestamp() - time.time())
+    except Exception:
+        return None
+
+
+def is_retryable(error: Exception) -> bool:
+    """Whether an error is transient and the request should be retried"""
+    if isinstance(error, (TimeoutError, ConnectionError)):
+        return True
+    if type(error).__name__ in RETRYABLE_ERROR_NAMES:
+        return True
+    return get_status_code(error) in RETRYABLE_STATUS_CODES
+
+
+class RequestScheduler:
+    """Enforces requests/tokens-per-minute budgets and retries transient API failures"""
+
+    def __init__(self, requests_per_minute: float = 500, tokens_per_minute: float = 30000,
+                 max_retries: int = 6, base_delay: float = 1.0, max_delay: float = 60.0,
+                 request_timeout: float = 30.0):
+        self.request_bucket = TokenBucket(requests_per_minute)
+        self.token_bucket = TokenBucket(tokens_per_minute)
+        self.max_retries = max_retries
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self.request_timeout = request_timeout
+
+        self._lock = threading.Lock()
+        self._paused_until = 0.0
+        self.stats = {
+            'requests': 0,
+            'retries': 0,
+            'rate_limited': 0,
+            'failures': 0,
+            'throttle_seconds': 0.0
+        }
+
+    def _count(self, key: str, amount: float = 1):
+        with self._lock:
+            self.stats[key] += amount
+
+    def _wait_for_pause(self):
+        # A Retry-After from any request pauses every worker, not just the one that hit it
+        while True:
+            with self._lock:
+                remaining = self._paused_until - time.monotonic()
+            if remaining <= 0:
+                return
+            time.sleep(remaining)
+
+    def backoff_delay(self, attempt: int, retry_after: Optional[float] = None) -> float:
+        """Full-jitter exponential backoff, never shorter than the server's Retry-After"""
+        delay = random.uniform(0, min(self.max_delay, self.base_delay * (2 ** attempt)))
+        if retry_after is not None:
+            delay = max(delay, retry_after + random.uniform(0, self.base_delay))
+        return delay
+
+    def run(self, request: Callable[[], T], estimated_tokens: int = 0) -> T:
+        """Run `request` within the rate budgets, retrying transient failures"""
+        attempt = 0
+
+        while True:
+            self._wait_for_pause()
+            waited = self.request_bucket.acquire(1)
+            if estimated_tokens:
+                waited += self.token_bucket.acquire(estimated_tokens)
+            if waited:
+                self._count('throttle_seconds', waited)
+
+            self._count('requests')
+            try:
+                return request()
+            except Exception as e:
+                if not is_retryable(e) or attempt >= self.max_retries:
+                    self._count('failures')
+                    raise
+
+                retry_after = get_retry_after(e)
+                if get_status_code(e) == 429 or type(e).__name__ == 'RateLimitError':
+                    self._count('rate_limited')
+
+                delay = self.backoff_delay(attempt, retry_after)
+                if retry_after is not None:
+                    with self._lock:
+                        self._paused_until = max(self._paused_until, time.monotonic() + delay)
+
+                self._count('retries')
+                attempt += 1
+                time.sleep(delay)
+
+    def get_stats(self) -> Dict:
+        """Snapshot of request, retry and throttling counters"""
+        with self._lock:
+            return dict(self.stats)
+
+
+def estimate_tokens(prompt: str, max_tokens: int = 0) -> int:
+    """Rough token count (~4 characters per token) plus the completion budget"""
+    return len(prompt) // 4 + max_tokens
@@ -0,0 +1,178 @@
+import hashlib
+import os
+import sqlite3
+import threading
+import time
+from typing import Dict, Optional
+
+
+class ScoreCache:
+    """On-disk cache of model responses keyed by a hash of (model, prompt)"""
+
+    # Cache hits whose last_access update is buffered before one batched write
+    TOUCH_BATCH = 256
+    # Eviction trims the table to this fraction of max_entries
+    EVICT_TO = 0.9
+
+    def __init__(self, path: str = '.score_cache.sqlite3', ttl_seconds: float = 7 * 24 * 3600,
+                 max_entries: int = 100000):
+        self.path = path
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max_entries
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+        # key -> access time of hits not yet written to last_access
+        self._touched: Dict[str, float] = {}
+
+        directory = os.path.dirname(os.path.abspath(path))
+        os.makedirs(directory, exist_ok=True)
+
+        # One shared connection guarded by a lock; scoring runs on worker threads
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute('PRAGMA journal_mode=WAL')
+        self._conn.execute('PRAGMA synchronous=NORMAL')
+        self._conn.execute("""
+            CREATE TABLE IF NOT EXISTS scores (
+                key TEXT PRIMARY KEY,
+                model TEXT NOT NULL,
+                value TEXT NOT NULL,
+                created_at REAL NOT NULL,
+                last_access REAL NOT NULL
+            )
+        """)
+        self._conn.execute('CREATE INDEX IF NOT EXISTS idx_scores_last_access ON scores (last_access)')
+        self._conn.commit()
+        # Running row count, so inserts don't need a COUNT(*) to enforce max_entries
+        self._entries = self._conn.execute('SELECT COUNT(*) FROM scores').fetchone()[0]
+        self.purge_expired()
+
+    @staticmethod
+    def make_key(model: str, prompt: str) -> str:
+        """Content address for an exact prompt sent to a given model"""
+        return hashlib.sha256(f"{model}\x00{prompt}".encode('utf-8')).hexdigest()
+
+    def get(self, model: str, prompt: str) -> Optional[str]:
+        """Return the cached response, or None on a miss or expired entry"""
+        key = self.make_key(model, prompt)
+        now = time.time()
+
+        with self._lock:
+            row = self._conn.execute(
+                'SELECT value, created_at FROM scores WHERE key = ?', (key,)
+            ).fetchone()
+
+            if row is None:
+                self.misses += 1
+                return None
+
+            value, created_at = row
+            if self.ttl_seconds and now - created_at > self.ttl_seconds:
+                cursor = self._conn.execute('DELETE FROM scores WHERE key = ?', (key,))
+                self._conn.commit()
+                self._entries -= cursor.rowcount
+                self._touched.pop(key, None)
+                self.misses += 1
+                return None
+
+            # Access times are written in batches; LRU order only needs to be roughly current
+            self._touched[key] = now
+            if len(self._touched) >= self.TOUCH_BATCH:
+                self._flush_touched()
+                self._conn.commit()
+            self.hits += 1
+            return value
+
+    def set(self, model: str, prompt: str, value: str):
+        """Store a response and evict least recently used entries over the size limit"""
+        key = self.make_key(model, prompt)
+        now = time.time()
+
+        with self._lock:
+            cursor = self._conn.execute(
+                'INSERT OR IGNORE INTO scores (key, model, value, created_at, last_access) '
+                'VALUES (?, ?, ?, ?, ?)',
+                (key, model, value, now, now)
+            )
+            if cursor.rowcount:
+                self._entries += 1
+            else:
+                self._conn.execute(
+                    'UPDATE scores SET model = ?, value = ?, created_at = ?, last_access = ? WHERE key = ?',
+                    (model, value, now, now, key)
+                )
+                self._touched.pop(key, None)
+
+            if self.max_entries and self._entries > self.max_entries:
+                self._evict()
+
+            self._conn.commit()
+
+    def _flush_touched(self):
+        """Write the buffered access times of cache hits (caller holds the lock and commits)"""
+        if self._touched:
+            self._conn.executemany(
+                'UPDATE scores SET last_access = ? WHERE key = ?',
+                [(accessed, key) for key, accessed in self._touched.items()]
+            )
+            self._touched.clear()
+
+    def _evict(self):
+        """Drop least recently used entries down to EVICT_TO of max_entries (caller holds the lock)
+
+        Evicting below the limit means the delete runs once per batch of inserts
+        rather than on every insert past the limit.
+        """
+        self._flush_touched()
+        # Resync the running count; other processes may share the file
+        self._entries = self._conn.execute('SELECT COUNT(*) FROM scores').fetchone()[0]
+        target = int(self.max_entries * self.EVICT_TO)
+        if self._entries > self.max_entries:
+            cursor = self._conn.execute(
+                'DELETE FROM scores WHERE key IN '
+                '(SELECT key FROM scores ORDER BY last_access ASC LIMIT ?)',
+                (self._entries - target,)
+            )
+            self._entries -= cursor.rowcount
+
+    def purge_expired(self) -> int:
+        """Delete entries older than the TTL"""
+        if not self.ttl_seconds:
+            return 0
+
+        with self._lock:
+            cursor = self._conn.execute(
+                'DELETE FROM scores WHERE created_at < ?', (time.time() - self.ttl_seconds,)
+            )
+            self._conn.commit()
+            self._entries -= cursor.rowcount
+            return cursor.rowcount
+
+    def clear(self):
+        """Remove every cached entry and reset the counters"""
+        with self._lock:
+            self._conn.execute('DELETE FROM scores')
+            self._conn.commit()
+            self._entries = 0
+            self._touched.clear()
+            self.hits = 0
+            self.misses = 0
+
+    def flush(self):
+        """Persist the buffered access times of recent hits"""
+        with self._lock:
+            self._flush_touched()
+            self._conn.commit()
+
+    def get_stats(self) -> Dict:
+        """Hit/miss counters and current size"""
+        with self._lock:
+            entries = self._entries
+
+        lookups = self.hits + self.misses
+        return {
+            'hits': self.hits,
+            'misses': self.misses,
+            'hit_rate': self.hits / lookups if lookups else 0.0,
+            'entries': entries
+        }
@@ -0,0 +1,712 @@
+import hashlib
+import json
+import logging
+import random
+import re
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, List, Optional, Tuple, Union
+
+import openai
+
+from keyword_matcher import KeywordMatcher, load_matcher
+from metrics import METRICS
+from request_scheduler import RequestScheduler, estimate_tokens
+from score_cache import ScoreCache
+
+logger = logging.getLogger(__name__)
+
+# HTTP/2 needs the optional h2 package; without it the pool reuses HTTP/1.1 keep-alive connections
+try:
+    import h2  # noqa: F401
+    HTTP2_AVAILABLE = True
+except ImportError:
+    HTTP2_AVAILABLE = False
+
+# (info_score, experience_score, used_fallback); backends that mix sources append the row's score_source
+Scores = Tuple
+
+
+class ScoringBackend:
+    """Scores applicants that passed the BMI rule; ApplicantAnalyzer combines the result into a level"""
+
+    name = 'base'
+    # Stored as score_source on every applicant this backend scores
+    score_source = 'model'
+    # Remote backends spend most of their time waiting, so the analyzer scores them concurrently
+    concurrent = False
+
+    def score(self, applicant: Dict) -> Scores:
+        raise NotImplementedError
+
+    def score_many(self, applicants: List[Dict]) -> List[Scores]:
+        """Score several applicants at once; backends with a cheaper bulk path override this"""
+        return [self.score(applicant) for applicant in applicants]
+
+    def get_stats(self) -> Dict:
+        """Cumulative counters for run reports (empty when the backend keeps none)"""
+        return {}
+
+    def signature(self) -> str:
+        """What produces this backend's scores; earlier results are only reused under the same signature"""
+        return self.name
+
+
+def create_openai_client(api_key: str, base_url: Optional[str] = None) -> openai.OpenAI:
+    """OpenAI client with its own keep-alive connection pool
+
+    The client is thread-safe, so one per (key, endpoint) can serve every worker and
+    session in the process. Retries are left to RequestScheduler (max_retries=0) and
+    timeouts are set per request.
+    """
+    return openai.OpenAI(
+        api_key=api_key,
+        base_url=base_url,
+        max_retries=0,
+        http_client=openai.DefaultHttpxClient(http2=HTTP2_AVAILABLE)
+    )
+
+
+class OpenAIBackend(ScoringBackend):
+    """Remote LLM scoring through the OpenAI chat completions API"""
+
+    name = 'openai'
+    score_source = 'model'
+    concurrent = True
+
+    # Scores used when the API is still failing after the scheduler's retries
+    DEFAULT_INFO_SCORE = 70
+    DEFAULT_EXPERIENCE_SCORE = 60
+
+    # 'full' sends the original prompts; 'compact' moves the fixed instructions into a
+    # shared system message and sends only a minimal JSON payload (no name) per applicant
+    PROMPT_MODES = ('full', 'compact')
+
+    COMPACT_INFO_SYSTEM = (
+        "Rate the job applicant's basic information from 0-100, considering age appropriateness for the role, "
+        "educational background, relevant skills and overall profile completeness. "
+        "Respond with only a number between 0-100."
+    )
+    COMPACT_EXPERIENCE_SYSTEM = (
+        "Rate the job applicant's experience from 0-100, considering years of relevant experience, "
+        "quality of previous roles, relevant certifications and career progression. "
+        "Respond with only a number between 0-100."
+    )
+    COMPACT_BATCH_SYSTEM = (
+        "Rate each applicant (one JSON object per line) on two scales of 0-100: info_score for basic information "
+        "(age appropriateness, education, relevant skills, profile completeness) and experience_score for "
+        "experience (years, quality of previous roles, certifications, career progression). Respond with only "
+        '{"results": [{"id": "<id>", "info_score": <number>, "experience_score": <number>}]} '
+        "containing one entry per applicant."
+    )
+
+    def __init__(self, openai_api_key: str, model: str = "gpt-4o", scheduler: Optional[RequestScheduler] = None,
+                 score_cache: Optional[ScoreCache] = None, base_url: Optional[str] = None,
+                 client: Optional[openai.OpenAI] = None, prompt_mode: str = 'full', max_concurrency: int = 8):
+        if prompt_mode not in self.PROMPT_MODES:
+            raise ValueError(f"Unknown prompt mode: {prompt_mode} (choose from {', '.join(self.PROMPT_MODES)})")
+        self.model = model
+        self.scheduler = scheduler or RequestScheduler()
+        self.score_cache = score_cache
+        # base_url: another OpenAI-compatible endpoint, e.g. mock_openai_server.py for load tests
+        self.client = client or create_openai_client(openai_api_key, base_url)
+        self.prompt_mode = prompt_mode
+        # One pool for the backend's lifetime runs the second prompt of each applicant; threads start on demand
+        self._prompt_executor = ThreadPoolExecutor(
+            max_workers=max(1, int(max_concurrency)), thread_name_prefix='openai-prompt'
+        )
+        self._lock = threading.Lock()
+        self.stats = {
+            'calls': 0,
+            'input_tokens': 0,
+            'output_tokens': 0,
+            'seconds': 0.0,
+            # Input tokens the same calls would have used with the full prompts
+            'full_input_tokens': 0,
+            # Single-score calls and their latency per prompt mode, to compare compact with full
+            **{f'single_calls_{mode}': 0 for mode in self.PROMPT_MODES},
+            **{f'single_seconds_{mode}': 0.0 for mode in self.PROMPT_MODES}
+        }
+
+    def score(self, applicant: Dict) -> Scores:
+        """Both prompts in parallel: info on the shared prompt pool, experience in the calling thread"""
+        info_full = self.build_info_prompt(applicant)
+        experience_full = self.build_experience_prompt(applicant['experience'])
+        info_future = self._prompt_executor.submit(
+            self.score_prompt, self.info_prompt(applicant, info_full), self.DEFAULT_INFO_SCORE, info_full
+        )
+        experience_score, experience_fallback = self.score_prompt(
+            self.experience_prompt(applicant['experience'], experience_full), self.DEFAULT_EXPERIENCE_SCORE,
+            experience_full
+        )
+        info_score, info_fallback = info_future.result()
+
+        return info_score, experience_score, info_fallback or experience_fallback
+
+    def score_many(self, applicants: List[Dict]) -> List[Scores]:
+        """Score several applicants with one JSON request, falling back to per-row calls"""
+        results = [None] * len(applicants)
+        pending = {}
+
+        # Compact responses are cached apart from full-prompt ones
+        cache_prefix = "compact-batch:" if self.prompt_mode == 'compact' else "batch:"
+        for i, applicant in enumerate(applicants):
+            payload = json.dumps(self.build_batch_payload(applicant), sort_keys=True, default=str)
+            cached = None
+            if self.score_cache is not None:
+                cached = self.score_cache.get(self.model, f"{cache_prefix}{payload}")
+            if cached is not None:
+                scores = json.loads(cached)
+                results[i] = (scores['info_score'], scores['experience_score'], False)
+            else:
+                pending[str(i)] = payload
+
+        if pending:
+            try:
+                batch_scores = self.request_batch_scores(pending)
+            except Exception:
+                batch_scores = {}
+
+            for row_id, payload in pending.items():
+                scores = batch_scores.get(row_id)
+                if scores is None:
+                    continue
+
+                results[int(row_id)] = (scores['info_score'], scores['experience_score'], False)
+                if self.score_cache is not None:
+                    self.score_cache.set(self.model, f"{cache_prefix}{payload}", json.dumps(scores))
+
+        # Rows the model skipped or mangled get the regular per-row treatment
+        for i, applicant in enumerate(applicants):
+            if results[i] is None:
+                results[i] = self.score(applicant)
+
+        return results
+
+    def build_batch_payload(self, applicant: Dict) -> Dict:
+        """Minimal per-applicant fields sent in a batched scoring request"""
+        basic_info = applicant['basic_info']
+        experience = applicant['experience']
+        return {
+            'age': applicant['age'],
+            'bmi': applicant['bmi'],
+            'education': basic_info.get('education', 'N/A'),
+            'location': basic_info.get('location', 'N/A'),
+            'skills': basic_info.get('skills', 'N/A'),
+            'experience_years': experience.get('years', 0),
+            'previous_roles': experience.get('previous_roles', 'N/A'),
+            'certifications': experience.get('certifications', 'N/A')
+        }
+
+    def request_batch_scores(self, payloads: Dict[str, str]) -> Dict[str, Dict]:
+        """Send one structured request for several applicants and return valid scores by id"""
+        rows = "\n".join(f'{{"id": "{row_id}", "applicant": {payload}}}' for row_id, payload in payloads.items())
+        prompt = f"""
+        Rate each applicant below on two scales of 0-100:
+        - info_score: basic information (age appropriateness, education, relevant skills, profile completeness)
+        - experience_score: experience (years, quality of previous roles, certifications, career progression)
+        
+        Applicants (one JSON object per line):
+        {rows}
+        
+        Respond with only a JSON object of the form
+        {{"results": [{{"id": "<id>", "info_score": <number>, "experience_score": <number>}}]}}
+        containing one entry per applicant.
+        """
+
+        if self.prompt_mode == 'compact':
+            messages = [{"role": "system", "content": self.COMPACT_BATCH_SYSTEM}, {"role": "user", "content": rows}]
+        else:
+            messages = [{"role": "user", "content": prompt}]
+
+        response = self.chat(
+            'batch', messages, 40 * len(payloads) + 20, full_prompt=prompt, response_format={"type": "json_object"}
+        )
+
+        content = json.loads(response.choices[0].message.content)
+
+        scores = {}
+        for item in content.get('results', []):
+            try:
+                row_id = str(item['id'])
+                info_score = max(0, min(100, float(item['info_score'])))
+                experience_score = max(0, min(100, float(item['experience_score'])))
+            except (KeyError, TypeError, ValueError):
+                continue
+
+            if row_id in payloads:
+                scores[row_id] = {'info_score': info_score, 'experience_score': experience_score}
+
+        return scores
+
+    def chat(self, kind: str, messages: List[Dict], max_tokens: int, full_prompt: Optional[str] = None, **options):
+        """One chat completion through the scheduler, recording latency (retries included), outcome and tokens
+
+        full_prompt is the full-template prompt equivalent to a compact request; it is
+        only used to account for the input tokens compact mode saved.
+        """
+        text = ''.join(message['content'] for message in messages)
+        outcome = 'error'
+        started = time.perf_counter()
+        try:
+            with METRICS.timer('openai_request_seconds', kind=kind, prompt_mode=self.prompt_mode):
+                response = self.scheduler.run(
+                    lambda: self.client.chat.completions.create(
+                        model=self.model,
+                        messages=messages,
+                        max_tokens=max_tokens,
+                        timeout=self.scheduler.request_timeout,
+                        **options
+                    ),
+                    estimated_tokens=estimate_tokens(text, max_tokens)
+                )
+            outcome = 'ok'
+        finally:
+            METRICS.inc('openai_requests_total', kind=kind, outcome=outcome)
+
+        self.record_usage(response, time.perf_counter() - started, text, full_prompt, kind)
+        return response
+
+    def record_usage(self, response, seconds: float, prompt_text: str, full_prompt: Optional[str] = None,
+                     kind: str = 'single'):
+        """Count the input/output tokens the API reported (estimated when it reports none) and the latency"""
+        usage = getattr(response, 'usage', None)
+        input_tokens = getattr(usage, 'prompt_tokens', None) or estimate_tokens(prompt_text)
+        output_tokens = getattr(usage, 'completion_tokens', None) or 0
+
+        # Measured tokens scaled by the full template's length, so both sides share the API's tokenizer
+        full_input_tokens = input_tokens
+        if full_prompt is not None and self.prompt_mode == 'compact':
+            full_input_tokens = round(input_tokens * len(full_prompt) / max(1, len(prompt_text)))
+
+        with self._lock:
+            self.stats['calls'] += 1
+            self.stats['input_tokens'] += input_tokens
+            self.stats['output_tokens'] += output_tokens
+            self.stats['seconds'] += seconds
+            self.stats['full_input_tokens'] += full_input_tokens
+            if kind == 'single':
+                self.stats[f'single_calls_{self.prompt_mode}'] += 1
+                self.stats[f'single_seconds_{self.prompt_mode}'] += seconds
+
+        METRICS.inc('openai_tokens_total', input_tokens, direction='input', prompt_mode=self.prompt_mode)
+        METRICS.inc('openai_tokens_total', output_tokens, direction='output', prompt_mode=self.prompt_mode)
+
+    def get_stats(self) -> Dict:
+        with self._lock:
+            return dict(self.stats)
+
+    def signature(self) -> str:
+        return f'{self.name}:{self.model}:{self.prompt_mode}'
+
+    def request_score(self, prompt: Union[str, List[Dict]], full_prompt: Optional[str] = None) -> float:
+        """Send a scoring prompt (or chat messages) to OpenAI, reusing a cached response when available"""
+        if isinstance(prompt, str):
+            messages = [{"role": "user", "content": prompt}]
+            cache_key = prompt
+        else:
+            messages = prompt
+            cache_key = json.dumps(messages, sort_keys=True, ensure_ascii=False)
+
+        if self.score_cache is not None:
+            cached = self.score_cache.get(self.model, cache_key)
+            if cached is not None:
+                return float(cached)
+
+        response = self.chat('single', messages, 10, full_prompt=full_prompt)
+
+        score = float(response.choices[0].message.content.strip())
+        score = max(0, min(100, score))
+
+        # Only real model scores are cached, never the fallback defaults
+        if self.score_cache is not None:
+            self.score_cache.set(self.model, cache_key, str(score))
+
+        return score
+
+    def score_prompt(self, prompt: Union[str, List[Dict]], default: float,
+                     full_prompt: Optional[str] = None) -> Tuple[float, bool]:
+        """Score a prompt, returning (score, used_fallback) once retries are exhausted"""
+        try:
+            return self.request_score(prompt, full_prompt), False
+        except Exception:
+            return default, True
+
+    def info_prompt(self, applicant: Dict, full_prompt: Optional[str] = None) -> Union[str, List[Dict]]:
+        """Basic information request in the configured prompt mode (full_prompt: an already built full prompt)"""
+        if self.prompt_mode == 'full':
+            return full_prompt or self.build_info_prompt(applicant)
+        basic_info = applicant['basic_info']
+        return self.compact_messages(self.COMPACT_INFO_SYSTEM, {
+            'age': applicant['age'],
+            'bmi': applicant['bmi'],
+            'education': basic_info.get('education', 'N/A'),
+            'location': basic_info.get('location', 'N/A'),
+            'skills': basic_info.get('skills', 'N/A')
+        })
+
+    def experience_prompt(self, experience: Dict, full_prompt: Optional[str] = None) -> Union[str, List[Dict]]:
+        """Experience request in the configured prompt mode (full_prompt: an already built full prompt)"""
+        if self.prompt_mode == 'full':
+            return full_prompt or self.build_experience_prompt(experience)
+        return self.compact_messages(self.COMPACT_EXPERIENCE_SYSTEM, {
+            'years': experience.get('years', 0),
+            'previous_roles': experience.get('previous_roles', 'N/A'),
+            'certifications': experience.get('certifications', 'N/A')
+        })
+
+    @staticmethod
+    def compact_messages(system: str, payload: Dict) -> List[Dict]:
+        return [
+            {"role": "system", "content": system},
+            {"role": "user", "content": json.dumps(payload, default=str, ensure_ascii=False, separators=(',', ':'))}
+        ]
+
+    def applicant_prompt_tokens(self, applicant: Dict) -> int:
+        """Estimated input tokens of one applicant's two scoring requests in the configured mode"""
+        total = 0
+        for prompt in (self.info_prompt(applicant), self.experience_prompt(applicant['experience'])):
+            text = prompt if isinstance(prompt, str) else ''.join(message['content'] for message in prompt)
+            total += estimate_tokens(text, 10)
+        return total
+
+    def build_info_prompt(self, applicant: Dict) -> str:
+        """Prompt for the basic information score"""
+        return f"""
+            Rate the following applicant's basic information on a scale of 0-100:
+            
+            Name: {applicant['name']}
+            Age: {applicant['age']}
+            BMI: {applicant['bmi']}
+            Education: {applicant['basic_info'].get('education', 'N/A')}
+            Location: {applicant['basic_info'].get('location', 'N/A')}
+            Skills: {applicant['basic_info'].get('skills', 'N/A')}
+            
+            Consider factors like:
+            - Age appropriateness for the role
+            - Educational background
+            - Relevant skills
+            - Overall profile completeness
+            
+            Respond with only a number between 0-100.
+            """
+
+    def build_experience_prompt(self, experience: Dict) -> str:
+        """Prompt for the experience score"""
+        return f"""
+            Rate the following applicant's experience on a scale of 0-100:
+            
+            Years of Experience: {experience.get('years', 0)}
+            Previous Roles: {experience.get('previous_roles', 'N/A')}
+            Certifications: {experience.get('certifications', 'N/A')}
+            
+            Consider factors like:
+            - Years of relevant experience
+            - Quality of previous roles
+            - Relevant certifications
+            - Career progression
+            
+            Respond with only a number between 0-100.
+            """
+
+    def get_info_score(self, applicant: Dict) -> float:
+        """Get information score using OpenAI"""
+        return self.score_prompt(self.build_info_prompt(applicant), 70)[0]  # 70 if API fails
+
+    def get_experience_score(self, experience: Dict) -> float:
+        """Get experience score using OpenAI"""
+        return self.score_prompt(self.build_experience_prompt(experience), 60)[0]  # 60 if API fails
+
+
+class LocalRuleBackend(ScoringBackend):
+    """Deterministic offline scorer built on the keyword taxonomy used by experience_levels
+
+    Experience follows experience_levels' rules on the role description (previous
+    roles): Low without one, High for 5+ years with a High keyword, Mid for 2+ years,
+    otherwise Low. Each level is spread over its score band by years, keyword weight
+    and certifications. Info rewards education, listed skills and profile completeness.
+    No network calls, so it is meant for high-volume pre-screening.
+    """
+
+    name = 'local'
+    score_source = 'local'
+
+    # Combined scores where the overall level changes (see ApplicantAnalyzer.build_scoring_result)
+    LEVEL_BOUNDARIES = (60, 80)
+    # Distance from a boundary at which the local level is trusted fully
+    CONFIDENT_DISTANCE = 10
+
+    EDUCATION_POINTS = [
+        (re.compile(r'ph\.?d|doctor', re.IGNORECASE), 30),
+        (re.compile(r'master|m\.sc|mba', re.IGNORECASE), 25),
+        (re.compile(r'bachelor|b\.sc|degree', re.IGNORECASE), 20),
+        (re.compile(r'diploma|vocational|associate', re.IGNORECASE), 10),
+    ]
+
+    def __init__(self, matcher: Optional[KeywordMatcher] = None):
+        self.matcher = matcher or load_matcher()
+
+    def signature(self) -> str:
+        return f'{self.name}:{self.matcher.version}:{self.matcher.digest}'
+
+    @staticmethod
+    def _text(value) -> str:
+        if value is None or value != value:  # None or NaN
+            return ''
+        return str(value).strip()
+
+    def info_score(self, applicant: Dict) -> float:
+        basic_info = applicant.get('basic_info', {})
+        score = 30.0
+
+        education = self._text(basic_info.get('education'))
+        score += next((points for pattern, points in self.EDUCATION_POINTS if pattern.search(education)), 0)
+
+        skills = [skill for skill in re.split(r'[,;/\n]', self._text(basic_info.get('skills'))) if skill.strip()]
+        score += min(len(skills), 4) * 5
+
+        age = applicant.get('age')
+        if age is not None and age == age and 20 <= age <= 50:
+            score += 10
+
+        fields = [applicant.get('email'), applicant.get('phone'), education, basic_info.get('location')]
+        score += 10 * sum(1 for value in fields if self._text(value)) / len(fields)
+
+        return float(min(score, 100))
+
+    def experience_score(self, applicant: Dict) -> float:
+        experience = applicant.get('experience', {})
+        years = experience.get('years')
+        years = float(years) if years is not None and years == years else 0.0
+        description = self._text(experience.get('previous_roles'))
+        keyword_scores = self.matcher.score(description)
+        high = keyword_scores.get('High', 0)
+        mid = keyword_scores.get('Mid', 0)
+        has_certifications = bool(self._text(experience.get('certifications')))
+
+        # Same level rules as experience_levels, then a position inside the level's band
+        if not description:
+            score = 30 + min(years, 2) * 10 + (5 if has_certifications else 0)
+        elif years >= 5 and high >= self.matcher.high_threshold:
+            score = 80 + min(years - 5, 10) + min(high, 5) + (4 if has_certifications else 0)
+        elif years >= 2:
+            score = 60 + min(years, 10) + min(high + mid, 5) + (4 if has_certifications else 0)
+        else:
+            score = 30 + years * 10 + min(high + mid, 5) * 2 + (5 if has_certifications else 0)
+            score = min(score, 59)
+
+        return float(min(score, 100))
+
+    def confidence(self, applicant: Dict, info_score: float, experience_score: float) -> float:
+        """0-1 confidence that the LLM would put the applicant in the same level
+
+        Scores far from a level boundary (60/80 combined) are confident; a missing
+        role description lowers the confidence by a quarter since the keywords had nothing to read.
+        """
+        combined = (info_score + experience_score) / 2
+        distance = min(abs(combined - boundary) for boundary in self.LEVEL_BOUNDARIES)
+        confidence = min(1.0, distance / self.CONFIDENT_DISTANCE)
+        if not self._text(applicant.get('experience', {}).get('previous_roles')):
+            confidence *= 0.75
+        return confidence
+
+    def score(self, applicant: Dict) -> Scores:
+        return self.info_score(applicant), self.experience_score(applicant), False
+
+
+class CascadeBackend(ScoringBackend):
+    """Local rules first; only applicants the rules are unsure about go to the remote backend
+
+    An applicant is escalated when LocalRuleBackend.confidence() is below
+    escalate_below. Rows kept local are tagged 'local', escalated rows take the
+    remote backend's source. get_stats() counts both and estimates what was saved.
+    """
+
+    name = 'cascade'
+    score_source = 'local'
+    concurrent = True
+
+    def __init__(self, remote: OpenAIBackend, local: Optional[LocalRuleBackend] = None, escalate_below: float = 0.5):
+        self.remote = remote
+        self.local = local or LocalRuleBackend()
+        self.escalate_below = escalate_below
+        self._lock = threading.Lock()
+        self.stats = {
+            'screened': 0,
+            'escalated': 0,
+            'local_seconds': 0.0,
+            # Summed per-call remote latency (serial time, overlapping calls counted separately)
+            'remote_seconds': 0.0,
+            # Wall-clock time with at least one escalation in flight
+            'remote_wall_seconds': 0.0,
+            # Prompt tokens the remote backend would have spent on the rows kept local
+            'tokens_saved': 0
+        }
+        self._in_flight = 0
+        self._busy_since = 0.0
+
+    def signature(self) -> str:
+        return f'{self.name}:{self.escalate_below:g}:{self.local.signature()}:{self.remote.signature()}'
+
+    def screen(self, applicant: Dict) -> Tuple[Scores, bool]:
+        """(local scores, whether to escalate)"""
+        started = time.perf_counter()
+        info_score, experience_score, _ = self.local.score(applicant)
+        escalate = self.local.confidence(applicant, info_score, experience_score) < self.escalate_below
+        elapsed = time.perf_counter() - started
+
+        with self._lock:
+            self.stats['screened'] += 1
+            self.stats['local_seconds'] += elapsed
+            if not escalate:
+                self.stats['tokens_saved'] += self.remote_tokens(applicant)
+        return (info_score, experience_score, False, self.local.score_source), escalate
+
+    def remote_tokens(self, applicant: Dict) -> int:
+        return self.remote.applicant_prompt_tokens(applicant)
+
+    def escalate(self, applicants: List[Dict]) -> List[Scores]:
+        started = time.perf_counter()
+        with self._lock:
+            if not self._in_flight:
+                self._busy_since = started
+            self._in_flight += 1
+
+        try:
+            if len(applicants) == 1:
+                results = [self.remote.score(applicants[0])]
+            else:
+                results = self.remote.score_many(applicants)
+        finally:
+            finished = time.perf_counter()
+            with self._lock:
+                self._in_flight -= 1
+                if not self._in_flight:
+                    self.stats['remote_wall_seconds'] += finished - self._busy_since
+                self.stats['escalated'] += len(applicants)
+                self.stats['remote_seconds'] += finished - started
+        return [(*scores[:3], self.remote.score_source) for scores in results]
+
+    def score(self, applicant: Dict) -> Scores:
+        return self.score_many([applicant])[0]
+
+    def score_many(self, applicants: List[Dict]) -> List[Scores]:
+        results = []
+        uncertain = []
+        for i, applicant in enumerate(applicants):
+            scores, escalate = self.screen(applicant)
+            results.append(scores)
+            if escalate:
+                uncertain.append(i)
+
+        if uncertain:
+            for i, scores in zip(uncertain, self.escalate([applicants[i] for i in uncertain])):
+                results[i] = scores
+        return results
+
+    def get_stats(self) -> Dict:
+        with self._lock:
+            stats = dict(self.stats)
+            if self._in_flight:
+                stats['remote_wall_seconds'] += time.perf_counter() - self._busy_since
+        # API requests the remote backend actually issued (cache hits and batching included)
+        stats['remote_calls'] = self.remote.get_stats().get('calls', 0)
+        return stats
+
+
+def cascade_report(stats: Dict) -> Dict:
+    """Escalated fraction and estimated savings from a (per-run) CascadeBackend stats delta
+
+    Rows kept local are assumed to cost what the escalated rows of the same run did:
+    the API requests actually issued per escalated row (so batching and cache hits
+    count), and the wall-clock time the run spent waiting on the LLM per escalated
+    row (so concurrent calls are not counted twice).
+    """
+    screened = stats.get('screened', 0)
+    escalated = stats.get('escalated', 0)
+    kept_local = screened - escalated
+    calls_per_row = stats.get('remote_calls', 0) / escalated if escalated else None
+    wall_seconds_per_row = stats.get('remote_wall_seconds', 0.0) / escalated if escalated else None
+    return {
+        'screened': screened,
+        'escalated': escalated,
+        'escalated_fraction': escalated / screened if screened else 0.0,
+        'calls_per_escalated_row': calls_per_row,
+        'api_calls_saved': round(kept_local * calls_per_row) if calls_per_row is not None else None,
+        'tokens_saved': stats.get('tokens_saved', 0),
+        'seconds_saved': round(kept_local * wall_seconds_per_row, 2) if wall_seconds_per_row is not None else None
+    }
+
+
+def token_report(stats: Dict, prompt_mode: str) -> Dict:
+    """Token and latency accounting from a (per-run) OpenAIBackend stats delta
+
+    seconds_per_call_by_mode is the mean latency of this run's single-score calls
+    per prompt mode; seconds_saved_per_call appears when the run used both modes.
+    """
+    calls = stats.get('calls', 0)
+    report = {
+        'prompt_mode': prompt_mode,
+        'calls': calls,
+        'input_tokens': stats.get('input_tokens', 0),
+        'output_tokens': stats.get('output_tokens', 0),
+        'input_tokens_per_call': stats['input_tokens'] / calls if calls else None,
+        'output_tokens_per_call': stats['output_tokens'] / calls if calls else None,
+        'seconds_per_call': stats['seconds'] / calls if calls else None
+    }
+    if prompt_mode == 'compact':
+        full = stats.get('full_input_tokens', 0)
+        report['full_prompt_input_tokens'] = full
+        report['input_tokens_saved'] = full - report['input_tokens']
+        report['input_saved_fraction'] = (full - report['input_tokens']) / full if full else 0.0
+
+    by_mode = {
+        mode: stats[f'single_seconds_{mode}'] / stats[f'single_calls_{mode}']
+        for mode in OpenAIBackend.PROMPT_MODES
+        if stats.get(f'single_calls_{mode}')
+    }
+    if by_mode:
+        report['seconds_per_call_by_mode'] = by_mode
+    if 'full' in by_mode and 'compact' in by_mode:
+        report['seconds_saved_per_call'] = by_mode['full'] - by_mode['compact']
+    return report
+
+
+class MockBackend(ScoringBackend):
+    """Scores derived from a hash of the applicant, with optional latency and failures for load tests"""
+
+    name = 'mock'
+    score_source = 'mock'
+    concurrent = True
+
+    def __init__(self, latency: float = 0.0, failure_rate: float = 0.0, seed: int = 0):
+        self.latency = latency
+        self.failure_rate = failure_rate
+        self._random = random.Random(seed)
+
+    def score(self, applicant: Dict) -> Scores:
+        if self.latency:
+            time.sleep(self.latency)
+
+        if self.failure_rate and self._random.random() < self.failure_rate:
+            return OpenAIBackend.DEFAULT_INFO_SCORE, OpenAIBackend.DEFAULT_EXPERIENCE_SCORE, True
+
+        key = applicant.get('fingerprint') or f"{applicant.get('name')}|{applicant.get('email')}"
+        digest = hashlib.sha256(str(key).encode('utf-8')).digest()
+        return float(30 + digest[0] % 71), float(30 + digest[1] % 71), False
+
+
+BACKENDS = {
+    'openai': OpenAIBackend,
+    'local': LocalRuleBackend,
+    'cascade': CascadeBackend,
+    'mock': MockBackend,
+}
+
+
+def create_backend(name: str, **options) -> ScoringBackend:
+    """Backend by name ('openai', 'local', 'cascade' or 'mock') with its constructor options"""
+    if name not in BACKENDS:
+        raise ValueError(f"Unknown scoring backend: {name} (choose from {', '.join(BACKENDS)})")
+    return BACKENDS[name](**options)
@@ -1,14 +1,23 @@
 import streamlit as st
 import pandas as pd
-import requests
-import json
-from datetime import datetime
-import io
-import base64
-from typing import Dict, List, Optional
-import openai
-from urllib.parse import urlparse, parse_qs
-import re
+from typing import BinaryIO, Callable, Dict, Iterable, List, Optional
+import time
+import os
+import shutil
+import uuid
+from applicant_analyzer import ApplicantAnalyzer, ScoringRun
+from score_cache import ScoreCache
+from request_scheduler import RequestScheduler
+from http_fetch import ConditionalFetcher
+from pagination import render_pagination, render_view_mode
+from applicant_index import SEARCH_MODES, ApplicantIndex
+from applicant_store import ApplicantStore
+from exports import render_export_buttons
+from analysis_jobs import Job, JobQueue, JobStore
+from multi_source import discover_sources, load_applicant_sources
+from scoring_backends import OpenAIBackend, create_backend, create_openai_client
+from metrics import METRICS
+from diagnostics import render_diagnostics
 
 # Set page config
 st.set_page_config(
@@ -60,223 +69,326 @@ st.markdown("""
 
 # Initialize session state
 if 'applicants' not in st.session_state:
-    st.session_state.applicants = []
+    st.session_state.applicants = ApplicantStore()
 if 'analysis_jobs' not in st.session_state:
     st.session_state.analysis_jobs = []
+if 'loaded_jobs' not in st.session_state:
+    st.session_state.loaded_jobs = set()
 
-class ApplicantAnalyzer:
-    def __init__(self, openai_api_key: str):
-        self.openai_api_key = openai_api_key
-        openai.api_key = openai_api_key
-    
-    def download_excel_from_sharepoint(self, sharepoint_url: str) -> bytes:
-        """Download Excel file from SharePoint URL"""
-        try:
-            # Convert SharePoint sharing URL to download URL
-            download_url = self.convert_to_download_url(sharepoint_url)
-            
-            headers = {
-                'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36'
-            }
-            
-            response = requests.get(download_url, headers=headers)
-            response.raise_for_status()
-            
-            return response.content
-        except Exception as e:
-            st.error(f"Error downloading file: {str(e)}")
-            return None
-    
-    def convert_to_download_url(self, sharepoint_url: str) -> str:
-        """Convert SharePoint sharing URL to download URL"""
-        if 'download=1' in sharepoint_url:
-            return sharepoint_url
+@st.cache_resource
+def get_score_cache() -> ScoreCache:
+    """Process-wide score cache shared by every session"""
+    return ScoreCache()
+
+@st.cache_resource
+def get_http_fetcher() -> ConditionalFetcher:
+    """Process-wide downloader so sessions share the connection pool and blob cache"""
+    return ConditionalFetcher()
+
+@st.cache_resource(max_entries=16)
+def get_openai_client(api_key: str, base_url: Optional[str]):
+    """One pooled client per API key and endpoint, reused across reruns and sessions"""
+    return create_openai_client(api_key, base_url)
+
+@st.cache_resource
+def get_job_queue() -> JobQueue:
+    """Process-wide job workers, so runs outlive the session that started them"""
+    return JobQueue(JobStore())
+
+@st.cache_resource
+def get_request_scheduler(requests_per_minute: int, tokens_per_minute: int) -> RequestScheduler:
+    """Process-wide scheduler so every session shares the same API budget"""
+    return RequestScheduler(requests_per_minute=requests_per_minute, tokens_per_minute=tokens_per_minute)
+
+def render_cache_stats(score_cache: ScoreCache):
+    """Show score cache hit/miss counters in the sidebar"""
+    stats = score_cache.get_stats()
+    
+    st.sidebar.subheader("🗄️ Score Cache")
+    col1, col2 = st.sidebar.columns(2)
+    col1.metric("Hits", stats['hits'])
+    col2.metric("Misses", stats['misses'])
+    st.sidebar.caption(f"Hit rate {stats['hit_rate'] * 100:.1f}% · {stats['entries']} cached responses")
+    
+    if st.sidebar.button("🗑️ Clear score cache"):
+        score_cache.clear()
+        st.rerun()
+
+def run_scoring_job(job: Job, analyzer: ApplicantAnalyzer, applicant_chunks: Iterable[List[Dict]],
+                    previous_applicants: Optional[List[Dict]] = None) -> Dict:
+    """Score applicant chunks as they are parsed, persisting each result to the job store"""
+    run = ScoringRun(analyzer, previous_applicants, resumed=job.previous_results())
+    for position, applicant in run.results(applicant_chunks):
+        job.add_result(position, applicant)
+        job.report(rows_read=run.rows_read, message=run.status)
+    return run.summary()
+
+def submit_analysis_job(analyzer: ApplicantAnalyzer, kind: str, source: str, options: Dict,
+                        upload: Optional[BinaryIO] = None, uploads: Optional[List] = None) -> str:
+    """Register a job for a SharePoint URL, an uploaded file or a batch and hand it to the worker pool"""
+    queue = get_job_queue()
+    job_id = queue.store.create(kind, source, options)
+    # Keep uploads on disk so the job survives the session and can be resumed
+    if upload is not None:
+        upload.seek(0)
+        with open(queue.store.input_path(job_id), 'wb') as f:
+            shutil.copyfileobj(upload, f)
+    if uploads is not None:
+        os.makedirs(queue.store.input_path(job_id))
+        for uploaded in uploads:
+            uploaded.seek(0)
+            with open(os.path.join(queue.store.input_path(job_id), os.path.basename(uploaded.name)), 'wb') as f:
+                shutil.copyfileobj(uploaded, f)
+    
+    queue.submit(job_id, make_job_runner(analyzer, queue.store.get(job_id)))
+    st.session_state.analysis_jobs.append(job_id)
+    return job_id
+
+def make_job_runner(analyzer: ApplicantAnalyzer, record: Dict) -> Callable[[Job], Dict]:
+    """Job body: fetch or open the workbook(s), then stream them through run_scoring_job"""
+    store = get_job_queue().store
+    options = record['options']
+    
+    def run(job: Job) -> Dict:
+        previous_job_id = options.get('previous_job_id')
+        previous_applicants = store.results(previous_job_id) if previous_job_id else None
         
-        # Handle different SharePoint URL formats
-        patterns = [
-            r'https://.*\.sharepoint\.com/.*[?&]gid=([^&]+)',
-            r'https://.*\.sharepoint\.com/.*[?&]resid=([^&]+)',
-        ]
+        if record['kind'] == 'batch':
+            return run_batch_job(job, analyzer, record, previous_applicants)
         
-        for pattern in patterns:
-            match = re.search(pattern, sharepoint_url)
-            if match:
-                return f"{sharepoint_url}&download=1"
+        if record['kind'] == 'url':
+            def progress(downloaded: int, total: Optional[int]):
+                job.report(message=f"Downloaded {downloaded / 1e6:.1f} MB")
+            
+            file_content = analyzer.download_excel_from_sharepoint(
+                record['source'],
+                max_bytes=options.get('max_bytes'),
+                progress=progress
+            )
+        else:
+            file_content = open(store.input_path(record['job_id']), 'rb')
         
-        # Default fallback
-        separator = '&' if '?' in sharepoint_url else '?'
-        return f"{sharepoint_url}{separator}download=1"
-    
-    def parse_excel_file(self, file_content: bytes) -> List[Dict]:
-        """Parse Excel file and extract applicant data"""
-        try:
-            df = pd.read_excel(io.BytesIO(file_content))
-            
-            applicants = []
-            for index, row in df.iterrows():
-                # Extract basic information
-                name = str(row.get('Name', f'Applicant {index + 1}'))
-                email = str(row.get('Email', f'applicant{index + 1}@example.com'))
-                age = self.safe_convert_to_number(row.get('Age'))
-                height = self.safe_convert_to_number(row.get('Height'))
-                weight = self.safe_convert_to_number(row.get('Weight'))
-                
-                # Calculate BMI
-                bmi = 0
-                if height and weight and height > 0:
-                    height_m = height / 100  # Convert cm to m
-                    bmi = weight / (height_m ** 2)
-                
-                # Extract other data
-                basic_info = {
-                    'education': row.get('Education', ''),
-                    'location': row.get('Location', ''),
-                    'skills': row.get('Skills', '')
-                }
-                
-                experience = {
-                    'years': self.safe_convert_to_number(row.get('Experience_Years', 0)),
-                    'previous_roles': row.get('Previous_Roles', ''),
-                    'certifications': row.get('Certifications', '')
-                }
-                
-                applicant = {
-                    'external_id': f'EXT_{index + 1}',
-                    'name': name,
-                    'email': email,
-                    'phone': str(row.get('Phone', '')),
-                    'age': age,
-                    'height': height,
-                    'weight': weight,
-                    'bmi': round(bmi, 2),
-                    'basic_info': basic_info,
-                    'experience': experience,
-                    'raw_data': row.to_dict()
-                }
-                
-                applicants.append(applicant)
-            
-            return applicants
-            
-        except Exception as e:
-            st.error(f"Error parsing Excel file: {str(e)}")
-            return []
-    
-    def safe_convert_to_number(self, value) -> Optional[float]:
-        """Safely convert value to number"""
-        if pd.isna(value):
-            return None
-        try:
-            return float(value)
-        except:
-            return None
-    
-    def score_applicant(self, applicant: Dict) -> Dict:
-        """Score applicant using OpenAI"""
-        try:
-            # If BMI > 25, automatically assign Low level
-            if applicant['bmi'] > 25:
-                return {
-                    'info_score': 30,
-                    'experience_score': 30,
-                    'overall_level': 'Low',
-                    'reasoning': 'BMI > 25 - Automatically assigned Low level'
-                }
-            
-            # Get AI scoring for applicants with BMI <= 25
-            info_score = self.get_info_score(applicant)
-            experience_score = self.get_experience_score(applicant['experience'])
-            
-            # Calculate overall level
-            combined_score = (info_score + experience_score) / 2
-            
-            if combined_score >= 80:
-                level = 'High'
-            elif combined_score >= 60:
-                level = 'Mid'
+        with file_content:
+            summary = run_scoring_job(job, analyzer, analyzer.iter_excel_chunks(file_content), previous_applicants)
+        
+        if record['kind'] == 'file':
+            os.remove(store.input_path(record['job_id']))
+        return summary
+    
+    return run
+
+def run_batch_job(job: Job, analyzer: ApplicantAnalyzer, record: Dict,
+                  previous_applicants: Optional[List[Dict]]) -> Dict:
+    """Parse every sheet of every uploaded workbook/zip and URL across processes, then score the merged table"""
+    store = get_job_queue().store
+    options = record['options']
+    input_dir = store.input_path(record['job_id'])
+    
+    inputs = ([input_dir] if os.path.isdir(input_dir) else []) + options.get('urls', [])
+    sources = discover_sources(inputs, max_bytes=options.get('max_bytes'))
+    job.report(message=f"Parsing {len(sources)} workbooks")
+    applicants, ingest = load_applicant_sources(
+        sources,
+        progress=lambda done, total: job.report(message=f"Parsed {done}/{total} workbooks")
+    )
+    
+    chunks = (applicants[start:start + 1000] for start in range(0, len(applicants), 1000))
+    summary = run_scoring_job(job, analyzer, chunks, previous_applicants)
+    summary['ingest'] = ingest
+    
+    shutil.rmtree(input_dir, ignore_errors=True)
+    return summary
+
+def render_job_summary(summary: Dict):
+    """Scoring report and change summary of a finished job"""
+    if summary.get('ingest'):
+        ingest = summary['ingest']
+        st.info(
+            f"📚 {ingest['files']} workbooks · {ingest['sheets']} sheets · {ingest['rows']} rows → "
+            f"{ingest['applicants']} applicants ({ingest['duplicates']} duplicates merged)"
+        )
+    render_scoring_report(summary['sources'], summary['scheduler'])
+    if summary.get('cascade'):
+        render_cascade_report(summary['cascade'])
+    if summary.get('tokens') and summary['tokens']['calls']:
+        render_token_report(summary['tokens'])
+    if summary.get('changes'):
+        render_change_summary(summary['changes'])
+
+def load_job_results(job_id: str):
+    """Make a job's (possibly partial) results the current applicants"""
+    st.session_state.applicants = ApplicantStore.from_applicants(get_job_queue().store.results(job_id))
+    st.session_state.applicants_job_id = job_id
+
+def render_analysis_jobs(analyzer: ApplicantAnalyzer) -> bool:
+    """Progress, partial results and controls for this session's jobs; True while any is active"""
+    queue = get_job_queue()
+    
+    with st.expander("🔗 Attach to an existing job"):
+        attach_id = st.text_input("Job ID", key="attach_job_id").strip()
+        if st.button("Attach", key="attach_job") and attach_id:
+            if queue.store.get(attach_id) is None:
+                st.error(f"Job {attach_id} not found")
+            elif attach_id not in st.session_state.analysis_jobs:
+                st.session_state.analysis_jobs.append(attach_id)
+    
+    if not st.session_state.analysis_jobs:
+        return False
+    
+    st.subheader("🧵 Analysis Jobs")
+    any_active = False
+    
+    for job_id in reversed(st.session_state.analysis_jobs):
+        job = queue.store.get(job_id)
+        if job is None:
+            continue
+        
+        active = queue.is_active(job_id)
+        any_active = any_active or active
+        source = job['source'] if job['kind'] == 'url' else job['options'].get('file_name', 'uploaded file')
+        
+        with st.container():
+            st.markdown(f"**{job_id}** · {job['status']} · {source}")
+            if job['rows_read']:
+                st.progress(
+                    min(job['scored_rows'] / job['rows_read'], 1.0),
+                    text=f"{job['scored_rows']}/{job['rows_read']} rows read · {job['message']}"
+                )
             else:
-                level = 'Low'
-            
-            return {
-                'info_score': info_score,
-                'experience_score': experience_score,
-                'overall_level': level,
-                'reasoning': f'Combined score: {combined_score:.1f}%'
-            }
-            
-        except Exception as e:
-            st.error(f"Error scoring applicant: {str(e)}")
-            return {
-                'info_score': 50,
-                'experience_score': 50,
-                'overall_level': 'Mid',
-                'reasoning': 'Error in scoring - default values assigned'
-            }
-    
-    def get_info_score(self, applicant: Dict) -> float:
-        """Get information score using OpenAI"""
-        try:
-            prompt = f"""
-            Rate the following applicant's basic information on a scale of 0-100:
-            
-            Name: {applicant['name']}
-            Age: {applicant['age']}
-            BMI: {applicant['bmi']}
-            Education: {applicant['basic_info'].get('education', 'N/A')}
-            Location: {applicant['basic_info'].get('location', 'N/A')}
-            Skills: {applicant['basic_info'].get('skills', 'N/A')}
-            
-            Consider factors like:
-            - Age appropriateness for the role
-            - Educational background
-            - Relevant skills
-            - Overall profile completeness
-            
-            Respond with only a number between 0-100.
-            """
-            
-            response = openai.ChatCompletion.create(
-                model="gpt-4o",
-                messages=[{"role": "user", "content": prompt}],
-                max_tokens=10
-            )
-            
-            score = float(response.choices[0].message.content.strip())
-            return max(0, min(100, score))
-            
-        except Exception:
-            return 70  # Default score if API fails
-    
-    def get_experience_score(self, experience: Dict) -> float:
-        """Get experience score using OpenAI"""
-        try:
-            prompt = f"""
-            Rate the following applicant's experience on a scale of 0-100:
-            
-            Years of Experience: {experience.get('years', 0)}
-            Previous Roles: {experience.get('previous_roles', 'N/A')}
-            Certifications: {experience.get('certifications', 'N/A')}
-            
-            Consider factors like:
-            - Years of relevant experience
-            - Quality of previous roles
-            - Relevant certifications
-            - Career progression
-            
-            Respond with only a number between 0-100.
-            """
-            
-            response = openai.ChatCompletion.create(
-                model="gpt-4o",
-                messages=[{"role": "user", "content": prompt}],
-                max_tokens=10
-            )
-            
-            score = float(response.choices[0].message.content.strip())
-            return max(0, min(100, score))
-            
-        except Exception:
-            return 60  # Default score if API fails
+                st.caption(job['message'])
+            
+            if job['status'] == 'completed':
+                if job_id not in st.session_state.loaded_jobs:
+                    # First poll after completion: results become the current applicants
+                    load_job_results(job_id)
+                    st.session_state.loaded_jobs.add(job_id)
+                    st.success(f"✅ วิเคราะห์ข้อมูลผู้สมัครเรียบร้อยแล้ว! จำนวน {job['summary']['rows']} คน")
+                render_job_summary(job['summary'])
+            elif job['status'] == 'failed':
+                st.error(f"Job failed: {job['message']}")
+            elif active and job['scored_rows']:
+                # Results so far while the rest of the file is still being scored
+                preview = queue.store.results(job_id, limit=PREVIEW_ROWS)
+                st.dataframe(applicants_grid(preview)[PREVIEW_COLUMNS], use_container_width=True, height=250)
+            
+            col1, col2, col3 = st.columns(3)
+            if active:
+                if col1.button("⏹️ Cancel", key=f"cancel_{job_id}"):
+                    queue.cancel(job_id)
+                    st.rerun()
+            elif job['status'] in ('interrupted', 'failed', 'cancelled'):
+                if col1.button("▶️ Resume", key=f"resume_{job_id}"):
+                    queue.submit(job_id, make_job_runner(analyzer, job))
+                    st.rerun()
+            if job['scored_rows'] and col2.button("📥 Load results", key=f"load_{job_id}"):
+                load_job_results(job_id)
+                st.rerun()
+            st.divider()
+    
+    return any_active
+
+GRID_COLUMNS = [
+    'external_id', 'name', 'email', 'phone', 'overall_level', 'info_score',
+    'experience_score', 'age', 'bmi', 'reasoning'
+]
+
+# Live preview of a running job
+PREVIEW_ROWS = 200
+PREVIEW_COLUMNS = ['name', 'email', 'overall_level', 'info_score', 'experience_score']
+
+# Seconds between job progress polls
+JOB_POLL_INTERVAL = 2.0
+
+def applicants_grid(applicants: List[Dict]) -> pd.DataFrame:
+    """Flat table of the fields shown in the compact grid view"""
+    return pd.DataFrame(
+        [{column: applicant.get(column) for column in GRID_COLUMNS} for applicant in applicants],
+        columns=GRID_COLUMNS
+    )
+
+def get_applicant_index() -> ApplicantIndex:
+    """Search/level index over the current applicants, rebuilt only when a new run replaces them"""
+    applicants = st.session_state.applicants
+    if st.session_state.get('applicant_index_source') is not applicants:
+        st.session_state.applicant_index = ApplicantIndex(applicants.columns(GRID_COLUMNS))
+        st.session_state.applicant_index_source = applicants
+    return st.session_state.applicant_index
+
+def get_applicants_version() -> str:
+    """Identifier of the current result set, renewed whenever a new run replaces it"""
+    applicants = st.session_state.applicants
+    if st.session_state.get('applicants_version_source') is not applicants:
+        st.session_state.applicants_version = uuid.uuid4().hex
+        st.session_state.applicants_version_source = applicants
+    return st.session_state.applicants_version
+
+def render_change_summary(summary: Dict):
+    """Show which rows were added, changed or removed since the previous run"""
+    st.info(
+        f"🔁 Incremental re-analysis - added: {summary['added']} · changed: {summary['changed']} · "
+        f"removed: {summary['removed']} · unchanged (reused): {summary['unchanged']}"
+    )
+
+# score_source values of the non-LLM backends
+SCORE_SOURCE_LABELS = {
+    'local': "Local rules",
+    'mock': "Mock",
+}
+
+BACKEND_LABELS = {
+    'openai': "OpenAI (LLM)",
+    'local': "Local rules (offline)",
+    'cascade': "Cascade (local rules → OpenAI)",
+    'mock': "Mock (testing)",
+}
+
+def render_scoring_report(sources: Dict[str, int], stats: Dict):
+    """Report how many rows got real model scores versus fallback defaults"""
+    model_rows = sources.get('model', 0)
+    rule_rows = sources.get('rule', 0)
+    fallback_rows = sources.get('fallback', 0)
+    
+    backend_counts = "".join(
+        f"{SCORE_SOURCE_LABELS[source]}: {sources[source]} · "
+        for source in SCORE_SOURCE_LABELS if sources.get(source)
+    )
+    message = (
+        f"Scored by model: {model_rows} · {backend_counts}BMI rule: {rule_rows} · Fallback defaults: {fallback_rows} "
+        f"(retries {stats['retries']}, rate limited {stats['rate_limited']}, "
+        f"throttled {stats['throttle_seconds']:.1f}s)"
+    )
+    if fallback_rows:
+        st.warning(f"⚠️ {message}")
+    else:
+        st.info(message)
+
+def render_token_report(report: Dict):
+    """Tokens per call of a run and what compact prompts saved"""
+    message = (
+        f"🔢 {report['calls']} API calls ({report['prompt_mode']} prompts) · "
+        f"input {report['input_tokens']:,} tokens ({report['input_tokens_per_call']:.0f}/call) · "
+        f"output {report['output_tokens']:,} · {report['seconds_per_call'] * 1000:.0f} ms/call"
+    )
+    if 'input_tokens_saved' in report:
+        message += (
+            f" · saved ~{report['input_tokens_saved']:,} input tokens "
+            f"({report['input_saved_fraction']:.0%}) vs full prompts"
+        )
+    if 'seconds_saved_per_call' in report:
+        message += f" · {report['seconds_saved_per_call'] * 1000:+.0f} ms/call vs full prompts (this run)"
+    st.info(message)
+
+def render_cascade_report(report: Dict):
+    """Share of rows the cascade sent to the LLM and what the local pre-screen saved"""
+    message = (
+        f"🪜 Cascade: {report['escalated']}/{report['screened']} rows escalated to the LLM "
+        f"({report['escalated_fraction']:.0%}) · saved ~{report['tokens_saved']:,} tokens"
+    )
+    if report['api_calls_saved'] is not None:
+        message += f", ~{report['api_calls_saved']:,} API calls"
+    if report['seconds_saved'] is not None:
+        message += f", ~{report['seconds_saved']:.1f}s of wall-clock LLM wait"
+    st.info(message)
 
 def main():
     st.title("📊 Applicant Analysis System")
@@ -285,6 +397,13 @@ def main():
     # Sidebar for settings
     st.sidebar.header("🔧 Settings")
     
+    scoring_backend = st.sidebar.selectbox(
+        "Scoring backend",
+        list(BACKEND_LABELS),
+        format_func=BACKEND_LABELS.get,
+        help="OpenAI ใช้ LLM, Local rules ให้คะแนนแบบออฟไลน์ด้วยกฎและคีย์เวิร์ด, Mock สำหรับทดสอบ"
+    )
+    
     # OpenAI API Key input
     openai_api_key = st.sidebar.text_input(
         "OpenAI API Key",
@@ -292,12 +411,100 @@ def main():
         help="ใส่ OpenAI API key เพื่อใช้งานการวิเคราะห์ด้วย AI"
     )
     
-    if not openai_api_key:
+    max_concurrency = st.sidebar.slider(
+        "Concurrent applicants",
+        min_value=1,
+        max_value=32,
+        value=8,
+        help="จำนวนผู้สมัครที่วิเคราะห์พร้อมกัน (แต่ละคนใช้ 2 API calls)"
+    )
+    
+    batch_size = st.sidebar.number_input(
+        "Applicants per request",
+        min_value=1,
+        max_value=50,
+        value=1,
+        help="มากกว่า 1 = รวมผู้สมัครหลายคนใน request เดียว (JSON) เพื่อลด token และ latency"
+    )
+    
+    compact_prompts = st.sidebar.checkbox(
+        "Compact prompts",
+        value=False,
+        help="ส่งคำสั่งเป็น system message ร่วมกัน และส่งเฉพาะข้อมูลที่จำเป็นของผู้สมัคร (ไม่ส่งชื่อ) เพื่อลด token"
+    )
+    prompt_mode = 'compact' if compact_prompts else 'full'
+    
+    incremental = st.sidebar.checkbox(
+        "Incremental re-analysis",
+        value=True,
+        help="วิเคราะห์เฉพาะแถวที่เพิ่มหรือแก้ไขจากรอบก่อน และใช้ผลเดิมสำหรับแถวที่ไม่เปลี่ยนแปลง"
+    )
+    
+    max_download_mb = st.sidebar.number_input(
+        "Max download size (MB)",
+        min_value=1,
+        value=500,
+        help="ขนาดไฟล์สูงสุดที่อนุญาตให้ดาวน์โหลดจาก SharePoint"
+    )
+    
+    escalate_below = 0.5
+    if scoring_backend == 'cascade':
+        escalate_below = st.sidebar.slider(
+            "Escalate when local confidence below",
+            min_value=0.0,
+            max_value=1.0,
+            value=0.5,
+            step=0.05,
+            help="ผู้สมัครที่กฎในเครื่องให้ความมั่นใจต่ำกว่าค่านี้ (ใกล้เส้นแบ่งระดับ) จะถูกส่งให้ LLM วิเคราะห์"
+        )
+    
+    with st.sidebar.expander("⏱️ Rate Limits & Endpoint"):
+        requests_per_minute = st.number_input("Requests per minute", min_value=1, value=500, step=50)
+        tokens_per_minute = st.number_input("Tokens per minute", min_value=1000, value=30000, step=1000)
+        base_url = st.text_input(
+            "API base URL",
+            value=os.environ.get('OPENAI_BASE_URL', ''),
+            help="เว้นว่างเพื่อใช้ OpenAI โดยตรง หรือใส่ URL ของ endpoint ที่เข้ากันได้ เช่น mock_openai_server.py สำหรับทดสอบโหลด"
+        ).strip() or None
+    
+    if scoring_backend in ('openai', 'cascade') and not openai_api_key:
         st.warning("⚠️ กรุณาใส่ OpenAI API Key ในแถบด้านข้างเพื่อใช้งานระบบ")
         st.stop()
     
     # Initialize analyzer
-    analyzer = ApplicantAnalyzer(openai_api_key)
+    score_cache = get_score_cache()
+    scheduler = get_request_scheduler(requests_per_minute, tokens_per_minute)
+    client = get_openai_client(openai_api_key, base_url) if scoring_backend in ('openai', 'cascade') else None
+    backend = None
+    if scoring_backend == 'cascade':
+        backend = create_backend(
+            'cascade',
+            remote=OpenAIBackend(
+                openai_api_key, scheduler=scheduler, score_cache=score_cache, client=client, prompt_mode=prompt_mode,
+                max_concurrency=max_concurrency
+            ),
+            escalate_below=escalate_below
+        )
+    elif scoring_backend != 'openai':
+        backend = create_backend(scoring_backend)
+    
+    analyzer = ApplicantAnalyzer(
+        openai_api_key,
+        max_concurrency=max_concurrency,
+        score_cache=score_cache,
+        batch_size=batch_size,
+        scheduler=scheduler,
+        fetcher=get_http_fetcher(),
+        backend=backend,
+        client=client,
+        prompt_mode=prompt_mode
+    )
+    
+    # Incremental runs diff against the job that produced the current applicants
+    job_options = {
+        'previous_job_id': st.session_state.get('applicants_job_id') if incremental else None,
+        'backend': scoring_backend
+    }
     
     # Main interface
     tab1, tab2, tab3 = st.tabs(["📥 Data Input", "📊 Analysis Results", "📈 Statistics"])
@@ -308,7 +515,7 @@ def main():
         
         input_method = st.radio(
             "เลือกวิธีการนำเข้าข้อมูล:",
-            ["SharePoint URL", "Upload Excel File"]
+            ["SharePoint URL", "Upload Excel File", "Multiple Files / Zip / URLs"]
         )
         
         if input_method == "SharePoint URL":
@@ -320,41 +527,39 @@ def main():
             
             if st.button("🔄 Fetch Data from SharePoint", type="primary"):
                 if sharepoint_url:
-                    with st.spinner("กำลังดาวน์โหลดและวิเคราะห์ข้อมูล..."):
-                        # Download and parse Excel file
-                        file_content = analyzer.download_excel_from_sharepoint(sharepoint_url)
-                        
-                        if file_content:
-                            applicants = analyzer.parse_excel_file(file_content)
-                            
-                            if applicants:
-                                # Score each applicant
-                                scored_applicants = []
-                                progress_bar = st.progress(0)
-                                
-                                for i, applicant in enumerate(applicants):
-                                    scoring_result = analyzer.score_applicant(applicant)
-                                    
-                                    scored_applicant = {
-                                        **applicant,
-                                        'info_score': scoring_result['info_score'],
-                                        'experience_score': scoring_result['experience_score'],
-                                        'overall_level': scoring_result['overall_level'],
-                                        'reasoning': scoring_result['reasoning'],
-                                        'created_at': datetime.now().isoformat()
-                                    }
-                                    
-                                    scored_applicants.append(scored_applicant)
-                                    progress_bar.progress((i + 1) / len(applicants))
-                                
-                                # Save to session state
-                                st.session_state.applicants = scored_applicants
-                                
-                                st.success(f"✅ วิเคราะห์ข้อมูลผู้สมัครเรียบร้อยแล้ว! จำนวน {len(scored_applicants)} คน")
-                                
+                    # Download, parsing and scoring run on the job workers, not in this rerun
+                    job_id = submit_analysis_job(analyzer, 'url', sharepoint_url, {
+                        **job_options,
+                        'max_bytes': int(max_download_mb * 1024 * 1024)
+                    })
+                    st.success(f"🧵 Job {job_id} queued")
                 else:
                     st.error("⚠️ กรุณาใส่ SharePoint URL")
         
+        elif input_method == "Multiple Files / Zip / URLs":
+            uploaded_files = st.file_uploader(
+                "อัปโหลดไฟล์ Excel หรือ Zip (หลายไฟล์)",
+                type=['xlsx', 'xls', 'zip'],
+                accept_multiple_files=True,
+                help="ทุกชีตในทุกไฟล์จะถูกรวมเป็นตารางเดียว และตัดผู้สมัครที่ซ้ำกัน (อีเมลเดียวกัน) ออก"
+            )
+            url_list = st.text_area(
+                "SharePoint URLs (บรรทัดละหนึ่งลิงก์)",
+                placeholder="https://company.sharepoint.com/sites/hr/Documents/posting-1.xlsx"
+            )
+            urls = [url.strip() for url in url_list.splitlines() if url.strip()]
+            
+            if uploaded_files or urls:
+                if st.button("🔄 Analyze All", type="primary"):
+                    label = f"{len(uploaded_files)} files, {len(urls)} URLs"
+                    job_id = submit_analysis_job(analyzer, 'batch', label, {
+                        **job_options,
+                        'file_name': label,
+                        'urls': [analyzer.convert_to_download_url(url) for url in urls],
+                        'max_bytes': int(max_download_mb * 1024 * 1024)
+                    }, uploads=uploaded_files)
+                    st.success(f"🧵 Job {job_id} queued")
+        
         else:  # Upload Excel File
             uploaded_file = st.file_uploader(
                 "อัปโหลดไฟล์ Excel",
@@ -364,43 +569,22 @@ def main():
             
             if uploaded_file is not None:
                 if st.button("🔄 Analyze Uploaded File", type="primary"):
-                    with st.spinner("กำลังวิเคราะห์ข้อมูล..."):
-                        # Parse uploaded file
-                        applicants = analyzer.parse_excel_file(uploaded_file.read())
-                        
-                        if applicants:
-                            # Score each applicant
-                            scored_applicants = []
-                            progress_bar = st.progress(0)
-                            
-                            for i, applicant in enumerate(applicants):
-                                scoring_result = analyzer.score_applicant(applicant)
-                                
-                                scored_applicant = {
-                                    **applicant,
-                                    'info_score': scoring_result['info_score'],
-                                    'experience_score': scoring_result['experience_score'],
-                                    'overall_level': scoring_result['overall_level'],
-                                    'reasoning': scoring_result['reasoning'],
-                                    'created_at': datetime.now().isoformat()
-                                }
-                                
-                                scored_applicants.append(scored_applicant)
-                                progress_bar.progress((i + 1) / len(applicants))
-                            
-                            # Save to session state
-                            st.session_state.applicants = scored_applicants
-                            
-                            st.success(f"✅ วิเคราะห์ข้อมูลผู้สมัครเรียบร้อยแล้ว! จำนวน {len(scored_applicants)} คน")
-    
-    with tab2:
+                    job_id = submit_analysis_job(analyzer, 'file', uploaded_file.name, {
+                        **job_options,
+                        'file_name': uploaded_file.name
+                    }, upload=uploaded_file)
+                    st.success(f"🧵 Job {job_id} queued")
+        
+        jobs_active = render_analysis_jobs(analyzer)
+    
+    with tab2, METRICS.timer('stage_seconds', stage='render', view='results'):
         st.header("📊 Analysis Results")
         
         if not st.session_state.applicants:
             st.info("ไม่มีข้อมูลผู้สมัคร กรุณานำเข้าข้อมูลในแท็บ Data Input ก่อน")
         else:
             # Filters
-            col1, col2 = st.columns(2)
+            col1, col2, col3 = st.columns([2, 3, 1])
             
             with col1:
                 level_filter = st.selectbox(
@@ -414,61 +598,76 @@ def main():
                     placeholder="ชื่อหรืออีเมล"
                 )
             
-            # Filter applicants
-            filtered_applicants = st.session_state.applicants
-            
-            if level_filter != "All Levels":
-                filtered_applicants = [
-                    a for a in filtered_applicants 
-                    if a['overall_level'] == level_filter
-                ]
-            
-            if search_term:
-                filtered_applicants = [
-                    a for a in filtered_applicants 
-                    if search_term.lower() in a['name'].lower() or 
-                       search_term.lower() in a['email'].lower()
-                ]
+            with col3:
+                search_mode = st.selectbox("โหมดค้นหา:", SEARCH_MODES)
+            
+            # Filter applicants through the precomputed index (positions into the applicant store)
+            applicant_index = get_applicant_index()
+            positions = applicant_index.filter(
+                level=None if level_filter == "All Levels" else level_filter,
+                query=search_term,
+                mode=search_mode
+            )
             
             # Display results
-            st.subheader(f"ผลการวิเคราะห์ ({len(filtered_applicants)} คน)")
+            st.subheader(f"ผลการวิเคราะห์ ({len(positions)} คน)")
+            
+            view_mode = render_view_mode(len(positions), key="results_view")
             
-            for applicant in filtered_applicants:
-                with st.expander(f"👤 {applicant['name']} - {applicant['overall_level']} Level"):
-                    col1, col2, col3 = st.columns(3)
-                    
-                    with col1:
-                        st.metric("Info Score", f"{applicant['info_score']:.1f}%")
-                        st.write(f"**Email:** {applicant['email']}")
-                        st.write(f"**Age:** {applicant.get('age', 'N/A')}")
-                        st.write(f"**BMI:** {applicant['bmi']}")
-                    
-                    with col2:
-                        st.metric("Experience Score", f"{applicant['experience_score']:.1f}%")
-                        st.write(f"**Phone:** {applicant.get('phone', 'N/A')}")
-                        st.write(f"**Height:** {applicant.get('height', 'N/A')} cm")
-                        st.write(f"**Weight:** {applicant.get('weight', 'N/A')} kg")
-                    
-                    with col3:
-                        level_color = {
-                            'High': '🟢',
-                            'Mid': '🟡',
-                            'Low': '🔴'
-                        }
-                        st.metric("Overall Level", f"{level_color.get(applicant['overall_level'], '')} {applicant['overall_level']}")
-                        st.write(f"**Reasoning:** {applicant['reasoning']}")
-                    
-                    # Action buttons
-                    col1, col2 = st.columns(2)
-                    with col1:
-                        if st.button(f"📅 Schedule Teams Meeting", key=f"teams_{applicant['external_id']}"):
-                            st.info("Teams meeting scheduling feature - integrate with Microsoft Graph API")
-                    
-                    with col2:
-                        if st.button(f"✉️ Generate Email", key=f"email_{applicant['external_id']}"):
-                            st.info("Email generation feature - integrate with email service")
-    
-    with tab3:
+            if view_mode == "Grid":
+                # One virtualised grid instead of a widget tree per applicant
+                st.dataframe(
+                    applicant_index.table.iloc[positions],
+                    use_container_width=True,
+                    hide_index=True,
+                    height=600
+                )
+            else:
+                # Only the visible page gets expanders, metrics and buttons
+                start, end = render_pagination(len(positions), key="results")
+                
+                for applicant in st.session_state.applicants.records(positions[start:end]):
+                    with st.expander(f"👤 {applicant['name']} - {applicant['overall_level']} Level"):
+                        col1, col2, col3 = st.columns(3)
+                        
+                        with col1:
+                            st.metric("Info Score", f"{applicant['info_score']:.1f}%")
+                            st.write(f"**Email:** {applicant['email']}")
+                            st.write(f"**Age:** {applicant.get('age', 'N/A')}")
+                            st.write(f"**BMI:** {applicant['bmi']}")
+                        
+                        with col2:
+                            st.metric("Experience Score", f"{applicant['experience_score']:.1f}%")
+                            st.write(f"**Phone:** {applicant.get('phone', 'N/A')}")
+                            st.write(f"**Height:** {applicant.get('height', 'N/A')} cm")
+                            st.write(f"**Weight:** {applicant.get('weight', 'N/A')} kg")
+                        
+                        with col3:
+                            level_color = {
+                                'High': '🟢',
+                                'Mid': '🟡',
+                                'Low': '🔴'
+                            }
+                            st.metric("Overall Level", f"{level_color.get(applicant['overall_level'], '')} {applicant['overall_level']}")
+                            st.write(f"**Reasoning:** {applicant['reasoning']}")
+                        
+                        if applicant.get('provenance'):
+                            st.caption("Source: " + " · ".join(
+                                f"{place['file']} / {place['sheet']} / row {place['row']}"
+                                for place in applicant['provenance']
+                            ))
+                        
+                        # Action buttons
+                        col1, col2 = st.columns(2)
+                        with col1:
+                            if st.button(f"📅 Schedule Teams Meeting", key=f"teams_{applicant['external_id']}"):
+                                st.info("Teams meeting scheduling feature - integrate with Microsoft Graph API")
+                        
+                        with col2:
+                            if st.button(f"✉️ Generate Email", key=f"email_{applicant['external_id']}"):
+                                st.info("Email generation feature - integrate with email service")
+    
+    with tab3, METRICS.timer('stage_seconds', stage='render', view='statistics'):
         st.header("📈 Statistics")
         
         if not st.session_state.applicants:
@@ -477,10 +676,11 @@ def main():
             applicants = st.session_state.applicants
             
             # Calculate statistics
+            level_counts = applicants.level_counts()
             total_applicants = len(applicants)
-            high_level = len([a for a in applicants if a['overall_level'] == 'High'])
-            mid_level = len([a for a in applicants if a['overall_level'] == 'Mid'])
-            low_level = len([a for a in applicants if a['overall_level'] == 'Low'])
+            high_level = level_counts['High']
+            mid_level = level_counts['Mid']
+            low_level = level_counts['Low']
             
             # Display metrics
             col1, col2, col3, col4 = st.columns(4)
@@ -512,29 +712,33 @@ def main():
             
             with col2:
                 # BMI distribution
-                bmi_data = [a['bmi'] for a in applicants if a['bmi'] > 0]
+                bmi = applicants.table['bmi']
+                bmi_data = bmi[bmi > 0]
                 
                 st.subheader("BMI Distribution")
-                st.histogram(bmi_data, bins=20)
+                # Streamlit has no histogram element; bin the values and draw them as bars
+                if len(bmi_data):
+                    bmi_bins = pd.cut(bmi_data, bins=20).value_counts(sort=False)
+                    bmi_bins.index = [f"{interval.left:.1f}-{interval.right:.1f}" for interval in bmi_bins.index]
+                    st.bar_chart(bmi_bins)
             
             # Export functionality
             st.subheader("📥 Export Data")
             
-            if st.button("📊 Export to Excel"):
-                # Create DataFrame
-                df = pd.DataFrame(applicants)
-                
-                # Convert to Excel
-                buffer = io.BytesIO()
-                df.to_excel(buffer, index=False)
-                buffer.seek(0)
-                
-                st.download_button(
-                    label="📥 Download Excel File",
-                    data=buffer,
-                    file_name=f"applicant_analysis_{datetime.now().strftime('%Y%m%d_%H%M%S')}.xlsx",
-                    mime="application/vnd.ms-excel"
-                )
+            render_export_buttons(
+                applicants.export_table,
+                dataset_version=get_applicants_version(),
+                key="applicants_export"
+            )
+    
+    # Rendered last so the counters include this run's scoring
+    render_cache_stats(score_cache)
+    render_diagnostics()
+    
+    # Poll running jobs; the work itself continues on the job workers regardless
+    if jobs_active:
+        time.sleep(JOB_POLL_INTERVAL)
+        st.rerun()
 
 if __name__ == "__main__":
     main()
\ No newline at end of file
@@ -0,0 +1,97 @@
+import json
+import os
+import sys
+
+import openpyxl
+import pandas as pd
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import blue_agent_cli  # noqa: E402
+from mock_openai_server import MockSettings, start_mock_server  # noqa: E402
+from request_scheduler import RequestScheduler  # noqa: E402
+from workbook_reader import build_applicants  # noqa: E402
+
+INTAKE_HEADERS = [
+    'Name', 'Email', 'Phone', 'Age', 'Height', 'Weight', 'Education', 'Location', 'Skills',
+    'Experience_Years', 'Previous_Roles', 'Certifications'
+]
+
+
+def intake_rows(count: int, start: int = 0) -> list:
+    """Intake-sheet rows (streamlit_app.py schema); every fifth applicant has BMI > 25"""
+    roles = ['Senior Software Engineer', 'Data Analyst', 'Lead Developer', 'Intern', '']
+    return [
+        {
+            'Name': f'Applicant {i}',
+            'Email': f'applicant{i}@example.com',
+            'Phone': f'08{i:08d}',
+            'Age': 22 + i % 30,
+            'Height': 170,
+            'Weight': 90 if i % 5 == 4 else 60,
+            'Education': 'Bachelor' if i % 2 else 'Master',
+            'Location': 'Bangkok',
+            'Skills': 'Python, SQL',
+            'Experience_Years': i % 12,
+            'Previous_Roles': roles[i % len(roles)],
+            'Certifications': 'AWS' if i % 3 == 0 else ''
+        }
+        for i in range(start, start + count)
+    ]
+
+
+def write_workbook(path: str, rows: list) -> str:
+    workbook = openpyxl.Workbook()
+    worksheet = workbook.active
+    worksheet.append(INTAKE_HEADERS)
+    for row in rows:
+        worksheet.append([row.get(header) for header in INTAKE_HEADERS])
+    workbook.save(path)
+    return str(path)
+
+
+def chunks(rows: list, size: int) -> list:
+    """Applicants built from rows in chunks of size, numbered like iter_excel_chunks"""
+    return [build_applicants(rows[start:start + size], start) for start in range(0, len(rows), size)]
+
+
+def score_all(run, applicant_chunks: list) -> list:
+    """Every applicant of a ScoringRun over the chunks, in source order"""
+    return [applicant for chunk in run.scored_chunks(applicant_chunks) for applicant in chunk]
+
+
+def run_cli(capsys, *argv: str):
+    """(exit status, parsed JSON summary) of `blue-agent score ...`"""
+    status = blue_agent_cli.main(['score', *argv])
+    output = capsys.readouterr().out.strip()
+    return status, json.loads(output.splitlines()[-1]) if output else None
+
+
+def read_output(path) -> pd.DataFrame:
+    path = str(path)
+    if path.endswith('.parquet'):
+        return pd.read_parquet(path)
+    if path.endswith('.csv'):
+        return pd.read_csv(path, dtype={'fingerprint': str})
+    return pd.read_json(path, lines=True, dtype={'fingerprint': str})
+
+
+@pytest.fixture
+def workbook(tmp_path) -> str:
+    return write_workbook(tmp_path / 'applicants.xlsx', intake_rows(25))
+
+
+@pytest.fixture
+def scheduler() -> RequestScheduler:
+    """Budgets high enough never to throttle, short backoff"""
+    return RequestScheduler(requests_per_minute=100000, tokens_per_minute=10 ** 9, base_delay=0.01, max_delay=0.05)
+
+
+@pytest.fixture(scope='session')
+def mock_server():
+    """Mock OpenAI API shared by the whole session (instant, error-free responses)"""
+    server = start_mock_server(MockSettings(latency_ms=0, jitter_ms=0, seed=0))
+    yield server
+    server.shutdown()
+    server.server_close()
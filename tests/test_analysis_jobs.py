@@ -0,0 +1,104 @@
+import threading
+import time
+
+from analysis_jobs import JobQueue, JobStore
+from applicant_analyzer import ApplicantAnalyzer, ScoringRun
+from conftest import chunks, intake_rows, score_all
+from scoring_backends import MockBackend
+
+
+def wait_for(store: JobStore, job_id: str, timeout: float = 10.0) -> dict:
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        job = store.get(job_id)
+        if job['status'] not in ('queued', 'running'):
+            return job
+        time.sleep(0.01)
+    raise AssertionError(f'job {job_id} still {job["status"]}')
+
+
+def test_job_results_and_summary_are_persisted(tmp_path):
+    store = JobStore(str(tmp_path / 'jobs'))
+    queue = JobQueue(store)
+    job_id = store.create('upload', 'applicants.xlsx', {'batch_size': 1})
+
+    def run(job):
+        for position in (2, 0, 1):
+            job.add_result(position, {'name': f'Applicant {position}'})
+        job.report(rows_read=3, message='Scored 3 rows')
+        return {'rows': 3}
+
+    assert queue.submit(job_id, run)
+    job = wait_for(store, job_id)
+
+    assert job['status'] == 'completed'
+    assert (job['rows_read'], job['scored_rows']) == (3, 3)
+    assert job['summary'] == {'rows': 3}
+    assert job['options'] == {'batch_size': 1}
+    assert [a['name'] for a in store.results(job_id)] == ['Applicant 0', 'Applicant 1', 'Applicant 2']
+    assert [a['name'] for a in store.results(job_id, limit=1)] == ['Applicant 0']
+
+
+def test_cancelled_jobs_keep_their_partial_results(tmp_path):
+    store = JobStore(str(tmp_path / 'jobs'))
+    queue = JobQueue(store)
+    job_id = store.create('upload', 'applicants.xlsx')
+    started = threading.Event()
+
+    def run(job):
+        job.add_result(0, {'name': 'Applicant 0'})
+        started.set()
+        while True:
+            job.report()
+            time.sleep(0.01)
+
+    queue.submit(job_id, run)
+    started.wait(5)
+    assert queue.cancel(job_id)
+    job = wait_for(store, job_id)
+
+    assert job['status'] == 'cancelled'
+    assert store.load_results(job_id) == {0: {'name': 'Applicant 0'}}
+    assert not queue.is_active(job_id)
+
+
+def test_failed_jobs_record_the_error(tmp_path):
+    store = JobStore(str(tmp_path / 'jobs'))
+    queue = JobQueue(store)
+    job_id = store.create('url', 'https://example.com/book.xlsx')
+
+    def run(job):
+        raise ValueError('bad workbook')
+
+    queue.submit(job_id, run)
+    job = wait_for(store, job_id)
+
+    assert job['status'] == 'failed'
+    assert job['message'] == 'bad workbook'
+    assert 'ValueError' in job['error']
+
+
+def test_running_jobs_are_marked_interrupted_on_restart(tmp_path):
+    store = JobStore(str(tmp_path / 'jobs'))
+    job_id = store.create('upload', 'applicants.xlsx')
+    store.update(job_id, status='running')
+
+    assert JobStore(str(tmp_path / 'jobs')).get(job_id)['status'] == 'interrupted'
+
+
+def test_resumed_rows_are_reused_when_their_fingerprint_matches():
+    applicants = chunks(intake_rows(5), 5)
+    stored = {'overall_level': 'High', 'score_source': 'model', 'scoring_signature': 'mock'}
+    resumed_row = {**applicants[0][0], **stored}
+    stale_row = {**applicants[0][1], **stored, 'fingerprint': 'stale'}
+    fallback_row = {**applicants[0][2], **stored, 'score_source': 'fallback'}
+    other_backend_row = {**applicants[0][3], **stored, 'scoring_signature': 'openai:gpt-4o:full'}
+    run = ScoringRun(ApplicantAnalyzer('', backend=MockBackend()), resumed={
+        0: resumed_row, 1: stale_row, 2: fallback_row, 3: other_backend_row
+    })
+
+    scored = score_all(run, applicants)
+
+    assert scored[0] is resumed_row
+    assert [a['score_source'] for a in scored[1:4]] == ['mock', 'mock', 'mock']
+    assert run.summary()['sources'] == {'model': 1, 'mock': 3, 'rule': 1}
@@ -0,0 +1,64 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from applicant_index import ApplicantIndex
+
+
+@pytest.fixture
+def index() -> ApplicantIndex:
+    return ApplicantIndex(pd.DataFrame({
+        'name': ['Ann Smith', 'Anna Brown', 'Bob Smithers', 'Carol Johnson', None],
+        'email': ['ann@alpha.com', 'anna.b@beta.org', 'bob@smith.org', 'carol.j@alpha.com', 'ghost@beta.org'],
+        'overall_level': ['High', 'Low', 'Mid', 'High', 'Low'],
+    }))
+
+
+def names(index: ApplicantIndex, positions: np.ndarray) -> list:
+    return index.table['name'].iloc[positions].tolist()
+
+
+def test_empty_query_returns_everything(index):
+    assert index.filter().tolist() == [0, 1, 2, 3, 4]
+
+
+def test_level_filter_and_counts(index):
+    assert index.filter(level='High').tolist() == [0, 3]
+    assert index.filter(level='Unknown').tolist() == []
+    assert index.level_counts() == {'High': 2, 'Low': 2, 'Mid': 1}
+
+
+def test_contains_matches_substrings_of_name_or_email(index):
+    assert names(index, index.filter(query='SMITH')) == ['Ann Smith', 'Bob Smithers']
+    assert index.filter(query='alpha.com').tolist() == [0, 3]
+    assert index.filter(query='ghost').tolist() == [4]
+    # Shorter than a trigram: scanned instead of looked up
+    assert index.filter(query='b@').tolist() == [1, 2]
+    assert index.filter(query='zzz').tolist() == []
+
+
+def test_contains_matches_across_words(index):
+    assert names(index, index.filter(query='ann smith')) == ['Ann Smith']
+
+
+def test_contains_combines_with_level(index):
+    assert names(index, index.filter(level='Mid', query='smith')) == ['Bob Smithers']
+
+
+def test_prefix_matches_word_starts_only(index):
+    assert names(index, index.filter(query='ann', mode='Prefix')) == ['Ann Smith', 'Anna Brown']
+    assert index.filter(query='mith', mode='Prefix').tolist() == []
+    # Email words count too
+    assert index.filter(query='beta', mode='Prefix').tolist() == [1, 4]
+
+
+def test_prefix_with_several_words_needs_every_word(index):
+    assert names(index, index.filter(query='ann smi', mode='Prefix')) == ['Ann Smith']
+    assert names(index, index.filter(query='  anna   b ', mode='Prefix')) == ['Anna Brown']
+    assert index.filter(query='ann johnson', mode='Prefix').tolist() == []
+
+
+def test_fuzzy_tolerates_typos_and_ranks_best_first(index):
+    assert names(index, index.filter(query='johnsn', mode='Fuzzy')) == ['Carol Johnson']
+    assert names(index, index.filter(query='smiht', mode='Fuzzy'))[0] == 'Ann Smith'
+    assert index.filter(query='xyzzy', mode='Fuzzy').tolist() == []
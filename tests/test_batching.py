@@ -0,0 +1,45 @@
+from applicant_analyzer import ApplicantAnalyzer, ScoringRun
+from conftest import chunks, intake_rows, score_all
+from score_cache import ScoreCache
+from scoring_backends import MockBackend, OpenAIBackend
+
+
+def test_batches_give_the_same_results_as_single_rows():
+    single = score_all(ScoringRun(ApplicantAnalyzer('', backend=MockBackend())), chunks(intake_rows(23), 23))
+    batched = score_all(
+        ScoringRun(ApplicantAnalyzer('', batch_size=5, backend=MockBackend())), chunks(intake_rows(23), 23)
+    )
+
+    assert [(a['overall_level'], a['info_score']) for a in single] == \
+        [(a['overall_level'], a['info_score']) for a in batched]
+
+
+def test_openai_batches_and_the_score_cache(mock_server, scheduler, tmp_path):
+    cache = ScoreCache(str(tmp_path / 'cache.sqlite3'))
+    backend = OpenAIBackend('test', scheduler=scheduler, base_url=mock_server.base_url, score_cache=cache)
+    analyzer = ApplicantAnalyzer('test', batch_size=4, scheduler=scheduler, backend=backend)
+
+    first = score_all(ScoringRun(analyzer), chunks(intake_rows(10), 10))
+    second = score_all(ScoringRun(analyzer), chunks(intake_rows(10), 10))
+
+    # 8 rows under the BMI limit in batches of 4 rows (3 of them scored) -> 3 requests, then all cached
+    assert backend.get_stats()['calls'] == 3
+    assert [a['info_score'] for a in first] == [a['info_score'] for a in second]
+    assert {a['score_source'] for a in first} == {'model', 'rule'}
+
+
+def test_rows_missing_from_a_batch_response_are_scored_one_by_one(mock_server, scheduler):
+    class ForgetfulBackend(OpenAIBackend):
+        def request_batch_scores(self, payloads):
+            scores = super().request_batch_scores(payloads)
+            return {row_id: value for row_id, value in scores.items() if row_id != '0'}
+
+    backend = ForgetfulBackend('test', scheduler=scheduler, base_url=mock_server.base_url)
+    applicants = chunks(intake_rows(3), 3)[0]
+
+    results = backend.score_many(applicants)
+
+    assert len(results) == 3
+    assert not any(used_fallback for _, _, used_fallback in results)
+    # One batch request, then two single-score requests for the skipped row
+    assert backend.get_stats()['calls'] == 3
@@ -0,0 +1,40 @@
+from applicant_analyzer import ApplicantAnalyzer, ScoringRun
+from conftest import chunks, intake_rows, run_cli, score_all
+from scoring_backends import CascadeBackend, LocalRuleBackend, OpenAIBackend
+
+
+def test_cascade_only_sends_uncertain_rows_to_the_llm(mock_server, scheduler):
+    remote = OpenAIBackend('test', scheduler=scheduler, base_url=mock_server.base_url)
+    backend = CascadeBackend(remote, escalate_below=0.5)
+    run = ScoringRun(ApplicantAnalyzer('test', max_concurrency=4, scheduler=scheduler, backend=backend))
+
+    scored = score_all(run, chunks(intake_rows(40), 40))
+
+    report = run.summary()['cascade']
+    sources = run.summary()['sources']
+    assert report['screened'] == 32
+    assert 0 < report['escalated'] < report['screened']
+    assert sources['model'] == report['escalated']
+    assert sources['local'] == report['screened'] - report['escalated']
+    assert report['calls_per_escalated_row'] == 2
+    assert report['api_calls_saved'] == 2 * sources['local']
+    assert report['seconds_saved'] >= 0
+    assert run.summary()['tokens']['calls'] == 2 * report['escalated']
+    local = LocalRuleBackend()
+    for applicant in scored:
+        if applicant['score_source'] == 'local':
+            scores = local.score(applicant)
+            assert local.confidence(applicant, *scores[:2]) >= 0.5
+
+
+def test_cascade_backend_reports_escalations(capsys, tmp_path, workbook, mock_server):
+    status, summary = run_cli(
+        capsys, workbook, '--out', str(tmp_path / 'scored.jsonl'), '--backend', 'cascade',
+        '--base-url', mock_server.base_url, '--api-key', 'test', '--no-cache', '--rpm', '100000',
+        '--tpm', '100000000', '--escalate-below', '1.01'
+    )
+
+    assert status == 0
+    # Confidence never exceeds 1, so every row goes to the LLM
+    assert summary['cascade']['escalated'] == summary['cascade']['screened'] == 20
+    assert summary['sources'] == {'rule': 5, 'model': 20}
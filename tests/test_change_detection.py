@@ -0,0 +1,150 @@
+from applicant_analyzer import ApplicantAnalyzer, ScoringRun
+from benchmarks.bench_normalize import make_intake_sheet
+from change_detection import ChangeTracker, row_identity
+from conftest import chunks, intake_rows, score_all
+from scoring_backends import LocalRuleBackend, MockBackend
+from workbook_reader import build_applicants
+
+
+def applicant(name: str, email: str, fingerprint: str, **scores) -> dict:
+    return {'name': name, 'email': email, 'fingerprint': fingerprint, **scores}
+
+
+def scored(name: str, email: str, fingerprint: str, level: str = 'High') -> dict:
+    return applicant(name, email, fingerprint, info_score=90, experience_score=85, overall_level=level,
+                     reasoning='Combined score: 87.5%', score_source='model', created_at='2024-01-01T00:00:00')
+
+
+def test_row_identity_prefers_email_and_falls_back_to_name():
+    assert row_identity({'name': 'Ann', 'email': ' Ann@Example.com '}) == 'ann@example.com'
+    assert row_identity({'name': ' Ann ', 'email': 'nan'}) == 'name:ann'
+    assert row_identity({'name': 'Ann'}) == 'name:ann'
+    assert row_identity({'name': 'Ann', 'email': 'applicant1@example.com', 'email_generated': True}) == 'name:ann'
+    assert row_identity({'name': 'Applicant 1', 'email': 'nan', 'name_generated': True}) == 'name:'
+    assert row_identity({'name': float('nan'), 'email': 'nan'}) == 'name:'
+
+
+def test_split_sorts_rows_into_added_changed_and_unchanged():
+    tracker = ChangeTracker([
+        scored('Ann', 'ann@example.com', 'a1'),
+        scored('Bob', 'bob@example.com', 'b1'),
+        scored('Cat', 'cat@example.com', 'c1'),
+    ])
+    current = [
+        applicant('Ann', 'ann@example.com', 'a1'),
+        applicant('Bob', 'bob@example.com', 'b2'),
+        applicant('Dan', 'dan@example.com', 'd1'),
+    ]
+
+    unchanged, to_score = tracker.split(current)
+
+    assert [index for index, _ in unchanged] == [0]
+    assert to_score == [1, 2]
+    carried = unchanged[0][1]
+    assert carried['overall_level'] == 'High'
+    assert carried['created_at'] == '2024-01-01T00:00:00'
+    assert carried['row_key'] == 'ann@example.com#1'
+    assert tracker.summary() == {'added': 1, 'changed': 1, 'unchanged': 1, 'removed': 1}
+
+
+def test_split_tells_duplicate_identities_apart_by_order():
+    tracker = ChangeTracker([
+        scored('Ann', 'shared@example.com', 'x', level='High'),
+        scored('Ann', 'shared@example.com', 'y', level='Low'),
+    ])
+
+    unchanged, to_score = tracker.split([
+        applicant('Ann', 'shared@example.com', 'x'),
+        applicant('Ann', 'shared@example.com', 'z'),
+    ])
+
+    assert [(index, result['overall_level']) for index, result in unchanged] == [(0, 'High')]
+    assert to_score == [1]
+
+
+def test_split_counts_across_chunks():
+    tracker = ChangeTracker([scored('Ann', 'ann@example.com', 'a1'), scored('Bob', 'bob@example.com', 'b1')])
+
+    tracker.split([applicant('Ann', 'ann@example.com', 'a1')])
+    tracker.split([applicant('Bob', 'bob@example.com', 'b1')])
+
+    assert tracker.summary() == {'added': 0, 'changed': 0, 'unchanged': 2, 'removed': 0}
+
+
+def test_previous_rows_without_a_result_are_rescored():
+    tracker = ChangeTracker([applicant('Ann', 'ann@example.com', 'a1')])
+
+    unchanged, to_score = tracker.split([applicant('Ann', 'ann@example.com', 'a1')])
+
+    assert unchanged == []
+    assert to_score == [0]
+    assert tracker.counts['changed'] == 1
+
+
+def test_fingerprints_ignore_position_but_follow_content():
+    rows = make_intake_sheet(20, seed=5).to_dict('records')
+
+    whole = build_applicants(rows)
+    second_half = build_applicants(rows[10:], start_index=10)
+
+    assert [a['external_id'] for a in second_half] == [a['external_id'] for a in whole[10:]]
+    assert [a['fingerprint'] for a in second_half] == [a['fingerprint'] for a in whole[10:]]
+    edited = build_applicants([{**rows[0], 'Skills': 'Rust'}])[0]
+    assert edited['fingerprint'] != whole[0]['fingerprint']
+
+
+def test_fingerprints_do_not_depend_on_chunking_when_cells_are_blank():
+    rows = intake_rows(12)
+    for position, row in enumerate(rows):
+        # Numeric phones and certification codes, blank in the last row of every six
+        row['Phone'] = float('nan') if position % 6 == 5 else 812345670 + position
+        row['Certifications'] = float('nan') if position % 6 == 5 else 2024
+
+    by_three = [a for chunk in chunks(rows, 3) for a in chunk]
+    by_six = [a for chunk in chunks(rows, 6) for a in chunk]
+
+    assert [a['fingerprint'] for a in by_three] == [a['fingerprint'] for a in by_six]
+    assert [a['phone'] for a in by_three] == [a['phone'] for a in by_six]
+    assert by_six[0]['phone'] == '812345670'
+    assert by_six[5]['phone'] == 'nan'
+
+
+def test_rerun_only_scores_inserted_and_changed_rows():
+    backend = MockBackend()
+    first = score_all(ScoringRun(ApplicantAnalyzer('', backend=backend)), chunks(intake_rows(10), 10))
+
+    rows = intake_rows(11)
+    rows[2]['Skills'] = 'Rust'
+    del rows[7]
+    calls = []
+    original_score = backend.score
+    backend.score = lambda applicant: calls.append(applicant['name']) or original_score(applicant)
+    run = ScoringRun(ApplicantAnalyzer('', backend=backend), previous_applicants=first)
+    scored = score_all(run, chunks(rows, 4))
+
+    assert sorted(calls) == ['Applicant 10', 'Applicant 2']
+    assert run.summary()['changes'] == {'added': 1, 'changed': 1, 'unchanged': 8, 'removed': 1}
+    assert scored[0]['created_at'] == first[0]['created_at']
+    assert len(scored) == 10
+
+
+def test_fallback_results_are_rescored():
+    first = score_all(ScoringRun(ApplicantAnalyzer('', backend=MockBackend())), chunks(intake_rows(5), 5))
+    first[1] = {**first[1], 'score_source': 'fallback'}
+
+    run = ScoringRun(ApplicantAnalyzer('', backend=MockBackend()), previous_applicants=first)
+    scored = score_all(run, chunks(intake_rows(5), 5))
+
+    assert run.summary()['changes'] == {'added': 0, 'changed': 1, 'unchanged': 4, 'removed': 0}
+    assert scored[1]['score_source'] == 'mock'
+
+
+def test_results_of_another_backend_are_rescored():
+    first = score_all(ScoringRun(ApplicantAnalyzer('', backend=MockBackend())), chunks(intake_rows(5), 5))
+    assert {a['scoring_signature'] for a in first} == {'mock'}
+
+    run = ScoringRun(ApplicantAnalyzer('', backend=LocalRuleBackend()), previous_applicants=first)
+    scored = score_all(run, chunks(intake_rows(5), 5))
+
+    assert run.summary()['changes'] == {'added': 0, 'changed': 5, 'unchanged': 0, 'removed': 0}
+    assert {a['scoring_signature'] for a in scored} == {LocalRuleBackend().signature()}
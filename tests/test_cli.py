@@ -0,0 +1,101 @@
+import functools
+import json
+import os
+
+import pytest
+
+import blue_agent_cli
+from conftest import intake_rows, read_output, run_cli, write_workbook
+from mock_openai_server import MockSettings, start_mock_server
+from request_scheduler import RequestScheduler
+
+
+@pytest.mark.parametrize('extension', ['csv', 'jsonl', 'parquet'])
+def test_local_backend_writes_every_row(capsys, tmp_path, workbook, extension):
+    out = tmp_path / f'scored.{extension}'
+
+    status, summary = run_cli(
+        capsys, workbook, '--out', str(out), '--backend', 'local', '--no-cache', '--chunk-size', '10'
+    )
+
+    assert status == 0
+    assert summary['rows'] == 25
+    assert summary['sources'] == {'rule': 5, 'local': 20}
+    table = read_output(out)
+    assert table.columns.tolist() == blue_agent_cli.OUTPUT_COLUMNS
+    assert table['external_id'].tolist() == [f'EXT_{i}' for i in range(1, 26)]
+    assert set(table['overall_level']) <= {'High', 'Mid', 'Low'}
+
+
+def test_previous_output_is_reused(capsys, tmp_path, workbook):
+    first = tmp_path / 'first.csv'
+    run_cli(capsys, workbook, '--out', str(first), '--backend', 'mock', '--no-cache')
+
+    rows = intake_rows(26)
+    rows[3]['Skills'] = 'Go'
+    edited = write_workbook(tmp_path / 'edited.xlsx', rows)
+    status, summary = run_cli(
+        capsys, edited, '--out', str(tmp_path / 'second.csv'), '--backend', 'mock', '--no-cache',
+        '--previous', str(first)
+    )
+
+    assert status == 0
+    assert summary['changes'] == {'added': 1, 'changed': 1, 'unchanged': 24, 'removed': 0}
+    before = read_output(first)
+    after = read_output(tmp_path / 'second.csv')
+    assert after['created_at'][0] == before['created_at'][0]
+    assert set(after['scoring_signature']) == {'mock'}
+    assert len(after) == 26
+
+    # A different backend rescores every row
+    status, summary = run_cli(
+        capsys, edited, '--out', str(tmp_path / 'third.csv'), '--backend', 'local', '--no-cache',
+        '--previous', str(tmp_path / 'second.csv')
+    )
+    assert summary['changes'] == {'added': 0, 'changed': 26, 'unchanged': 0, 'removed': 0}
+
+
+def test_openai_backend_against_the_mock_server(capsys, tmp_path, workbook, mock_server):
+    metrics = tmp_path / 'metrics.json'
+
+    status, summary = run_cli(
+        capsys, workbook, '--out', str(tmp_path / 'scored.csv'), '--base-url', mock_server.base_url,
+        '--api-key', 'test', '--cache', str(tmp_path / 'cache.sqlite3'), '--rpm', '100000', '--tpm', '100000000',
+        '--prompt-mode', 'compact', '--metrics', str(metrics), '--fail-on-fallback'
+    )
+
+    assert status == 0
+    assert summary['sources'] == {'rule': 5, 'model': 20}
+    assert summary['tokens']['calls'] == 40
+    assert summary['scheduler']['failures'] == 0
+    exported = json.loads(metrics.read_text())
+    assert any(counter['name'] == 'rows_scored_total' for counter in exported['counters'])
+
+
+def test_missing_api_key_is_an_error(capsys, tmp_path, workbook, monkeypatch):
+    monkeypatch.delenv('OPENAI_API_KEY', raising=False)
+
+    status, summary = run_cli(capsys, workbook, '--out', str(tmp_path / 'scored.csv'))
+
+    assert status == 2
+    assert summary is None
+    assert not os.path.exists(tmp_path / 'scored.csv')
+
+
+def test_fail_on_fallback(capsys, tmp_path, workbook, monkeypatch):
+    # Give up after one quick retry instead of the default backoff schedule
+    monkeypatch.setattr(blue_agent_cli, 'RequestScheduler', functools.partial(
+        RequestScheduler, max_retries=1, base_delay=0.01, max_delay=0.01
+    ))
+    server = start_mock_server(MockSettings(latency_ms=0, jitter_ms=0, error_rate=1.0))
+    try:
+        status, summary = run_cli(
+            capsys, workbook, '--out', str(tmp_path / 'scored.csv'), '--base-url', server.base_url,
+            '--api-key', 'test', '--no-cache', '--fail-on-fallback', '--rpm', '100000', '--tpm', '100000000'
+        )
+    finally:
+        server.shutdown()
+        server.server_close()
+
+    assert status == 1
+    assert summary['sources']['fallback'] == 20
@@ -0,0 +1,41 @@
+import time
+
+from applicant_analyzer import ApplicantAnalyzer
+from conftest import chunks, intake_rows
+from mock_openai_server import MockSettings, start_mock_server
+from scoring_backends import MockBackend, OpenAIBackend
+
+
+def test_applicants_are_scored_concurrently():
+    analyzer = ApplicantAnalyzer('', max_concurrency=8, backend=MockBackend(latency=0.05))
+    applicants = chunks(intake_rows(20), 20)[0]
+
+    started = time.perf_counter()
+    results = dict(analyzer.score_applicants(applicants))
+    elapsed = time.perf_counter() - started
+
+    assert sorted(results) == list(range(20))
+    # 16 backend calls of 50 ms take 0.8 s one at a time, ~0.1 s over 8 workers
+    assert elapsed < 0.5
+
+
+def test_both_prompts_of_an_applicant_run_in_parallel_on_one_shared_pool(scheduler):
+    server = start_mock_server(MockSettings(latency_ms=200, jitter_ms=0))
+    try:
+        backend = OpenAIBackend('test', scheduler=scheduler, base_url=server.base_url)
+        applicant = chunks(intake_rows(1), 1)[0][0]
+        pool = backend._prompt_executor
+
+        started = time.perf_counter()
+        info_score, experience_score, used_fallback = backend.score(applicant)
+        elapsed = time.perf_counter() - started
+        backend.score(applicant)
+
+        assert not used_fallback
+        assert 30 <= info_score <= 100 and 30 <= experience_score <= 100
+        assert elapsed < 0.39
+        assert backend._prompt_executor is pool
+        assert server.stats['ok'] == 4
+    finally:
+        server.shutdown()
+        server.server_close()
@@ -0,0 +1,97 @@
+import os
+import time
+
+from http_fetch import ConditionalFetcher
+
+
+class FakeResponse:
+    def __init__(self, status_code: int, body: bytes = b'', headers: dict = None):
+        self.status_code = status_code
+        self.body = body
+        self.headers = headers or {}
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+    def raise_for_status(self):
+        pass
+
+    def iter_content(self, chunk_size: int):
+        for start in range(0, len(self.body), chunk_size):
+            yield self.body[start:start + chunk_size]
+
+
+class FakeSession:
+    """Serves fixed bodies with an ETag and answers 304 to a matching If-None-Match"""
+
+    def __init__(self, files: dict):
+        self.files = files
+        self.requests = []
+
+    def get(self, url, headers=None, timeout=None, stream=False):
+        self.requests.append(url)
+        etag = f'"{url}"'
+        if (headers or {}).get('If-None-Match') == etag:
+            return FakeResponse(304)
+        body = self.files[url]
+        return FakeResponse(200, body, {'ETag': etag, 'Content-Length': str(len(body))})
+
+
+def blobs(directory) -> int:
+    return sum(1 for name in os.listdir(directory) if name.endswith('.blob'))
+
+
+def test_unchanged_files_are_served_from_the_blob_cache(tmp_path):
+    fetcher = ConditionalFetcher(str(tmp_path), session=FakeSession({'a': b'x' * 10}))
+
+    assert fetcher.fetch('a') == b'x' * 10
+    assert fetcher.fetch('a') == b'x' * 10
+    assert (fetcher.stats['downloaded'], fetcher.stats['not_modified']) == (1, 1)
+
+
+def test_least_recently_used_blobs_are_evicted_over_the_size_cap(tmp_path):
+    session = FakeSession({name: b'x' * 100 for name in 'abcd'})
+    fetcher = ConditionalFetcher(str(tmp_path), session=session, max_cache_bytes=300)
+
+    for name in 'abc':
+        fetcher.fetch(name)
+    # 'a' is revalidated, so 'b' becomes the least recently used blob
+    old = time.time() - 60
+    for name, offset in (('a', 3), ('b', 1), ('c', 2)):
+        blob_path = fetcher._paths(name)[0]
+        os.utime(blob_path, (old + offset, old + offset))
+    fetcher.fetch('a')
+    fetcher.fetch('d')
+
+    # 400 bytes > 300: trimmed to at most 270 bytes, newest first
+    assert blobs(tmp_path) == 2
+    assert fetcher.stats['evicted'] == 2
+    assert not os.path.exists(fetcher._paths('b')[1])
+    assert os.path.exists(fetcher._paths('a')[0]) and os.path.exists(fetcher._paths('d')[0])
+
+
+def test_a_blob_larger_than_the_cap_is_still_returned(tmp_path):
+    fetcher = ConditionalFetcher(str(tmp_path), session=FakeSession({'big': b'x' * 500}), max_cache_bytes=100)
+
+    assert fetcher.fetch('big') == b'x' * 500
+    fetcher.evict()
+    assert blobs(tmp_path) == 0
+
+
+def test_expired_blobs_are_dropped_on_startup(tmp_path):
+    session = FakeSession({'a': b'x', 'b': b'y'})
+    fetcher = ConditionalFetcher(str(tmp_path), session=session, max_age_seconds=3600)
+    fetcher.fetch('a')
+    fetcher.fetch('b')
+    stale = time.time() - 7200
+    os.utime(fetcher._paths('a')[0], (stale, stale))
+
+    ConditionalFetcher(str(tmp_path), session=session, max_age_seconds=3600)
+
+    assert not os.path.exists(fetcher._paths('a')[0])
+    assert os.path.exists(fetcher._paths('b')[0])
+    fetcher.fetch('a')
+    assert session.requests.count('a') == 2 and fetcher.stats['downloaded'] == 3
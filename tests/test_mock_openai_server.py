@@ -0,0 +1,90 @@
+import json
+import urllib.error
+import urllib.request
+
+import pytest
+
+from mock_openai_server import MockSettings, prompt_score, start_mock_server
+
+
+def post(server, path: str, body: dict):
+    request = urllib.request.Request(
+        server.base_url.rsplit('/v1', 1)[0] + path, data=json.dumps(body).encode('utf-8'),
+        headers={'Content-Type': 'application/json'}
+    )
+    with urllib.request.urlopen(request, timeout=5) as response:
+        return json.loads(response.read())
+
+
+def get_stats(server) -> dict:
+    with urllib.request.urlopen(server.base_url.rsplit('/v1', 1)[0] + '/stats', timeout=5) as response:
+        return json.loads(response.read())
+
+
+@pytest.fixture
+def server():
+    def start(**settings):
+        started.append(start_mock_server(MockSettings(latency_ms=0, jitter_ms=0, seed=0, **settings)))
+        return started[-1]
+
+    started = []
+    yield start
+    for instance in started:
+        instance.shutdown()
+        instance.server_close()
+
+
+def test_single_prompts_get_a_repeatable_score_and_usage(server):
+    mock = server()
+    body = {'model': 'gpt-4o', 'messages': [{'role': 'user', 'content': 'Rate this applicant'}]}
+
+    first = post(mock, '/v1/chat/completions', body)
+    second = post(mock, '/v1/chat/completions', body)
+
+    assert first['choices'][0]['message']['content'] == str(prompt_score('Rate this applicant'))
+    assert second['choices'][0]['message']['content'] == first['choices'][0]['message']['content']
+    assert first['usage']['total_tokens'] == first['usage']['prompt_tokens'] + first['usage']['completion_tokens']
+    assert get_stats(mock) == {'requests': 2, 'ok': 2, 'errors': 0, 'rate_limited': 0}
+
+
+def test_batched_prompts_get_one_result_per_applicant_id(server):
+    mock = server()
+    prompt = '\n'.join(json.dumps({'id': row_id, 'applicant': {'name': row_id}}) for row_id in ('3', '7'))
+    body = {'messages': [{'role': 'user', 'content': prompt}], 'response_format': {'type': 'json_object'}}
+
+    results = json.loads(post(mock, '/v1/chat/completions', body)['choices'][0]['message']['content'])['results']
+
+    assert [result['id'] for result in results] == ['3', '7']
+    assert all(30 <= result['info_score'] <= 100 for result in results)
+
+
+def test_rate_limited_requests_carry_retry_after(server):
+    mock = server(rate_limit_rate=1.0, retry_after=2.5)
+
+    with pytest.raises(urllib.error.HTTPError) as error:
+        post(mock, '/v1/chat/completions', {'messages': []})
+
+    assert error.value.code == 429
+    assert error.value.headers['Retry-After'] == '2.5'
+    assert error.value.headers['retry-after-ms'] == '2500'
+    assert get_stats(mock)['rate_limited'] == 1
+
+
+def test_the_rpm_budget_answers_429_once_spent(server):
+    mock = server(rpm=2)
+
+    post(mock, '/v1/chat/completions', {'messages': []})
+    post(mock, '/v1/chat/completions', {'messages': []})
+    with pytest.raises(urllib.error.HTTPError) as error:
+        post(mock, '/v1/chat/completions', {'messages': []})
+
+    assert error.value.code == 429
+
+
+def test_unknown_paths_are_not_found(server):
+    mock = server()
+
+    with pytest.raises(urllib.error.HTTPError) as error:
+        post(mock, '/v1/embeddings', {})
+
+    assert error.value.code == 404
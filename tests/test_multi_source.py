@@ -0,0 +1,78 @@
+import json
+
+import openpyxl
+
+import multi_source
+from change_detection import row_identity
+from conftest import intake_rows, read_output, run_cli, write_workbook
+from multi_source import discover_sources, merge_applicants, parse_source
+
+
+def write_sheet(path, headers: list, rows: list) -> str:
+    workbook = openpyxl.Workbook()
+    workbook.active.append(headers)
+    for row in rows:
+        workbook.active.append(row)
+    workbook.save(path)
+    return str(path)
+
+
+def test_several_inputs_are_merged_with_provenance(capsys, tmp_path):
+    folder = tmp_path / 'postings'
+    folder.mkdir()
+    write_workbook(folder / 'a.xlsx', intake_rows(10))
+    write_workbook(folder / 'b.xlsx', intake_rows(10, start=5))
+    out = tmp_path / 'merged.csv'
+
+    status, summary = run_cli(
+        capsys, str(folder), '--out', str(out), '--backend', 'local', '--no-cache', '--processes', '1'
+    )
+
+    assert status == 0
+    assert summary['ingest'] == {'files': 2, 'sheets': 2, 'rows': 20, 'applicants': 15, 'duplicates': 5}
+    table = read_output(out)
+    # Applicants 5-9 appear in both workbooks and are kept once
+    assert len(table) == 15
+    assert set(table['source_file']) == {'a.xlsx', 'b.xlsx'}
+    shared = table[table['email'] == 'applicant7@example.com'].iloc[0]
+    assert [location['file'] for location in json.loads(shared['provenance'])] == ['a.xlsx', 'b.xlsx']
+
+
+def test_placeholder_emails_do_not_merge_different_people(tmp_path):
+    # Neither workbook has an Email column, so both number their placeholders from 1
+    write_sheet(tmp_path / 'a.xlsx', ['Name', 'Age'], [['Ann', 30], ['Bob', 41]])
+    write_sheet(tmp_path / 'b.xlsx', ['Name', 'Age'], [['Cat', 25], ['Ann', 30]])
+
+    parsed = [parse_source(source) for source in discover_sources([str(tmp_path)])]
+    assert [a['email'] for a in parsed[1]] == ['applicant1@example.com', 'applicant2@example.com']
+    merged, stats = merge_applicants(parsed)
+
+    # Without real emails, applicants are matched on their name
+    assert [a['name'] for a in merged] == ['Ann', 'Bob', 'Cat']
+    assert stats == {'rows': 4, 'applicants': 3, 'duplicates': 1}
+    assert [location['file'] for location in merged[0]['provenance']] == ['a.xlsx', 'b.xlsx']
+
+
+def test_rows_without_email_or_name_columns_are_never_merged(tmp_path, monkeypatch):
+    # Placeholders restart with every parse buffer; a long sheet must not fold onto itself
+    monkeypatch.setattr(multi_source, 'PARSE_CHUNK_SIZE', 4)
+    write_sheet(tmp_path / 'a.xlsx', ['Age', 'Skills'], [[20 + i, 'Python'] for i in range(10)])
+    write_sheet(tmp_path / 'b.xlsx', ['Age', 'Skills'], [[20 + i, 'SQL'] for i in range(3)])
+
+    parsed = [parse_source(source) for source in discover_sources([str(tmp_path)])]
+    assert [a['email'] for a in parsed[0]].count('applicant1@example.com') == 3
+    merged, stats = merge_applicants(parsed)
+
+    assert stats == {'rows': 13, 'applicants': 13, 'duplicates': 0}
+    assert [a['source_row'] for a in merged[:10]] == list(range(2, 12))
+    assert {row_identity(a) for a in merged} == {'name:'}
+
+
+def test_a_sheet_longer_than_a_parse_buffer_keeps_every_row(tmp_path):
+    rows = multi_source.PARSE_CHUNK_SIZE + 3
+    path = write_sheet(tmp_path / 'long.xlsx', ['Name', 'Age'], [[f'Person {i}', 30] for i in range(rows)])
+
+    merged, stats = merge_applicants([parse_source({'kind': 'file', 'path': path, 'label': 'long.xlsx'})])
+
+    assert stats == {'rows': rows, 'applicants': rows, 'duplicates': 0}
+    assert merged[-1]['source_row'] == rows + 1
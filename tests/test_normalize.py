@@ -0,0 +1,54 @@
+import math
+
+import pandas as pd
+
+from applicant_normalize import derive_applicant_levels
+from benchmarks.bench_normalize import legacy_derive, legacy_parse, make_demo_sheet, make_intake_sheet
+from workbook_reader import build_applicants
+
+COMPARED_FIELDS = ['external_id', 'name', 'email', 'phone', 'age', 'height', 'weight', 'bmi']
+
+
+def same(left, right) -> bool:
+    if isinstance(left, float) and isinstance(right, float) and math.isnan(left) and math.isnan(right):
+        return True
+    return left == right
+
+
+def assert_same_applicants(columnar: list, legacy: list):
+    assert len(columnar) == len(legacy)
+    for new, old in zip(columnar, legacy):
+        for field in COMPARED_FIELDS:
+            assert same(new[field], old[field]), (field, new[field], old[field])
+        for group in ('basic_info', 'experience'):
+            for field, value in old[group].items():
+                assert same(new[group][field], value), (group, field, new[group][field], value)
+
+
+def test_columnar_parse_matches_the_per_row_parse():
+    # Blank heights, 'n/a' weights and missing education exercise the NaN/None paths
+    sheet = make_intake_sheet(500, seed=3)
+
+    assert_same_applicants(build_applicants(sheet.to_dict('records')), legacy_parse(sheet))
+
+
+def test_columnar_parse_matches_with_missing_columns():
+    sheet = make_intake_sheet(50, seed=4).drop(columns=['Name', 'Email', 'Phone', 'Height', 'Experience_Years'])
+
+    applicants = build_applicants(sheet.to_dict('records'))
+
+    assert_same_applicants(applicants, legacy_parse(sheet))
+    assert applicants[0]['name'] == 'Applicant 1'
+    assert applicants[0]['email'] == 'applicant1@example.com'
+    assert all(applicant['bmi'] == 0 for applicant in applicants)
+
+
+def test_derived_levels_match_the_per_row_apply():
+    data = make_demo_sheet(1000, seed=6)
+
+    columnar = derive_applicant_levels(data)
+    legacy = legacy_derive(data)
+
+    pd.testing.assert_series_equal(columnar['BMI'], legacy['BMI'])
+    assert columnar['Experience_Level'].tolist() == legacy['Experience_Level'].tolist()
+    assert columnar['Final_Level'].tolist() == legacy['Final_Level'].tolist()
@@ -0,0 +1,147 @@
+from datetime import datetime, timedelta, timezone
+from email.utils import format_datetime
+
+import openai
+import pytest
+
+import request_scheduler as request_scheduler_module
+from mock_openai_server import MockSettings, start_mock_server
+from request_scheduler import RequestScheduler, get_retry_after, is_retryable
+
+
+class APIError(Exception):
+    def __init__(self, status_code: int, headers=None):
+        super().__init__(f'HTTP {status_code}')
+        self.status_code = status_code
+        self.headers = headers or {}
+
+
+@pytest.fixture
+def sleeps(monkeypatch) -> list:
+    """Seconds the scheduler slept; sleeping advances a fake monotonic clock instead of waiting"""
+    recorded = []
+    clock = [1000.0]
+
+    def sleep(seconds: float):
+        recorded.append(seconds)
+        clock[0] += seconds
+
+    monkeypatch.setattr(request_scheduler_module.time, 'sleep', sleep)
+    monkeypatch.setattr(request_scheduler_module.time, 'monotonic', lambda: clock[0])
+    return recorded
+
+
+def failing(errors: list, result: str = 'ok'):
+    """Request that raises the given errors in order, then returns result"""
+    calls = []
+
+    def request():
+        calls.append(1)
+        if errors:
+            raise errors.pop(0)
+        return result
+
+    request.calls = calls
+    return request
+
+
+def test_transient_errors_are_retried_until_success(sleeps):
+    scheduler = RequestScheduler(base_delay=1.0, max_delay=60.0)
+    request = failing([APIError(500), APIError(503), TimeoutError()])
+
+    assert scheduler.run(request) == 'ok'
+
+    assert len(request.calls) == 4
+    assert len(sleeps) == 3
+    # Full jitter: attempt n waits at most base_delay * 2**n
+    assert all(0 <= delay <= 2 ** attempt for attempt, delay in enumerate(sleeps))
+    stats = scheduler.get_stats()
+    assert stats['requests'] == 4
+    assert stats['retries'] == 3
+    assert stats['failures'] == 0
+
+
+def test_permanent_errors_are_not_retried(sleeps):
+    scheduler = RequestScheduler()
+    request = failing([APIError(400)])
+
+    with pytest.raises(APIError):
+        scheduler.run(request)
+
+    assert len(request.calls) == 1
+    assert sleeps == []
+    assert scheduler.get_stats()['failures'] == 1
+
+
+def test_gives_up_after_max_retries(sleeps):
+    scheduler = RequestScheduler(max_retries=2)
+    request = failing([APIError(502)] * 5)
+
+    with pytest.raises(APIError):
+        scheduler.run(request)
+
+    assert len(request.calls) == 3
+    assert scheduler.get_stats()['retries'] == 2
+    assert scheduler.get_stats()['failures'] == 1
+
+
+def test_backoff_delay_is_capped_and_never_shorter_than_retry_after():
+    scheduler = RequestScheduler(base_delay=1.0, max_delay=5.0)
+
+    assert all(0 <= scheduler.backoff_delay(10) <= 5.0 for _ in range(100))
+    assert all(7.0 <= scheduler.backoff_delay(0, retry_after=7.0) <= 8.0 for _ in range(100))
+
+
+def test_retry_after_sets_the_wait_and_counts_a_rate_limit(sleeps):
+    scheduler = RequestScheduler(base_delay=0.5)
+    request = failing([APIError(429, {'Retry-After': '3'})])
+
+    assert scheduler.run(request) == 'ok'
+
+    assert 3.0 <= sleeps[0] <= 3.5
+    # The pause applies to every worker, so the retry waits for nothing more
+    assert len(sleeps) == 1
+    assert scheduler.get_stats()['rate_limited'] == 1
+
+
+def test_get_retry_after_header_forms():
+    assert get_retry_after(APIError(429, {'retry-after-ms': '1500', 'retry-after': '9'})) == 1.5
+    assert get_retry_after(APIError(429, {'Retry-After': '2'})) == 2.0
+
+    in_ten_seconds = format_datetime(datetime.now(timezone.utc) + timedelta(seconds=10), usegmt=True)
+    assert 8 <= get_retry_after(APIError(429, {'Retry-After': in_ten_seconds})) <= 10
+
+    assert get_retry_after(APIError(429)) is None
+    assert get_retry_after(APIError(429, {'Retry-After': 'soon'})) is None
+
+
+def test_is_retryable():
+    assert is_retryable(APIError(429))
+    assert is_retryable(APIError(504))
+    assert is_retryable(ConnectionError())
+    assert not is_retryable(APIError(401))
+    assert not is_retryable(ValueError())
+
+
+def test_openai_rate_limits_are_retried_end_to_end():
+    server = start_mock_server(MockSettings(latency_ms=0, jitter_ms=0, rate_limit_rate=0.5, retry_after=0.01, seed=1))
+    try:
+        client = openai.OpenAI(api_key='test', base_url=server.base_url, max_retries=0)
+        scheduler = RequestScheduler(
+            requests_per_minute=100000, tokens_per_minute=10 ** 9, max_retries=20, base_delay=0.01, max_delay=0.05
+        )
+
+        for _ in range(10):
+            response = scheduler.run(
+                lambda: client.chat.completions.create(
+                    model='gpt-4o', messages=[{'role': 'user', 'content': 'Rate: 0-100'}], max_tokens=10
+                )
+            )
+            assert 30 <= float(response.choices[0].message.content) <= 100
+
+        stats = scheduler.get_stats()
+        assert stats['rate_limited'] == server.stats['rate_limited'] > 0
+        assert stats['failures'] == 0
+    finally:
+        server.shutdown()
+        server.server_close()
@@ -0,0 +1,129 @@
+import pytest
+
+import score_cache as score_cache_module
+from score_cache import ScoreCache
+
+
+class Clock:
+    def __init__(self, now: float = 1_000_000.0):
+        self.now = now
+
+    def __call__(self) -> float:
+        return self.now
+
+
+@pytest.fixture
+def clock(monkeypatch) -> Clock:
+    clock = Clock()
+    monkeypatch.setattr(score_cache_module.time, 'time', clock)
+    return clock
+
+
+def test_round_trip_is_keyed_by_model_and_prompt(tmp_path):
+    cache = ScoreCache(str(tmp_path / 'cache.sqlite3'))
+
+    cache.set('gpt-4o', 'prompt', '87')
+
+    assert cache.get('gpt-4o', 'prompt') == '87'
+    assert cache.get('gpt-4o-mini', 'prompt') is None
+    assert cache.get('gpt-4o', 'other prompt') is None
+    assert cache.get_stats() == {'hits': 1, 'misses': 2, 'hit_rate': 1 / 3, 'entries': 1}
+
+
+def test_overwriting_a_key_keeps_one_entry(tmp_path):
+    cache = ScoreCache(str(tmp_path / 'cache.sqlite3'))
+
+    cache.set('gpt-4o', 'prompt', '50')
+    cache.set('gpt-4o', 'prompt', '60')
+
+    assert cache.get('gpt-4o', 'prompt') == '60'
+    assert cache.get_stats()['entries'] == 1
+
+
+def test_entries_expire_after_the_ttl(tmp_path, clock):
+    cache = ScoreCache(str(tmp_path / 'cache.sqlite3'), ttl_seconds=60)
+    cache.set('gpt-4o', 'old', '1')
+    clock.now += 30
+    cache.set('gpt-4o', 'new', '2')
+
+    clock.now += 45
+
+    assert cache.get('gpt-4o', 'old') is None
+    assert cache.get('gpt-4o', 'new') == '2'
+    assert cache.get_stats()['entries'] == 1
+
+
+def test_expired_entries_are_purged_on_open(tmp_path, clock):
+    path = str(tmp_path / 'cache.sqlite3')
+    cache = ScoreCache(path, ttl_seconds=60)
+    for i in range(3):
+        cache.set('gpt-4o', str(i), 'v')
+
+    clock.now += 120
+
+    assert ScoreCache(path, ttl_seconds=60).get_stats()['entries'] == 0
+
+
+def test_least_recently_used_entries_are_evicted(tmp_path, clock):
+    cache = ScoreCache(str(tmp_path / 'cache.sqlite3'), max_entries=10)
+    for i in range(10):
+        clock.now += 1
+        cache.set('gpt-4o', str(i), 'v')
+
+    # Reading the two oldest entries makes them the most recently used
+    clock.now += 1
+    assert cache.get('gpt-4o', '0') == 'v'
+    assert cache.get('gpt-4o', '1') == 'v'
+    clock.now += 1
+    cache.set('gpt-4o', 'new', 'v')
+
+    # Trimmed to EVICT_TO of the limit: the two least recently used survivors are gone
+    assert cache.get_stats()['entries'] == 9
+    assert cache.get('gpt-4o', '0') == 'v'
+    assert cache.get('gpt-4o', '1') == 'v'
+    assert cache.get('gpt-4o', 'new') == 'v'
+    assert cache.get('gpt-4o', '2') is None
+    assert cache.get('gpt-4o', '3') is None
+    assert cache.get('gpt-4o', '4') == 'v'
+
+
+def test_eviction_runs_once_per_batch_of_inserts(tmp_path, clock):
+    cache = ScoreCache(str(tmp_path / 'cache.sqlite3'), max_entries=100)
+    for i in range(101):
+        clock.now += 1
+        cache.set('gpt-4o', str(i), 'v')
+    assert cache.get_stats()['entries'] == 90
+
+    for i in range(101, 111):
+        cache.set('gpt-4o', str(i), 'v')
+    assert cache.get_stats()['entries'] == 100
+
+
+def test_flushed_access_times_and_entries_survive_reopening(tmp_path, clock):
+    path = str(tmp_path / 'cache.sqlite3')
+    cache = ScoreCache(path, max_entries=3)
+    for i in range(3):
+        clock.now += 1
+        cache.set('gpt-4o', str(i), 'v')
+    clock.now += 1
+    cache.get('gpt-4o', '0')
+    cache.flush()
+
+    reopened = ScoreCache(path, max_entries=3)
+    assert reopened.get_stats()['entries'] == 3
+    clock.now += 1
+    reopened.set('gpt-4o', 'new', 'v')
+
+    assert reopened.get('gpt-4o', '0') == 'v'
+    assert reopened.get('gpt-4o', '1') is None
+
+
+def test_clear_resets_entries_and_counters(tmp_path):
+    cache = ScoreCache(str(tmp_path / 'cache.sqlite3'))
+    cache.set('gpt-4o', 'prompt', '1')
+    cache.get('gpt-4o', 'prompt')
+
+    cache.clear()
+
+    assert cache.get_stats() == {'hits': 0, 'misses': 0, 'hit_rate': 0.0, 'entries': 0}
+    assert cache.get('gpt-4o', 'prompt') is None
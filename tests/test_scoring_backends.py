@@ -0,0 +1,63 @@
+import itertools
+
+import pandas as pd
+
+from applicant_analyzer import ApplicantAnalyzer, ScoringRun
+from applicant_normalize import experience_levels
+from conftest import chunks, intake_rows, score_all
+from mock_openai_server import MockSettings, start_mock_server
+from scoring_backends import LocalRuleBackend, OpenAIBackend
+
+
+def test_local_backend_is_deterministic():
+    first = score_all(ScoringRun(ApplicantAnalyzer('', backend=LocalRuleBackend())), chunks(intake_rows(20), 7))
+    second = score_all(ScoringRun(ApplicantAnalyzer('', backend=LocalRuleBackend())), chunks(intake_rows(20), 20))
+
+    assert [(a['info_score'], a['experience_score']) for a in first] == \
+        [(a['info_score'], a['experience_score']) for a in second]
+    assert {a['score_source'] for a in first} == {'local', 'rule'}
+
+
+def test_local_experience_bands_follow_experience_levels():
+    backend = LocalRuleBackend()
+    cases = list(itertools.product(
+        [0, 1, 2, 4, 5, 8, 20], ['Senior Software Engineer', 'Lead Developer', 'Data Analyst', 'Intern', ''], ['', 'AWS']
+    ))
+    expected = experience_levels(
+        pd.Series([roles for _, roles, _ in cases]), pd.Series([years for years, _, _ in cases]), backend.matcher
+    )
+
+    for (years, roles, certifications), level in zip(cases, expected):
+        experience = {'years': years, 'previous_roles': roles, 'certifications': certifications}
+        score = backend.experience_score({'experience': experience})
+        band = 'High' if score >= 80 else 'Mid' if score >= 60 else 'Low'
+        assert band == level, (years, roles, certifications, score)
+
+
+def test_openai_backend_against_the_mock_server(mock_server, scheduler):
+    backend = OpenAIBackend('test', scheduler=scheduler, base_url=mock_server.base_url)
+    run = ScoringRun(ApplicantAnalyzer('test', max_concurrency=4, scheduler=scheduler, backend=backend))
+
+    scored = score_all(run, chunks(intake_rows(10), 10))
+
+    assert all(30 <= a['info_score'] <= 100 for a in scored if a['score_source'] == 'model')
+    assert run.summary()['sources'] == {'rule': 2, 'model': 8}
+    # Two prompts (info and experience) per applicant under the BMI limit
+    assert backend.get_stats()['calls'] == 16
+
+
+def test_openai_failures_are_marked_as_fallback(scheduler):
+    server = start_mock_server(MockSettings(latency_ms=0, jitter_ms=0, error_rate=1.0))
+    try:
+        scheduler.max_retries = 1
+        backend = OpenAIBackend('test', scheduler=scheduler, base_url=server.base_url)
+        run = ScoringRun(ApplicantAnalyzer('test', scheduler=scheduler, backend=backend))
+
+        scored = score_all(run, chunks(intake_rows(3), 3))
+
+        assert [a['score_source'] for a in scored] == ['fallback'] * 3
+        assert (scored[0]['info_score'], scored[0]['experience_score']) == (70, 60)
+        assert run.summary()['scheduler']['failures'] == 6
+    finally:
+        server.shutdown()
+        server.server_close()
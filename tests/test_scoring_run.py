@@ -0,0 +1,41 @@
+from applicant_analyzer import ApplicantAnalyzer, ScoringRun
+from conftest import chunks, intake_rows, score_all
+from scoring_backends import LocalRuleBackend, MockBackend
+
+
+def test_scored_chunks_keep_source_order_and_count_sources():
+    run = ScoringRun(ApplicantAnalyzer('', max_concurrency=4, backend=MockBackend(latency=0.001)))
+
+    scored = score_all(run, chunks(intake_rows(30), 8))
+
+    assert [a['external_id'] for a in scored] == [f'EXT_{i}' for i in range(1, 31)]
+    summary = run.summary()
+    assert summary['rows'] == 30
+    # Every fifth row has BMI > 25 and never reaches the backend
+    assert summary['sources'] == {'rule': 6, 'mock': 24}
+    assert summary['changes'] is None
+    assert 'cascade' not in summary and 'tokens' not in summary
+
+
+def test_levels_follow_the_combined_score_and_bmi_rule():
+    scored = score_all(ScoringRun(ApplicantAnalyzer('', backend=LocalRuleBackend())), chunks(intake_rows(20), 20))
+
+    for applicant in scored:
+        combined = (applicant['info_score'] + applicant['experience_score']) / 2
+        if applicant['bmi'] > 25:
+            assert (applicant['overall_level'], applicant['score_source']) == ('Low', 'rule')
+        else:
+            expected = 'High' if combined >= 80 else 'Mid' if combined >= 60 else 'Low'
+            assert applicant['overall_level'] == expected
+            assert applicant['score_source'] == 'local'
+
+
+def test_backend_errors_fall_back_to_default_scores():
+    class BrokenBackend(MockBackend):
+        def score(self, applicant):
+            raise RuntimeError('boom')
+
+    scored = score_all(ScoringRun(ApplicantAnalyzer('', backend=BrokenBackend())), chunks(intake_rows(4), 4))
+
+    assert [a['score_source'] for a in scored] == ['fallback', 'fallback', 'fallback', 'fallback']
+    assert {a['overall_level'] for a in scored} == {'Mid'}
@@ -0,0 +1,46 @@
+import pytest
+
+from applicant_analyzer import ApplicantAnalyzer, ScoringRun
+from conftest import chunks, intake_rows, score_all
+from scoring_backends import OpenAIBackend
+
+
+def openai_run(mock_server, scheduler, prompt_mode: str) -> ScoringRun:
+    backend = OpenAIBackend('test', scheduler=scheduler, base_url=mock_server.base_url, prompt_mode=prompt_mode)
+    return ScoringRun(ApplicantAnalyzer('test', max_concurrency=4, scheduler=scheduler, backend=backend))
+
+
+@pytest.mark.parametrize('prompt_mode', ['full', 'compact'])
+def test_tokens_are_counted_per_run(mock_server, scheduler, prompt_mode):
+    run = openai_run(mock_server, scheduler, prompt_mode)
+
+    score_all(run, chunks(intake_rows(10), 10))
+
+    tokens = run.summary()['tokens']
+    assert tokens['calls'] == 16
+    assert tokens['prompt_mode'] == prompt_mode
+    assert tokens['input_tokens'] > 0 and tokens['output_tokens'] > 0
+    assert list(tokens['seconds_per_call_by_mode']) == [prompt_mode]
+    assert 'seconds_saved_per_call' not in tokens
+    if prompt_mode == 'compact':
+        assert tokens['input_tokens'] < tokens['full_prompt_input_tokens']
+        assert 0 < tokens['input_saved_fraction'] < 1
+    else:
+        assert 'full_prompt_input_tokens' not in tokens
+
+
+def test_latency_by_mode_comes_from_the_run_itself(mock_server, scheduler):
+    # A full-prompt run on another backend must not leak into this run's comparison
+    score_all(openai_run(mock_server, scheduler, 'full'), chunks(intake_rows(5), 5))
+    run = openai_run(mock_server, scheduler, 'compact')
+    score_all(run, chunks(intake_rows(5), 5))
+    assert list(run.summary()['tokens']['seconds_per_call_by_mode']) == ['compact']
+
+    run.analyzer.backend.prompt_mode = 'full'
+    score_all(run, chunks(intake_rows(5, start=5), 5))
+
+    tokens = run.summary()['tokens']
+    assert set(tokens['seconds_per_call_by_mode']) == {'full', 'compact'}
+    assert tokens['seconds_saved_per_call'] == pytest.approx(
+        tokens['seconds_per_call_by_mode']['full'] - tokens['seconds_per_call_by_mode']['compact']
+    )
@@ -0,0 +1,70 @@
+import io
+
+import openpyxl
+import pandas as pd
+
+from benchmarks.bench_normalize import make_intake_sheet
+from workbook_reader import iter_excel_chunks, iter_excel_rows, iter_workbook_sheets
+
+
+def test_streamed_rows_match_read_excel(tmp_path):
+    path = tmp_path / 'sheet.xlsx'
+    workbook = openpyxl.Workbook()
+    worksheet = workbook.active
+    for row in [
+        ['Name', 'Age', None, 'Age', 'Notes'],
+        ['Ann', 30, 'x', 31, None],
+        [None, None, None, None, None],
+        ['Bob', None, None, 40, 'late'],
+        [None, None, None, None, None],
+    ]:
+        worksheet.append(row)
+    workbook.save(path)
+
+    with open(path, 'rb') as f:
+        streamed = pd.DataFrame(list(iter_excel_rows(f)))
+    expected = pd.read_excel(path)
+
+    assert streamed.columns.tolist() == expected.columns.tolist() == ['Name', 'Age', 'Unnamed: 2', 'Age.1', 'Notes']
+    pd.testing.assert_frame_equal(streamed, expected, check_dtype=False)
+
+
+def test_chunks_cover_every_row_in_order(tmp_path):
+    sheet = make_intake_sheet(25, seed=7)
+    path = tmp_path / 'sheet.xlsx'
+    sheet.to_excel(path, index=False)
+
+    with open(path, 'rb') as f:
+        chunks = list(iter_excel_chunks(f, chunk_size=10))
+
+    assert [len(chunk) for chunk in chunks] == [10, 10, 5]
+    assert [a['external_id'] for chunk in chunks for a in chunk] == [f'EXT_{i}' for i in range(1, 26)]
+
+
+def test_every_sheet_is_streamed(tmp_path):
+    path = tmp_path / 'book.xlsx'
+    with pd.ExcelWriter(path) as writer:
+        pd.DataFrame({'Name': ['Ann']}).to_excel(writer, sheet_name='First', index=False)
+        pd.DataFrame({'Name': ['Bob', 'Cat']}).to_excel(writer, sheet_name='Second', index=False)
+
+    with open(path, 'rb') as f:
+        sheets = [(name, [row['Name'] for row in rows]) for name, rows in iter_workbook_sheets(f)]
+
+    assert sheets == [('First', ['Ann']), ('Second', ['Bob', 'Cat'])]
+
+
+def test_bytes_are_accepted(tmp_path):
+    path = tmp_path / 'sheet.xlsx'
+    make_intake_sheet(3, seed=8).to_excel(path, index=False)
+
+    chunks = list(iter_excel_chunks(path.read_bytes()))
+
+    assert [a['name'] for a in chunks[0]] == ['Applicant 0', 'Applicant 1', 'Applicant 2']
+
+
+def test_empty_sheet_yields_nothing():
+    buffer = io.BytesIO()
+    openpyxl.Workbook().save(buffer)
+    buffer.seek(0)
+
+    assert list(iter_excel_rows(buffer)) == []
@@ -0,0 +1,93 @@
+import io
+from typing import BinaryIO, Dict, Iterator, List, Tuple, Union
+
+import openpyxl
+import pandas as pd
+
+from applicant_normalize import applicant_records, normalize_applicants
+
+
+def iter_sheet_rows(values: Iterator[tuple]) -> Iterator[Dict]:
+    """Turn raw sheet rows into dicts, matching pd.read_excel's headers and blank-row handling"""
+    header = next(values, None)
+    if header is None:
+        return
+
+    columns = []
+    seen = {}
+    for position, column in enumerate(header):
+        column = f'Unnamed: {position}' if column is None else str(column)
+        if column in seen:
+            seen[column] += 1
+            column = f'{column}.{seen[column]}'
+        else:
+            seen[column] = 0
+        columns.append(column)
+
+    # Blank rows are only kept when a non-blank row follows (pandas drops trailing ones)
+    blank_rows = 0
+    for row in values:
+        if all(value is None for value in row):
+            blank_rows += 1
+            continue
+
+        for _ in range(blank_rows):
+            yield {column: float('nan') for column in columns}
+        blank_rows = 0
+
+        yield {
+            column: float('nan') if value is None else value
+            for column, value in zip(columns, row + (None,) * (len(columns) - len(row)))
+        }
+
+
+def iter_workbook_sheets(source: BinaryIO) -> Iterator[Tuple[str, Iterator[Dict]]]:
+    """Yield (sheet name, row dicts) for every worksheet without loading the whole workbook"""
+    # .xlsx files are zip archives; legacy .xls has to go through pandas/xlrd
+    if source.read(2) != b'PK':
+        source.seek(0)
+        for sheet_name, df in pd.read_excel(source, sheet_name=None).items():
+            yield sheet_name, iter(df.to_dict('records'))
+        return
+    source.seek(0)
+
+    workbook = openpyxl.load_workbook(source, read_only=True, data_only=True)
+    try:
+        for worksheet in workbook.worksheets:
+            yield worksheet.title, iter_sheet_rows(worksheet.iter_rows(values_only=True))
+    finally:
+        workbook.close()
+
+
+def iter_excel_rows(source: BinaryIO) -> Iterator[Dict]:
+    """Rows of the first sheet only"""
+    sheets = iter_workbook_sheets(source)
+    try:
+        _, rows = next(sheets, (None, iter(())))
+        yield from rows
+    finally:
+        sheets.close()
+
+
+def build_applicants(rows: List[Dict], start_index: int = 0) -> List[Dict]:
+    """Build applicant records for a chunk of spreadsheet rows with columnar normalization"""
+    table = normalize_applicants(pd.DataFrame(rows), start_index)
+    return applicant_records(table, rows)
+
+
+def iter_excel_chunks(source: Union[bytes, BinaryIO], chunk_size: int = 1000) -> Iterator[List[Dict]]:
+    """Stream applicants from the first sheet in chunks"""
+    if isinstance(source, bytes):
+        source = io.BytesIO(source)
+
+    start_index = 0
+    rows = []
+    for row in iter_excel_rows(source):
+        rows.append(row)
+        if len(rows) >= chunk_size:
+            yield build_applicants(rows, start_index)
+            start_index += len(rows)
+            rows = []
+
+    if rows:
+        yield build_applicants(rows, start_index)